@@ -0,0 +1,58 @@
+# src/application/bar_deduplication.py
+import pandas as pd
+
+FINGERPRINT_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def fingerprint(frame: pd.DataFrame, columns=FINGERPRINT_COLUMNS) -> pd.Series:
+    """Hash each row's price columns into one uint64.
+
+    Values are compared as floats rounded to 6 decimals, so a volume stored
+    as 1.0 matches a fetched 1 and missing columns hash as NaN.
+    """
+    values = frame.reindex(columns=columns).astype("float64").round(6)
+    return pd.util.hash_pandas_object(values, index=False)
+
+
+class BarDeduplicator:
+    """Drop bars that are already stored unchanged before they are written.
+
+    ``filter`` dedupes the incoming bars on ``(ticker, date)`` (last one
+    wins), loads the stored prices for each ticker's date range with one
+    ``get_stored_bars`` query and compares row fingerprints. Only bars that
+    are new or whose prices changed are returned.
+    """
+
+    def __init__(self, stock_repo, columns=FINGERPRINT_COLUMNS):
+        self.stock_repo = stock_repo
+        self.columns = columns
+
+    def filter(self, bars):
+        frame = pd.DataFrame(list(bars))
+        if frame.empty:
+            return []
+        frame["date"] = pd.to_datetime(frame["date"])
+        frame = frame.drop_duplicates(["ticker", "date"], keep="last")
+        fingerprints = fingerprint(frame, self.columns)
+
+        keep = pd.Series(True, index=frame.index)
+        for ticker, dates in frame.groupby("ticker", sort=False)["date"]:
+            stored = pd.DataFrame(
+                self.stock_repo.get_stored_bars(ticker, dates.min(), dates.max()),
+                columns=["date"] + self.columns,
+            )
+            if stored.empty:
+                continue
+            # A bar is unchanged when its date and fingerprint are both stored
+            stored_keys = pd.MultiIndex.from_arrays(
+                [pd.to_datetime(stored["date"]), fingerprint(stored, self.columns)]
+            )
+            keys = pd.MultiIndex.from_arrays([dates, fingerprints[dates.index]])
+            keep[dates.index] = ~keys.isin(stored_keys)
+
+        changed = frame[keep].astype(object)
+        changed = changed.where(changed.notna(), None)
+        rows = changed.to_dict("records")
+        for row in rows:
+            row["date"] = row["date"].to_pydatetime()
+        return rows
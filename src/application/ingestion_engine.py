@@ -0,0 +1,120 @@
+# src/application/ingestion_engine.py
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+
+
+class RateLimiter:
+    """Token bucket limiting how many requests are sent to a provider.
+
+    Share one instance between engines that talk to the same provider, even
+    when they run on different event loops: an asyncio lock is created per
+    loop on first use, and the token count itself is guarded by a thread
+    lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._loop_locks = weakref.WeakKeyDictionary()
+
+    async def acquire(self):
+        async with self._loop_lock():
+            while True:
+                wait = self._take()
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+
+    def _loop_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            lock = self._loop_locks.get(loop)
+            if lock is None:
+                lock = self._loop_locks[loop] = asyncio.Lock()
+            return lock
+
+    def _take(self) -> float:
+        """Take a token, or return the seconds until one is available."""
+        with self._state_lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class AsyncIngestionEngine:
+    """Run fetches for many tickers concurrently and stream them to a sink.
+
+    ``fetcher`` is any object with a ``fetch(ticker, ...)`` method. Blocking
+    fetchers run in the default thread pool, coroutine fetchers are awaited.
+    ``sink(ticker, data)`` is called on the event loop as each fetch completes,
+    so it may use a regular database session; it may also be a coroutine.
+    A ticker whose fetch or sink raises is reported in the summary's
+    ``failed`` list and the other tickers carry on.
+    """
+
+    def __init__(self, fetcher, max_concurrency: int = 10, rate_limiter=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.fetcher = fetcher
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+
+    async def run(self, tickers, sink, **fetch_kwargs):
+        """Fetch every ticker and return a summary of the run."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        summary = {"fetched": 0, "empty": 0, "failed": []}
+
+        async def fetch_one(ticker):
+            async with semaphore:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                try:
+                    return ticker, await self._fetch(ticker, **fetch_kwargs), None
+                except Exception as e:
+                    return ticker, None, e
+
+        tasks = [asyncio.create_task(fetch_one(t)) for t in dict.fromkeys(tickers)]
+        for task in asyncio.as_completed(tasks):
+            ticker, data, error = await task
+            if error is not None:
+                print(f"Error fetching data for {ticker}: {error}")
+                summary["failed"].append(ticker)
+                continue
+            if data is None:
+                summary["empty"] += 1
+                continue
+
+            try:
+                result = sink(ticker, data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Error storing data for {ticker}: {e}")
+                summary["failed"].append(ticker)
+                continue
+            summary["fetched"] += 1
+
+        return summary
+
+    def ingest(self, tickers, sink, **fetch_kwargs):
+        """Blocking entry point for callers without an event loop."""
+        return asyncio.run(self.run(tickers, sink, **fetch_kwargs))
+
+    async def _fetch(self, ticker, **fetch_kwargs):
+        fetch = self.fetcher.fetch
+        if inspect.iscoroutinefunction(fetch):
+            return await fetch(ticker, **fetch_kwargs)
+        return await asyncio.to_thread(fetch, ticker, **fetch_kwargs)
@@ -0,0 +1,194 @@
+# src/application/refresh_scheduler.py
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dt_time, timedelta
+from zoneinfo import ZoneInfo
+
+
+class MarketHours:
+    """Regular trading session of an exchange (weekends closed, no holidays)."""
+
+    def __init__(
+        self,
+        timezone: str = "America/New_York",
+        open_time: dt_time = dt_time(9, 30),
+        close_time: dt_time = dt_time(16, 0),
+    ):
+        self.timezone = ZoneInfo(timezone)
+        self.open_time = open_time
+        self.close_time = close_time
+
+    def is_open(self, at: float) -> bool:
+        local = datetime.fromtimestamp(at, self.timezone)
+        return local.weekday() < 5 and self.open_time <= local.time() < self.close_time
+
+    def next_open(self, at: float) -> float:
+        """Timestamp of the next session open after ``at``."""
+        local = datetime.fromtimestamp(at, self.timezone)
+        candidate = datetime.combine(local.date(), self.open_time, self.timezone)
+        if candidate <= local:
+            candidate += timedelta(days=1)
+        while candidate.weekday() >= 5:
+            candidate += timedelta(days=1)
+        return candidate.timestamp()
+
+
+class RefreshScheduler:
+    """Long-running scheduler for periodic ticker refreshes.
+
+    Jobs sit in a priority queue ordered by due time and priority (lower runs
+    first). A job for a ticker and period that is already queued or running
+    is collapsed into the existing one, which keeps any recurrence either
+    of them had. Recurring jobs that finish while the market is closed wait
+    for the next open, since no new bars appear.
+    ``run_job(ticker, period)`` does the work and returns the stored rows.
+    """
+
+    def __init__(self, run_job, max_workers: int = 4, market_hours=None, clock=None):
+        self.run_job = run_job
+        self.max_workers = max_workers
+        self.market_hours = market_hours or MarketHours()
+        self.clock = clock or time.time
+        self._queue = []
+        self._queued = {}
+        # key -> recurrence of the running job
+        self._in_flight = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._stats = {
+            "scheduled": 0,
+            "deduplicated": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "rows": 0,
+            "last_run": None,
+        }
+
+    def schedule(
+        self,
+        ticker: str,
+        period: str = "1mo",
+        every: float = None,
+        priority: int = 0,
+        at: float = None,
+    ) -> bool:
+        """Queue a refresh. ``every`` seconds makes it recurring.
+
+        Returns False when an equivalent job was already queued or running.
+        """
+        key = (ticker, period)
+        due = self.clock() if at is None else at
+        with self._lock:
+            if key in self._in_flight or key in self._queued:
+                self._stats["deduplicated"] += 1
+                queued = self._queued.get(key)
+                if queued:
+                    # Keep the earlier due time, the more urgent priority and
+                    # the queued recurrence unless this call sets one
+                    merged = (
+                        min(due, queued[0]),
+                        min(priority, queued[1]),
+                        queued[4] if every is None else every,
+                    )
+                    if merged != (queued[0], queued[1], queued[4]):
+                        self._push(key, *merged)
+                elif every is not None:
+                    # The running job reschedules itself with this recurrence
+                    self._in_flight[key] = every
+                return False
+            self._push(key, due, priority, every)
+            self._stats["scheduled"] += 1
+        self._wakeup.set()
+        return True
+
+    def run_pending(self, executor=None) -> int:
+        """Start every due job and return how many were started."""
+        started = 0
+        while True:
+            job = self._pop_due()
+            if job is None:
+                return started
+            started += 1
+            if executor is None:
+                self._run(job)
+            else:
+                executor.submit(self._run, job)
+
+    def run_forever(self, poll_interval: float = 1.0):
+        """Run jobs until ``stop`` is called."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stop.is_set():
+                self.run_pending(executor)
+                self._wakeup.wait(min(poll_interval, self._seconds_to_next_job()))
+                self._wakeup.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self):
+        """Return counters for the scheduler run plus queue sizes."""
+        with self._lock:
+            return dict(
+                self._stats, queued=len(self._queued), in_flight=len(self._in_flight)
+            )
+
+    def _push(self, key, due, priority, every):
+        # Older heap entries for the same key become stale and are skipped
+        entry = (due, priority, next(self._counter), key, every)
+        self._queued[key] = entry
+        heapq.heappush(self._queue, entry)
+
+    def _pop_due(self):
+        with self._lock:
+            while self._queue:
+                entry = self._queue[0]
+                due, _, _, key, _ = entry
+                if self._queued.get(key) is not entry:
+                    heapq.heappop(self._queue)
+                    continue
+                if due > self.clock() or len(self._in_flight) >= self.max_workers:
+                    return None
+                heapq.heappop(self._queue)
+                del self._queued[key]
+                self._in_flight[key] = entry[4]
+                return entry
+        return None
+
+    def _seconds_to_next_job(self) -> float:
+        with self._lock:
+            if not self._queue:
+                return float("inf")
+            return max(0.0, self._queue[0][0] - self.clock())
+
+    def _run(self, entry):
+        _, priority, _, key, _ = entry
+        ticker, period = key
+        try:
+            rows = self.run_job(ticker, period)
+        except Exception as e:
+            print(f"Refresh failed for {ticker} ({period}): {e}")
+            outcome = "failed"
+            rows = []
+        else:
+            outcome = "succeeded"
+
+        with self._lock:
+            every = self._in_flight.pop(key)
+            self._stats[outcome] += 1
+            self._stats["rows"] += len(rows or [])
+            self._stats["last_run"] = self.clock()
+            if every is not None and key not in self._queued:
+                self._push(key, self._next_due(every), priority, every)
+        self._wakeup.set()
+
+    def _next_due(self, every: float) -> float:
+        now = self.clock()
+        if self.market_hours.is_open(now):
+            return now + every
+        return max(now + every, self.market_hours.next_open(now))
@@ -0,0 +1,201 @@
+# src/application/streaming_ingestion.py
+import queue
+import threading
+import time
+import pandas as pd
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class MicroBatchWriter:
+    """Buffer bars in a bounded queue and write them in micro-batches.
+
+    A background thread flushes once ``batch_size`` bars are waiting or the
+    oldest waiting bar is ``max_latency`` seconds old. When the queue is
+    full, ``policy`` decides what happens: ``block`` makes the producer wait,
+    ``drop_oldest`` discards the oldest queued bar and ``drop_newest``
+    discards the incoming one.
+    """
+
+    def __init__(
+        self,
+        writer,
+        batch_size: int = 500,
+        max_latency: float = 1.0,
+        max_queue: int = 10000,
+        policy: str = "block",
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Invalid backpressure policy: {policy}")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.policy = policy
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flush everything still queued and stop the writer thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, bar) -> bool:
+        """Queue a bar. Returns False when the bar was dropped."""
+        if self.policy == "block":
+            self._queue.put(bar)
+            return True
+        try:
+            self._queue.put_nowait(bar)
+            return True
+        except queue.Full:
+            pass
+
+        self._count("dropped")
+        if self.policy == "drop_newest":
+            return False
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(bar)
+        return True
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, queued=self._queue.qsize())
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _drain(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Once stopping or past the deadline, take only what is ready
+                    if remaining > 0 and not self._stop.is_set():
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            self.writer.write(batch)
+        except Exception as e:
+            print(f"Failed to write {len(batch)} bars: {e}")
+            self._count("failed", len(batch))
+        else:
+            self._count("written", len(batch))
+            self._count("batches")
+
+
+class IntradayPoller:
+    """Poll intraday bars for a watchlist and return the new or changed ones.
+
+    The most recent bar of a session is still forming, so it is returned
+    again whenever its values change.
+    """
+
+    def __init__(self, fetcher, tickers, interval: str = "1m", period: str = "1d"):
+        self.fetcher = fetcher
+        self.tickers = list(dict.fromkeys(tickers))
+        self.interval = interval
+        self.period = period
+        self._last_bar = {}
+
+    def poll_once(self):
+        bars = []
+        for ticker in self.tickers:
+            try:
+                stock_data = self.fetcher.fetch(
+                    ticker,
+                    self.period,
+                    return_format="dataframe",
+                    interval=self.interval,
+                )
+            except Exception as e:
+                print(f"Error polling {ticker}: {e}")
+                continue
+            if stock_data is None or stock_data.empty:
+                continue
+            bars.extend(self._new_bars(ticker, stock_data))
+        return bars
+
+    def _new_bars(self, ticker, stock_data):
+        dates = stock_data["date"]
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+
+        last_bar = self._last_bar.get(ticker)
+        if last_bar is not None:
+            stock_data = stock_data[dates >= last_bar["date"]]
+            dates = dates[dates >= last_bar["date"]]
+
+        bars = []
+        for date, row in zip(dates.dt.to_pydatetime(), stock_data.itertuples()):
+            volume = getattr(row, "volume", None)
+            bar = {
+                "ticker": ticker,
+                "date": date,
+                "open": row.open,
+                "high": row.high,
+                "low": row.low,
+                "close": row.close,
+                "volume": None if pd.isna(volume) else int(volume),
+            }
+            if bar != last_bar:
+                bars.append(bar)
+        if bars:
+            self._last_bar[ticker] = bars[-1]
+        return bars
+
+
+class StreamingIngestion:
+    """Poll intraday bars on an interval and feed them to a batch writer."""
+
+    def __init__(self, poller, batch_writer, poll_interval: float = 30.0):
+        self.poller = poller
+        self.batch_writer = batch_writer
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+
+    def run(self, max_polls: int = None):
+        """Poll until ``stop`` is called or ``max_polls`` polls have run."""
+        self.batch_writer.start()
+        polls = 0
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                for bar in self.poller.poll_once():
+                    self.batch_writer.submit(bar)
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    break
+                elapsed = time.monotonic() - started
+                self._stop.wait(max(0.0, self.poll_interval - elapsed))
+        finally:
+            self.batch_writer.stop()
+        return self.batch_writer.stats()
+
+    def stop(self):
+        self._stop.set()
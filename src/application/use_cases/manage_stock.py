@@ -1,5 +1,7 @@
 # application/use_cases/manage_stock.py
 
+from contextlib import contextmanager
+from datetime import date, datetime
 from domain.models.stock import Stock
 from domain.stock_fetcher import StockFetcher
 from infrastructure.db.stock_repository_impl import StockRepositoryImpl
@@ -7,10 +9,23 @@ from infrastructure.db.stock_repository_impl import StockRepositoryImpl
 
 class ManageStockUseCase:
     def __init__(
-        self, stock_repo: StockRepositoryImpl, stock_fetcher: StockFetcher = None
+        self,
+        stock_repo: StockRepositoryImpl,
+        stock_fetcher: StockFetcher = None,
+        ingestion_log=None,
+        deduplicator=None,
+        unit_of_work=None,
     ):
         self.stock_repo = stock_repo
         self.stock_fetcher = stock_fetcher
+        # The UnitOfWork the repository writes through; with batch_size=None
+        # each create, update or delete is committed once, here
+        self.unit_of_work = unit_of_work
+        # With a SegmentLog, fetched bars are appended to it and a
+        # SegmentDrainer writes them to the repository later
+        self.ingestion_log = ingestion_log
+        # A BarDeduplicator drops bars that are already stored unchanged
+        self.deduplicator = deduplicator
 
     def create_stock(self, ticker, name, industry, sector, close, date):
         if not self.validate_stock(ticker):
@@ -25,8 +40,8 @@ class ManageStockUseCase:
             date=date,
         )
 
-        self.stock_repo.save(stock)
-        self.stock_repo.commit()
+        with self._transaction():
+            self.stock_repo.save(stock)
 
         return stock
 
@@ -35,25 +50,62 @@ class ManageStockUseCase:
         if not self.stock_fetcher:
             raise ValueError("StockFetcher not provided.")
 
-        stock_data = self.stock_fetcher.fetch(ticker, period)
-        for stock_record in stock_data:
-            stock = Stock(
-                ticker=ticker,
-                date=stock_record["date"],
-                close=stock_record["close"],
-                open=stock_record["open"],
-                high=stock_record["high"],
-                low=stock_record["low"],
-                volume=stock_record["volume"],
+        stock_data = self.stock_fetcher.fetch(ticker, period, return_format="list")
+        return self.store_stock_data(ticker, stock_data)
+
+    def store_stock_data(self, ticker: str, stock_data):
+        """Store records fetched for ``ticker`` elsewhere.
+
+        The sink ``AsyncIngestionEngine`` hands each ticker's fetched
+        records to. Returns what ``fetch_and_store_stock`` returns.
+        """
+        return self._store_rows(
+            [self._row_from_record(ticker, record) for record in stock_data or []]
+        )
+
+    def sync_stock_data(self, ticker: str, period: str):
+        """Fetch and store the bars from the latest stored one onwards.
+
+        The latest stored bar acts as a per-ticker watermark. Its day is
+        fetched again, since a bar stored mid-session is not final, and
+        ``save_many`` upserts it. Without a watermark the whole period is
+        fetched. Returns the rows that were written, so bars the
+        deduplicator found already stored unchanged are not included.
+        """
+        if not self.stock_fetcher:
+            raise ValueError("StockFetcher not provided.")
+
+        watermark = self.stock_repo.get_latest_date(ticker)
+        if isinstance(watermark, datetime):
+            watermark = watermark.date()
+
+        if watermark is None:
+            stock_data = self.stock_fetcher.fetch(ticker, period, return_format="list")
+        else:
+            if watermark > date.today():
+                return []
+            stock_data = self.stock_fetcher.fetch(
+                ticker, period, return_format="list", start=watermark
             )
-            self.stock_repo.save(stock)
+
+        new_records = [
+            record
+            for record in stock_data or []
+            if watermark is None or self._record_date(record) >= watermark
+        ]
+        rows = self._changed_rows(
+            [self._row_from_record(ticker, record) for record in new_records]
+        )
+        if rows:
+            self._write_rows(rows)
+        return rows
 
     def delete_stock(self, ticker):
         """Delete a stock by its ticker."""
         stock = self.stock_repo.get_by_ticker(ticker)
         if stock:
-            self.stock_repo.delete(stock)
-            self.stock_repo.commit()
+            with self._transaction():
+                self.stock_repo.delete(stock)
             return True
         return False
 
@@ -72,8 +124,8 @@ class ManageStockUseCase:
         if sector:
             stock.sector = sector
 
-        self.stock_repo.update(stock)
-        self.stock_repo.commit()
+        with self._transaction():
+            self.stock_repo.update(stock)
         return stock
 
     def check_stock_exists(self, ticker, period):
@@ -85,6 +137,52 @@ class ManageStockUseCase:
             raise ValueError("StockFetcher not provided.")
         return self.stock_fetcher.fetch(ticker, period)
 
+    @contextmanager
+    def _transaction(self):
+        """Commit the writes made in the block once, at the use-case boundary."""
+        if self.unit_of_work is None:
+            yield
+            self.stock_repo.commit()
+            return
+        # Commits what is pending on success and rolls it back on error
+        with self.unit_of_work:
+            yield
+
+    def _store_rows(self, rows):
+        return self._write_rows(self._changed_rows(rows))
+
+    def _changed_rows(self, rows):
+        if self.deduplicator is not None and rows:
+            return self.deduplicator.filter(rows)
+        return rows
+
+    def _write_rows(self, rows):
+        if self.ingestion_log is not None:
+            return self.ingestion_log.append(rows)
+        with self._transaction():
+            return self.stock_repo.save_many(rows)
+
+    @staticmethod
+    def _record_date(stock_record):
+        record_date = stock_record["date"]
+        if isinstance(record_date, str):
+            return datetime.strptime(record_date, "%Y-%m-%d").date()
+        if isinstance(record_date, datetime):
+            return record_date.date()
+        return record_date
+
+    def _row_from_record(self, ticker, stock_record):
+        record_date = self._record_date(stock_record)
+        return {
+            "ticker": ticker,
+            "date": datetime.combine(record_date, datetime.min.time()),
+            "open": stock_record["open"],
+            "high": stock_record["high"],
+            "low": stock_record["low"],
+            "close": stock_record["close"],
+            "volume": stock_record["volume"],
+        }
+
     def validate_stock(self, stock):
         # Business logic for validating stock
         return True
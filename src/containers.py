@@ -1,21 +1,38 @@
 from dependency_injector import containers, providers
+from infrastructure.db.cached_stock_repository import (
+    CachedStockRepository,
+    LRUCache,
+)
+from infrastructure.db.stock_price_partitions import configured_partitions
 from infrastructure.db.stock_repository_impl import StockRepositoryImpl
-from infrastructure.fetchers.yahoo_finance_fetcher import YahooFinanceFetcher
+from infrastructure.fetchers.provider_registry import build_provider_registry
 from use_cases.stock_service import StockService  # Import your StockService
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from infrastructure.db import db_setup
+from infrastructure.db.session_manager import SessionManager
 
 
 class Container(containers.DeclarativeContainer):
-    # Database configuration
-    engine = create_engine("sqlite:///src/infrastructure/db/database.db")
-    session = providers.Singleton(sessionmaker(bind=engine))
+    # Database configuration; each thread or asyncio task gets its own session
+    session_manager = providers.Object(db_setup.session_manager)
+    session = providers.Callable(SessionManager.session, session_manager)
 
-    # Repositories
-    stock_repository = providers.Factory(StockRepositoryImpl, session=session)
+    # Per-year stock_prices tables, when config.ini switches them on
+    stock_price_partitions = providers.Singleton(
+        configured_partitions, providers.Object(db_setup.engine)
+    )
+
+    # Repositories; lookups are served from an LRU shared by every session
+    stock_cache = providers.Singleton(LRUCache, maxsize=4096, ttl=60.0)
+    stock_repository = providers.Factory(
+        CachedStockRepository,
+        repository=providers.Factory(
+            StockRepositoryImpl, session=session, partitions=stock_price_partitions
+        ),
+        cache=stock_cache,
+    )
 
-    # Fetchers
-    stock_fetcher = providers.Factory(YahooFinanceFetcher)
+    # Fetchers, shared so provider health stats persist between requests
+    stock_fetcher = providers.Singleton(build_provider_registry)
 
     # Services
     stock_service = providers.Factory(
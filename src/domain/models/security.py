@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Integer, String
+from infrastructure.db.db_setup import Base
+
+EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(value) -> int:
+    """Days since 1970-01-01 for a date, datetime or ISO 8601 string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def from_epoch_day(day: int) -> datetime:
+    return datetime.combine(EPOCH + timedelta(days=day), datetime.min.time())
+
+
+class Security(Base):
+    """Descriptive data for a ticker, stored once instead of on every bar."""
+
+    __tablename__ = "securities"
+    __table_args__ = {"extend_existing": True}
+
+    security_id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String, nullable=False, unique=True)
+    name = Column(String)
+    industry = Column(String)
+    sector = Column(String)
+    market_cap = Column(Float)
+    pe_ratio = Column(Float)
+
+
+class DailyBar(Base):
+    """One daily OHLCV bar keyed by security id and epoch day.
+
+    The table is clustered on its primary key (WITHOUT ROWID on SQLite), so
+    a ticker's bars are stored together in date order.
+    """
+
+    __tablename__ = "daily_bars"
+    __table_args__ = {"sqlite_with_rowid": False, "extend_existing": True}
+
+    security_id = Column(
+        Integer, ForeignKey("securities.security_id"), primary_key=True
+    )
+    day = Column(Integer, primary_key=True)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(BigInteger)
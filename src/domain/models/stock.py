@@ -3,6 +3,10 @@ from infrastructure.db.db_setup import Base
 
 
 class Stock(Base):
+    # A daily bar with its security's descriptive columns. Since migration
+    # f2c6d8e1a4b9 stocks is a read-only view over securities and
+    # daily_bars; StockRepositoryImpl writes those tables and builds Stock
+    # objects from them.
     __tablename__ = "stocks"
     __table_args__ = (
         UniqueConstraint(
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Float, String
+from infrastructure.db.db_setup import Base
+
+
+class StockRollup(Base):
+    """OHLCV bar for one ticker over a week or month of stocks rows.
+
+    ``date`` is the bucket start. Rows are kept up to date by
+    ``StockRepositoryImpl`` as bars are written, and the table is clustered
+    on its primary key (WITHOUT ROWID on SQLite).
+    """
+
+    __tablename__ = "stock_rollups"
+    __table_args__ = {"sqlite_with_rowid": False, "extend_existing": True}
+
+    ticker = Column(String, primary_key=True)
+    granularity = Column(String, primary_key=True)
+    date = Column(DateTime, primary_key=True)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(Float)
@@ -0,0 +1,241 @@
+# src/infrastructure/db/aggregation.py
+from datetime import datetime, timedelta
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    Select,
+    and_,
+    cast,
+    func,
+    literal_column,
+    select,
+    type_coerce,
+)
+from interfaces.common.enums import Granularity
+
+# Bucket start as "YYYY-MM-DD HH:MM:SS" text, which SQLite DateTime parses;
+# weeks start on Monday like PostgreSQL's date_trunc('week')
+SQLITE_BUCKETS = {
+    Granularity.HOURLY: ("%Y-%m-%d %H:00:00",),
+    Granularity.WEEKLY: ("%Y-%m-%d 00:00:00", "weekday 0", "-6 days"),
+    Granularity.MONTHLY: ("%Y-%m-01 00:00:00",),
+}
+
+POSTGRES_BUCKETS = {
+    Granularity.HOURLY: "hour",
+    Granularity.WEEKLY: "week",
+    Granularity.MONTHLY: "month",
+}
+
+SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+
+# Julian day number of 1970-01-01, for SQLite date functions over epoch days
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def as_datetime(value) -> datetime:
+    """Return a datetime for a datetime, a date (at midnight) or ISO string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+def as_granularity(granularity):
+    """Return a Granularity for an enum member, its value or None."""
+    if granularity is None:
+        return None
+    # Compare by value, so members of the same enum imported under another
+    # module path are accepted too
+    return Granularity(getattr(granularity, "value", granularity))
+
+
+def bucket_start(granularity, when: datetime) -> datetime:
+    """Start of the bucket ``when`` falls in, matching ``bucket_expression``.
+
+    ``when`` may also be a date or an ISO 8601 string.
+    """
+    granularity = as_granularity(granularity)
+    when = as_datetime(when)
+    if granularity == Granularity.HOURLY:
+        return when.replace(minute=0, second=0, microsecond=0)
+    day = datetime.combine(when.date(), datetime.min.time())
+    if granularity == Granularity.WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTHLY:
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported granularity: {granularity.value}")
+
+
+def next_bucket_start(granularity, when: datetime) -> datetime:
+    """Start of the bucket after the one ``when`` falls in."""
+    granularity = as_granularity(granularity)
+    start = bucket_start(granularity, when)
+    if granularity == Granularity.HOURLY:
+        return start + timedelta(hours=1)
+    if granularity == Granularity.WEEKLY:
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def bucket_expression(dialect_name: str, granularity: Granularity, column):
+    """SQL expression for the start of the bucket ``column`` falls in."""
+    granularity = as_granularity(granularity)
+    if dialect_name == "sqlite":
+        format_, *modifiers = SQLITE_BUCKETS[granularity]
+        return type_coerce(func.strftime(format_, column, *modifiers), DateTime)
+    if dialect_name == "postgresql":
+        return func.date_trunc(POSTGRES_BUCKETS[granularity], column)
+    raise ValueError(f"Unsupported dialect for aggregation: {dialect_name}")
+
+
+def day_bucket_expression(dialect_name: str, granularity: Granularity, column):
+    """Epoch day of the start of the bucket an epoch-day ``column`` falls in.
+
+    Weeks start on Monday, as in ``bucket_expression``; 1970-01-01 was a
+    Thursday, so Monday is three days on from the epoch.
+    """
+    granularity = as_granularity(granularity)
+    if granularity == Granularity.DAILY:
+        return column
+    if granularity == Granularity.WEEKLY:
+        # Adding 7 before the second modulo keeps days before 1970, where
+        # SQL's % is negative, in the right week
+        return column - ((column + 3) % 7 + 7) % 7
+    if granularity != Granularity.MONTHLY:
+        raise ValueError(f"Unsupported granularity for daily bars: {granularity.value}")
+    if dialect_name == "sqlite":
+        julian_day = func.julianday(column + UNIX_EPOCH_JULIAN_DAY, "start of month")
+        return cast(julian_day - UNIX_EPOCH_JULIAN_DAY, Integer)
+    if dialect_name == "postgresql":
+        epoch = literal_column("DATE '1970-01-01'", Date)
+        month = cast(func.date_trunc("month", epoch + column), Date)
+        return type_coerce(month - epoch, Integer)
+    raise ValueError(f"Unsupported dialect for aggregation: {dialect_name}")
+
+
+def epoch_day_timestamp(dialect_name: str, column):
+    """SQL DateTime for the midnight of an epoch-day ``column``.
+
+    On SQLite this is the text SQLAlchemy writes for DateTime values, so it
+    compares equal to dates the application stored.
+    """
+    if dialect_name == "sqlite":
+        midnight = func.strftime(
+            "%Y-%m-%d 00:00:00.000000", column * 86400, "unixepoch"
+        )
+        return type_coerce(midnight, DateTime)
+    if dialect_name == "postgresql":
+        epoch = literal_column("DATE '1970-01-01'", Date)
+        return cast(epoch + column, DateTime)
+    raise ValueError(f"Unsupported dialect for aggregation: {dialect_name}")
+
+
+def _ohlcv_buckets(table, key, time, bucket, criteria, descriptive=()):
+    """OHLCV per ``key`` and ``bucket`` of ``table``'s rows matching ``criteria``.
+
+    The first and last bars are found by their ``time`` and joined back on
+    ``(key, time)``, which the table's unique key serves, so no window
+    functions are needed. The bucket start is selected under the name of
+    the ``time`` column, with its type.
+    """
+    buckets = (
+        select(
+            table.c[key],
+            bucket.label("bucket"),
+            func.min(table.c[time]).label("first_time"),
+            func.max(table.c[time]).label("last_time"),
+            *[func.max(table.c[name]).label(name) for name in descriptive],
+            func.max(table.c.high).label("high"),
+            func.min(table.c.low).label("low"),
+            func.sum(table.c.volume).label("volume"),
+        )
+        .where(*criteria)
+        .group_by(table.c[key], bucket)
+        .subquery()
+    )
+    first = table.alias("first_bar")
+    last = table.alias("last_bar")
+    return (
+        select(
+            buckets.c[key],
+            type_coerce(buckets.c.bucket, table.c[time].type).label(time),
+            *[buckets.c[name] for name in descriptive],
+            first.c.open,
+            buckets.c.high,
+            buckets.c.low,
+            last.c.close,
+            buckets.c.volume,
+        )
+        .join(
+            first,
+            and_(
+                first.c[key] == buckets.c[key],
+                first.c[time] == buckets.c.first_time,
+            ),
+        )
+        .join(
+            last,
+            and_(
+                last.c[key] == buckets.c[key],
+                last.c[time] == buckets.c.last_time,
+            ),
+        )
+        .order_by(buckets.c[key], buckets.c.bucket)
+    )
+
+
+def ohlcv_rollup_query(table, dialect_name, tickers, start, end, granularity):
+    """Aggregate bars into OHLCV buckets inside the database.
+
+    Each bucket has the first bar's open, the highest high, the lowest low,
+    the last bar's close and the summed volume. ``table`` needs ``ticker``
+    and ``date`` columns with a unique index over them. Rows are
+    ``ticker, date, open, high, low, close, volume`` ordered by ticker and
+    bucket, with ``name``, ``industry`` and ``sector`` after the date when
+    the table has them.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    descriptive = [name for name in ("name", "industry", "sector") if name in table.c]
+    return _ohlcv_buckets(
+        table,
+        "ticker",
+        "date",
+        bucket_expression(dialect_name, granularity, table.c.date),
+        [
+            table.c.ticker.in_(list(tickers)),
+            table.c.date >= start,
+            table.c.date <= end,
+        ],
+        descriptive,
+    )
+
+
+def daily_bar_rollup_query(
+    table, dialect_name, security_ids, first_day, last_day, granularity
+):
+    """Aggregate ``daily_bars`` rows between two epoch days into buckets.
+
+    The counterpart of ``ohlcv_rollup_query`` for bars keyed by security id
+    and epoch day. Rows are ``security_id, day, open, high, low, close,
+    volume`` ordered by security and bucket, ``day`` being the epoch day the
+    bucket starts on. ``security_ids`` is a list of ids or a select of them.
+    """
+    if not isinstance(security_ids, Select):
+        security_ids = list(security_ids)
+    return _ohlcv_buckets(
+        table,
+        "security_id",
+        "day",
+        day_bucket_expression(dialect_name, granularity, table.c.day),
+        [
+            table.c.security_id.in_(security_ids),
+            table.c.day >= first_day,
+            table.c.day <= last_day,
+        ],
+    )
@@ -0,0 +1,214 @@
+# src/infrastructure/db/cached_stock_repository.py
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from domain.models.stock import Stock
+from repositories.stock_repository import StockRepository
+
+MISSING = object()
+
+
+def snapshot(value):
+    """Copy ORM entities in ``value`` into new transient instances.
+
+    Lists are copied item by item and other values, such as dates, are
+    returned as they are. The copies belong to no session, so neither the
+    session they were loaded in nor a caller changing them affects what is
+    cached.
+    """
+    if isinstance(value, list):
+        return [snapshot(item) for item in value]
+    state = inspect(value, raiseerr=False)
+    if state is None or not hasattr(state, "mapper"):
+        return value
+    copy = state.mapper.class_manager.new_instance()
+    for attribute in state.mapper.column_attrs:
+        setattr(copy, attribute.key, getattr(value, attribute.key))
+    return copy
+
+
+class LRUCache:
+    """Thread-safe LRU of at most ``maxsize`` entries that expire after ``ttl``.
+
+    Keys are tuples whose second item is a ticker, so ``invalidate`` can
+    drop everything cached for one ticker. ``ttl=None`` keeps entries until
+    they are evicted or invalidated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, clock=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock or time.monotonic
+        self._entries = OrderedDict()
+        self._by_ticker = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key):
+        """Return the cached value, or ``MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            expires = None if self.ttl is None else self.clock() + self.ttl
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            self._by_ticker.setdefault(key[1], set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, ticker: str):
+        """Drop every entry cached for ``ticker``."""
+        with self._lock:
+            for key in list(self._by_ticker.get(ticker, ())):
+                self._remove(key)
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_ticker.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                size=len(self._entries),
+                hit_rate=self._stats["hits"] / lookups if lookups else 0.0,
+            )
+
+    def _remove(self, key):
+        del self._entries[key]
+        keys = self._by_ticker[key[1]]
+        keys.discard(key)
+        if not keys:
+            del self._by_ticker[key[1]]
+
+
+class CachedStockRepository(StockRepository):
+    """Read-through cache in front of another StockRepository.
+
+    ``get``, ``get_by_ticker``, ``get_latest_date`` and ``get_stock_data``
+    are served from ``cache`` when possible; writes go to the wrapped
+    repository and then invalidate what is cached for the ticker, once
+    straight away and again when the wrapped repository's session commits,
+    since another session may cache the old rows until then. Pass one
+    ``LRUCache`` to several repositories (one per session) to share it.
+    The cache keeps copies of the entities loaded and every lookup returns
+    a fresh copy, so callers may change what they get and write it back
+    with ``update`` or ``save``. Other methods are passed through uncached.
+    """
+
+    def __init__(self, repository, cache: LRUCache = None):
+        self.repository = repository
+        self.cache = cache or LRUCache()
+        # Session.info key of the tickers to drop when the session commits
+        self._pending_key = ("cached_stock_repository", id(self.cache))
+
+    def get(self, ticker: str) -> Optional[Stock]:
+        return self._cached(("get", ticker), self.repository.get, ticker)
+
+    def get_stock(self, ticker: str) -> Optional[Stock]:
+        """Alias of ``get``, the lookup ``StockService`` uses."""
+        return self.get(ticker)
+
+    def get_by_ticker(self, ticker: str) -> Optional[Stock]:
+        return self._cached(
+            ("get_by_ticker", ticker), self.repository.get_by_ticker, ticker
+        )
+
+    def get_latest_date(self, ticker: str) -> Optional[datetime]:
+        return self._cached(("latest", ticker), self.repository.get_latest_date, ticker)
+
+    def get_stock_data(
+        self, ticker: str, start: datetime, end: datetime, granularity=None
+    ) -> List[Stock]:
+        key = ("range", ticker, start, end, getattr(granularity, "value", granularity))
+        return self._cached(
+            key, self.repository.get_stock_data, ticker, start, end, granularity
+        )
+
+    def create_stock(self, stock: Stock):
+        try:
+            return self.repository.create_stock(stock)
+        finally:
+            self._invalidate([stock.ticker])
+
+    def save(self, stock: Stock):
+        try:
+            return self.repository.save(stock)
+        finally:
+            self._invalidate([stock.ticker])
+
+    def update(self, stock: Stock):
+        try:
+            return self.repository.update(stock)
+        finally:
+            self._invalidate([stock.ticker])
+
+    def save_many(self, bars, batch_size: int = None) -> int:
+        bars = list(bars)
+        try:
+            if batch_size is None:
+                return self.repository.save_many(bars)
+            return self.repository.save_many(bars, batch_size)
+        finally:
+            self._invalidate({bar["ticker"] for bar in bars})
+
+    def delete_stock(self, ticker: str) -> bool:
+        try:
+            return self.repository.delete_stock(ticker)
+        finally:
+            self._invalidate([ticker])
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _cached(self, key, load, *args):
+        value = self.cache.get(key)
+        if value is MISSING:
+            value = snapshot(load(*args))
+            self.cache.put(key, value)
+        return snapshot(value)
+
+    def _invalidate(self, tickers):
+        for ticker in tickers:
+            self.cache.invalidate(ticker)
+        session = getattr(self.repository, "session", None)
+        if not isinstance(session, Session):
+            return
+        session.info.setdefault(self._pending_key, set()).update(tickers)
+        if not event.contains(session, "after_commit", self._after_commit):
+            event.listen(session, "after_commit", self._after_commit)
+
+    def _after_commit(self, session):
+        for ticker in session.info.pop(self._pending_key, ()):
+            self.cache.invalidate(ticker)
@@ -1,8 +1,8 @@
 import sys
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from infrastructure.db.db_setup import Base
+from infrastructure.db.engine import create_db_engine
 from infrastructure.db.stock_repository_impl import (
     Stock,
 )  # Assuming this is where your Stock model is
@@ -11,10 +11,8 @@ from infrastructure.db.stock_repository_impl import (
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../../../")
 
 # Create the engine and session
-# (adjust your database URL accordingly)
-# Replace with your actual database URL
-DATABASE_URL = "sqlite:///src/infrastructure/db/database.db"
-engine = create_engine(DATABASE_URL)
+# (the URL comes from DATABASE_URL or config.ini)
+engine = create_db_engine()
 
 # Bind the engine to the metadata of the Base class so
 # that the
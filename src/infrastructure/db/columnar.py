@@ -0,0 +1,45 @@
+# src/infrastructure/db/columnar.py
+import pandas as pd
+from sqlalchemy import Date, DateTime, select
+
+
+def read_frame(connection, statement) -> pd.DataFrame:
+    """Run a Core SELECT and build a DataFrame straight from the cursor.
+
+    Rows are fetched from the DBAPI cursor as plain tuples, skipping ORM
+    objects and per-row result processing, and converted column-wise:
+    numeric columns become float/int arrays and Date/DateTime columns are
+    parsed with one vectorized ``pd.to_datetime`` call.
+    """
+    result = connection.execute(statement)
+    try:
+        columns = list(result.keys())
+        rows = result.cursor.fetchall()
+    finally:
+        result.close()
+    frame = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    for column in statement.selected_columns:
+        if isinstance(column.type, (Date, DateTime)) and column.key in frame:
+            frame[column.key] = pd.to_datetime(frame[column.key], format="ISO8601")
+    return frame
+
+
+def bar_range_query(table, tickers, start, end, columns):
+    """SELECT ticker, date and ``columns`` for tickers between two dates.
+
+    Raises ValueError for a column the table does not have.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    unknown = [name for name in columns if name not in table.c]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return (
+        select(table.c.ticker, table.c.date, *[table.c[name] for name in columns])
+        .where(
+            table.c.ticker.in_(list(tickers)),
+            table.c.date >= start,
+            table.c.date <= end,
+        )
+        .order_by(table.c.ticker, table.c.date)
+    )
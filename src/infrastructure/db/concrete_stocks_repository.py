@@ -1,44 +1,37 @@
 # src/infrastructure/db/concrete_stocks_repository.py
 from domain.repositories.base_stock_repository import BaseStockRepository
+from infrastructure.db.columnar import bar_range_query, read_frame
 from infrastructure.db.models import Stock  # Import the Stock model
-import pandas as pd
+from infrastructure.db.unit_of_work import UnitOfWork
 
 
 class ConcreteStocksRepository(BaseStockRepository):
-    def __init__(self, session):  # Accept session as an argument
+    def __init__(self, session, unit_of_work=None):  # Accept session as an argument
         self.session = session  # Store it as an instance variable
+        # Writes go through the unit of work, which decides when to commit
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
 
     def create_stock(self, stock):
-        # Use self.session for database operations
-        self.session.add(stock)
-        self.session.commit()
+        self.unit_of_work.add(stock)
 
     def get_stock_by_ticker(self, ticker):
         # Use self.session for database query
         return self.session.query(Stock).filter_by(ticker=ticker).first()
 
     def update_stock(self, stock):
-        self.session.merge(stock)
-        self.session.commit()
+        self.unit_of_work.merge(stock)
 
     def get_stock_data(self, ticker, start_date, end_date, granularity):
-        stock_data = (
-            self.session.query(Stock)
-            .filter(
-                Stock.ticker == ticker, Stock.date >= start_date, Stock.date <= end_date
-            )
-            .all()
+        # Read date and close straight into a DataFrame, without ORM objects
+        statement = bar_range_query(
+            Stock.__table__, ticker, start_date, end_date, ["close"]
         )
+        df = read_frame(self.session.connection(), statement)
 
-        if not stock_data:  # If no data is found
+        if df.empty:  # If no data is found
             raise ValueError(f"No data found for ticker {ticker}")
 
-        # Convert the result to a pandas DataFrame
-        df = pd.DataFrame(
-            [{"date": stock.date, "price": stock.close} for stock in stock_data]
-        )
-
-        return df
+        return df[["date", "close"]].rename(columns={"close": "price"})
 
     def get(self, ticker):
         return self.session.query(Stock).filter_by(ticker=ticker).first()
@@ -46,13 +39,10 @@ class ConcreteStocksRepository(BaseStockRepository):
     def delete_stock(self, ticker):
         stock_to_delete = self.session.query(Stock).filter_by(ticker=ticker).first()
         if stock_to_delete:
-            self.session.delete(stock_to_delete)
-            self.session.commit()
+            self.unit_of_work.delete(stock_to_delete)
 
     def save(self, stock):
-        self.session.add(stock)
-        self.session.commit()
+        self.unit_of_work.add(stock)
 
     def update(self, stock):
-        self.session.merge(stock)
-        self.session.commit()
+        self.unit_of_work.merge(stock)
@@ -1,15 +1,12 @@
 # src/infrastructure/db/db.py
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from infrastructure.db.engine import create_db_engine
 
 Base = declarative_base()
 
-DATABASE_URL = (
-    "sqlite:///./database.db"  # You can change this to any other database URL
-)
-
-engine = create_engine(DATABASE_URL, echo=True)
+# The URL comes from DATABASE_URL or config.ini
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -1,18 +1,21 @@
 # src/infrastructure/db/db_setup.py
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager  # Import contextmanager
+from infrastructure.db.engine import create_db_engine
+from infrastructure.db.session_manager import SessionManager
 
 # Create the Base for models to inherit from
 Base = declarative_base()
 
-# Create the database engine
-engine = create_engine("sqlite:///src/infrastructure/db/database.db")
+# Create the database engine from config.ini / DATABASE_URL
+engine = create_db_engine()
+
+# Thread/task scoped sessions for concurrent ingestion
+session_manager = SessionManager(engine)
 
 # Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = session_manager.factory
 
 
 def init_db():
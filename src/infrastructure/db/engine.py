@@ -0,0 +1,91 @@
+# src/infrastructure/db/engine.py
+from sqlalchemy import create_engine, event
+from utils.config import get_setting, load_config
+
+DEFAULT_DATABASE_URL = "sqlite:///src/infrastructure/db/database.db"
+
+# WAL lets readers run while an ingest commits, and synchronous=NORMAL only
+# syncs at checkpoints, which is safe in WAL mode and much cheaper per commit
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": "268435456",
+    "cache_size": "-65536",
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",
+}
+
+POOL_DEFAULTS = {
+    "pool_size": "5",
+    "max_overflow": "10",
+    "pool_recycle": "1800",
+}
+
+
+def database_url(config=None) -> str:
+    """DATABASE_URL from the environment, else ``[DATABASE] db_url``."""
+    return get_setting(
+        "DATABASE",
+        "db_url",
+        env_var="DATABASE_URL",
+        default=DEFAULT_DATABASE_URL,
+        config=config,
+    )
+
+
+def sqlite_pragmas(config=None) -> dict:
+    """SQLite pragmas, with ``[SQLITE]`` entries overriding the defaults."""
+    config = config if config is not None else load_config()
+    return {
+        name: get_setting("SQLITE", name, default=value, config=config)
+        for name, value in SQLITE_PRAGMAS.items()
+    }
+
+
+def create_db_engine(url: str = None, config=None, **kwargs):
+    """Create the engine for ``url`` (or the configured database).
+
+    SQLite connections get the pragmas from ``sqlite_pragmas`` as they are
+    opened. Pool sizing comes from ``[DATABASE]`` or ``DATABASE_POOL_SIZE``,
+    ``DATABASE_MAX_OVERFLOW`` and ``DATABASE_POOL_RECYCLE`` for every
+    database except in-memory SQLite. Keyword arguments are passed on to
+    ``create_engine`` and win over both.
+    """
+    config = config if config is not None else load_config()
+    url = url or database_url(config)
+    echo = get_setting(
+        "DATABASE", "echo", env_var="DATABASE_ECHO", default="false", config=config
+    )
+    kwargs.setdefault("echo", echo.lower() in ("1", "true", "yes"))
+
+    if url.startswith("sqlite"):
+        # In-memory databases live in a single connection, so no pool sizing
+        if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+            _set_pool_defaults(kwargs, config)
+        engine = create_engine(url, **kwargs)
+        pragmas = sqlite_pragmas(config)
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        return engine
+
+    _set_pool_defaults(kwargs, config)
+    kwargs.setdefault("pool_pre_ping", True)
+    return create_engine(url, **kwargs)
+
+
+def _set_pool_defaults(kwargs, config):
+    for name, value in POOL_DEFAULTS.items():
+        setting = get_setting(
+            "DATABASE",
+            name,
+            env_var=f"DATABASE_{name.upper()}",
+            default=value,
+            config=config,
+        )
+        kwargs.setdefault(name, int(setting))
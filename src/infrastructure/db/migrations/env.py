@@ -10,6 +10,10 @@ import os
 # access to the values within the .ini file in use.
 config = context.config
 
+# DATABASE_URL points migrations at another database, e.g. PostgreSQL
+if os.environ.get("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 fileConfig(config.config_file_name)
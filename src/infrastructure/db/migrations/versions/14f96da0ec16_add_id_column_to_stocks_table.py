@@ -19,16 +19,26 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+NEW_COLUMNS = [
+    ("market_cap", sa.Float()),
+    ("pe_ratio", sa.Float()),
+    ("date", sa.DateTime()),
+    ("open", sa.Float()),
+    ("high", sa.Float()),
+    ("low", sa.Float()),
+    ("close", sa.Float()),
+    ("volume", sa.Float()),
+]
+
+
 def upgrade(op=op):
-    # Add the new columns
-    op.add_column("stocks", sa.Column("market_cap", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("pe_ratio", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("date", sa.DateTime(), nullable=True))
-    op.add_column("stocks", sa.Column("open", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("high", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("low", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("close", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("volume", sa.Float(), nullable=True))
+    # Add the new columns; earlier revisions already add some of them
+    existing = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("stocks")
+    }
+    for name, type_ in NEW_COLUMNS:
+        if name not in existing:
+            op.add_column("stocks", sa.Column(name, type_, nullable=True))
 
 
 def downgrade(op=op):
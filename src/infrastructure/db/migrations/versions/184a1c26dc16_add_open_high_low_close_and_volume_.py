@@ -20,11 +20,17 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column("stocks", sa.Column("market_cap", sa.Float(), nullable=True))
-    op.add_column("stocks", sa.Column("pe_ratio", sa.Float(), nullable=True))
-    op.drop_column("stocks", "date")
-    # ### end Alembic commands ###
+    # d74fcf8c0b1e already adds market_cap and pe_ratio, and a56f4298ff14
+    # drops date, so only apply what a fresh database is missing
+    columns = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("stocks")
+    }
+    if "market_cap" not in columns:
+        op.add_column("stocks", sa.Column("market_cap", sa.Float(), nullable=True))
+    if "pe_ratio" not in columns:
+        op.add_column("stocks", sa.Column("pe_ratio", sa.Float(), nullable=True))
+    if "date" in columns:
+        op.drop_column("stocks", "date")
 
 
 def downgrade() -> None:
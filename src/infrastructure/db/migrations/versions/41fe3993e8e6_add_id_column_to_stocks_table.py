@@ -34,7 +34,7 @@ def upgrade() -> None:
             sa.text(
                 """
             INSERT INTO new_stocks (id, ticker, date, close_price)
-            SELECT id, ticker, date, IFNULL(close_price, 0.0)
+            SELECT id, ticker, date, COALESCE(close_price, 0.0)
             FROM stocks;
             """
             )
@@ -79,7 +79,7 @@ def downgrade() -> None:
         sa.text(
             """
         INSERT INTO old_stocks (id, ticker, date, close_price)
-        SELECT id, ticker, date, IFNULL(close_price, 0.0)
+        SELECT id, ticker, date, COALESCE(close_price, 0.0)
         FROM stocks;
         """
         )
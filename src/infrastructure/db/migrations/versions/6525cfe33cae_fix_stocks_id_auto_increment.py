@@ -58,7 +58,7 @@ def upgrade():
 
     # Drop old table and rename the new one
     manage_table_operations("stocks", "stocks_new", operation="drop")
-    manage_table_operations("stocks_new", "stocks", operation="rename")
+    manage_table_operations("stocks", "stocks_new", operation="rename")
 
 
 def downgrade():
@@ -70,4 +70,4 @@ def downgrade():
 
     # Drop current table and rename the old one
     manage_table_operations("stocks", "stocks", operation="drop")
-    manage_table_operations("stocks_old", "stocks", operation="rename")
+    manage_table_operations("stocks", "stocks_old", operation="rename")
@@ -0,0 +1,32 @@
+"""Store intraday bars in stock_prices
+
+Revision ID: 7c1f2b9d4e61
+Revises: a3e7c5d91f26
+Create Date: 2026-10-18 09:12:44.118305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1f2b9d4e61"
+down_revision: Union[str, None] = "a3e7c5d91f26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite cannot alter columns in place, so the table is rebuilt
+    with op.batch_alter_table("stock_prices") as batch_op:
+        batch_op.alter_column("date", existing_type=sa.Date(), type_=sa.DateTime())
+        batch_op.create_unique_constraint("uix_price_ticker_date", ["ticker", "date"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("stock_prices") as batch_op:
+        batch_op.drop_constraint("uix_price_ticker_date", type_="unique")
+        batch_op.alter_column("date", existing_type=sa.DateTime(), type_=sa.Date())
@@ -20,7 +20,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade():
-    # Create the stocks table
+    # Create the stocks table, unless the earlier revisions already did
+    if sa.inspect(op.get_bind()).has_table("stocks"):
+        return
     op.create_table(
         "stocks",
         sa.Column("ticker", sa.String(), nullable=False, primary_key=True),
@@ -0,0 +1,130 @@
+"""Key stocks by id with a unique ticker/date
+
+Revision ID: a3e7c5d91f26
+Revises: e3cab1a2d06b
+Create Date: 2026-10-18 19:41:06.274519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e7c5d91f26"
+down_revision: Union[str, None] = "e3cab1a2d06b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose ticker referenced stocks.ticker while it was the primary key
+REFERENCING_TABLES = ("stock_prices", "fundamentals", "sentiment_analysis")
+
+# Names SQLite's unnamed foreign keys so batch mode can drop them
+NAMING_CONVENTION = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+DESCRIPTIVE_COLUMNS = ("name", "industry", "sector", "market_cap", "pe_ratio")
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def drop_stock_foreign_keys(inspector) -> None:
+    """Drop the foreign keys on stocks.ticker, which is no longer unique."""
+    for table in REFERENCING_TABLES:
+        if not inspector.has_table(table):
+            continue
+        foreign_keys = [
+            foreign_key
+            for foreign_key in inspector.get_foreign_keys(table)
+            if foreign_key["referred_table"] == "stocks"
+        ]
+        if not foreign_keys:
+            continue
+        with op.batch_alter_table(
+            table, naming_convention=NAMING_CONVENTION
+        ) as batch_op:
+            for foreign_key in foreign_keys:
+                name = foreign_key["name"] or NAMING_CONVENTION["fk"] % {
+                    "table_name": table,
+                    "column_0_name": foreign_key["constrained_columns"][0],
+                    "referred_table_name": "stocks",
+                }
+                batch_op.drop_constraint(name, type_="foreignkey")
+
+
+def replace_stocks(new_table: str, select: str) -> None:
+    """Fill new_table from stocks, then put it in place of stocks."""
+    op.execute(select.format(table=new_table))
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TABLE stocks CASCADE")
+    else:
+        op.drop_table("stocks")
+    op.rename_table(new_table, "stocks")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    drop_stock_foreign_keys(inspector)
+
+    # Databases created from the models already have this shape
+    unique_constraints = {
+        constraint["name"] for constraint in inspector.get_unique_constraints("stocks")
+    }
+    if "uix_ticker_date" in unique_constraints:
+        return
+
+    # 061d83894fa5 left one row per ticker, keyed by ticker and without the
+    # price columns the split into securities and daily_bars reads
+    op.create_table(
+        "stocks_new",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("ticker", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("industry", sa.String()),
+        sa.Column("sector", sa.String()),
+        sa.Column("date", sa.DateTime()),
+        sa.Column("open", sa.Float()),
+        sa.Column("high", sa.Float()),
+        sa.Column("low", sa.Float()),
+        sa.Column("close", sa.Float()),
+        sa.Column("volume", sa.Float()),
+        sa.Column("market_cap", sa.Float()),
+        sa.Column("pe_ratio", sa.Float()),
+        sa.UniqueConstraint("ticker", "date", name="uix_ticker_date"),
+    )
+    existing = {column["name"] for column in inspector.get_columns("stocks")}
+    copied = [
+        column for column in DESCRIPTIVE_COLUMNS + PRICE_COLUMNS if column in existing
+    ]
+    columns = "".join(f", {column}" for column in copied)
+    aggregates = "".join(f", MAX({column})" for column in copied)
+    replace_stocks(
+        "stocks_new",
+        f"INSERT INTO {{table}} (ticker, date{columns}) "
+        f"SELECT ticker, date{aggregates} FROM stocks GROUP BY ticker, date",
+    )
+
+
+def downgrade() -> None:
+    # Back to one row per ticker; the dropped foreign keys are not restored
+    op.create_table(
+        "stocks_old",
+        sa.Column("ticker", sa.String(length=10), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("industry", sa.String(), nullable=True),
+        sa.Column("sector", sa.String(), nullable=True),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("close", sa.Float(), nullable=True),
+        sa.Column("market_cap", sa.Float(), nullable=True),
+        sa.Column("pe_ratio", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("ticker"),
+    )
+    replace_stocks(
+        "stocks_old",
+        "INSERT INTO {table} "
+        "(ticker, name, industry, sector, date, market_cap, pe_ratio) "
+        "SELECT ticker, MAX(name), MAX(industry), MAX(sector), MAX(date), "
+        "MAX(market_cap), MAX(pe_ratio) FROM stocks GROUP BY ticker",
+    )
@@ -0,0 +1,31 @@
+"""Index ticker/date lookups on fundamentals and sentiment_analysis
+
+Revision ID: b5d2e8a17c43
+Revises: 7c1f2b9d4e61
+Create Date: 2026-10-18 11:02:17.530912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d2e8a17c43"
+down_revision: Union[str, None] = "7c1f2b9d4e61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # stock_prices is already indexed on (ticker, date) by uix_price_ticker_date
+    op.create_index("ix_fundamentals_ticker_date", "fundamentals", ["ticker", "date"])
+    op.create_index(
+        "ix_sentiment_analysis_ticker_date", "sentiment_analysis", ["ticker", "date"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sentiment_analysis_ticker_date", table_name="sentiment_analysis")
+    op.drop_index("ix_fundamentals_ticker_date", table_name="fundamentals")
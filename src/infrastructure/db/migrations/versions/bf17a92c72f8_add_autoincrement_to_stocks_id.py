@@ -35,20 +35,28 @@ def create_stocks_table(table_name: str, autoincrement: bool = False):
 
 def copy_table_data(source_table: str, target_table: str):
     """Helper function to copy data from one table to another."""
+    # A stocks table built by the earlier revisions has no id column yet
+    inspector = sa.inspect(op.get_bind())
+    source_columns = {column["name"] for column in inspector.get_columns(source_table)}
+    columns = ", ".join(
+        column["name"]
+        for column in inspector.get_columns(target_table)
+        if column["name"] in source_columns
+    )
     op.execute(
-        f"""
-        INSERT INTO {target_table} (id, ticker, name, industry, sector,
-        date, open, high, low, close, volume, market_cap, pe_ratio)
-        SELECT id, ticker, name, industry, sector, date, open, high,
-        low, close, volume, market_cap, pe_ratio
-        FROM {source_table}
-    """
+        f"INSERT INTO {target_table} ({columns}) "
+        f"SELECT {columns} FROM {source_table}"
     )
 
 
 def drop_and_rename_table(old_table: str, new_table: str):
     """Helper function to drop a table and rename another."""
-    op.drop_table(old_table)
+    if op.get_bind().dialect.name == "postgresql":
+        # Drops the foreign keys on stocks.ticker, which the new table's
+        # non-unique ticker cannot back
+        op.execute(f"DROP TABLE {old_table} CASCADE")
+    else:
+        op.drop_table(old_table)
     op.rename_table(new_table, old_table)
 
 
@@ -0,0 +1,75 @@
+"""Split stocks into a securities dimension and a daily_bars fact table
+
+Revision ID: c8a41f0e9b27
+Revises: b5d2e8a17c43
+Create Date: 2026-10-18 13:41:05.270184
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8a41f0e9b27"
+down_revision: Union[str, None] = "b5d2e8a17c43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "securities",
+        sa.Column("security_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("ticker", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("industry", sa.String()),
+        sa.Column("sector", sa.String()),
+        sa.Column("market_cap", sa.Float()),
+        sa.Column("pe_ratio", sa.Float()),
+        sa.UniqueConstraint("ticker"),
+    )
+    op.create_table(
+        "daily_bars",
+        sa.Column(
+            "security_id",
+            sa.Integer(),
+            sa.ForeignKey("securities.security_id"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Integer(), primary_key=True),
+        sa.Column("open", sa.Float()),
+        sa.Column("high", sa.Float()),
+        sa.Column("low", sa.Float()),
+        sa.Column("close", sa.Float()),
+        sa.Column("volume", sa.BigInteger()),
+        sqlite_with_rowid=False,
+    )
+
+    # Copy the existing rows; stocks itself is left in place
+    if op.get_bind().dialect.name == "postgresql":
+        day = "(s.date::date - DATE '1970-01-01')"
+    else:
+        day = "CAST(julianday(date(s.date)) - 2440587.5 AS INTEGER)"
+    op.execute(
+        "INSERT INTO securities "
+        "(ticker, name, industry, sector, market_cap, pe_ratio) "
+        "SELECT ticker, MAX(name), MAX(industry), MAX(sector), "
+        "MAX(market_cap), MAX(pe_ratio) FROM stocks GROUP BY ticker"
+    )
+    op.execute(
+        "INSERT INTO daily_bars "
+        "(security_id, day, open, high, low, close, volume) "
+        f"SELECT sec.security_id, {day}, s.open, s.high, s.low, s.close, "
+        "CAST(s.volume AS BIGINT) "
+        "FROM stocks s JOIN securities sec ON sec.ticker = s.ticker "
+        "WHERE s.date IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_bars")
+    op.drop_table("securities")
@@ -0,0 +1,66 @@
+"""Add weekly and monthly stock_rollups maintained from stocks
+
+Revision ID: d3f9a6b2c715
+Revises: c8a41f0e9b27
+Create Date: 2026-10-18 15:02:44.918310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f9a6b2c715"
+down_revision: Union[str, None] = "c8a41f0e9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bucket starts as written by the application: Monday weeks, and on SQLite
+# the same text format SQLAlchemy uses for DateTime values
+BUCKETS = {
+    "postgresql": {
+        "weekly": "date_trunc('week', date)",
+        "monthly": "date_trunc('month', date)",
+    },
+    "sqlite": {
+        "weekly": "strftime('%Y-%m-%d 00:00:00.000000', date, 'weekday 0', '-6 days')",
+        "monthly": "strftime('%Y-%m-01 00:00:00.000000', date)",
+    },
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_rollups",
+        sa.Column("ticker", sa.String(), primary_key=True),
+        sa.Column("granularity", sa.String(), primary_key=True),
+        sa.Column("date", sa.DateTime(), primary_key=True),
+        sa.Column("open", sa.Float()),
+        sa.Column("high", sa.Float()),
+        sa.Column("low", sa.Float()),
+        sa.Column("close", sa.Float()),
+        sa.Column("volume", sa.Float()),
+        sqlite_with_rowid=False,
+    )
+
+    buckets = BUCKETS.get(op.get_bind().dialect.name, BUCKETS["sqlite"])
+    for granularity, bucket in buckets.items():
+        op.execute(
+            "INSERT INTO stock_rollups "
+            "(ticker, granularity, date, open, high, low, close, volume) "
+            f"SELECT b.ticker, '{granularity}', b.bucket, f.open, b.high, b.low, "
+            "l.close, b.volume FROM ("
+            f"SELECT ticker, {bucket} AS bucket, MIN(date) AS first_date, "
+            "MAX(date) AS last_date, MAX(high) AS high, MIN(low) AS low, "
+            "SUM(volume) AS volume FROM stocks WHERE date IS NOT NULL "
+            f"GROUP BY ticker, {bucket}) b "
+            "JOIN stocks f ON f.ticker = b.ticker AND f.date = b.first_date "
+            "JOIN stocks l ON l.ticker = b.ticker AND l.date = b.last_date"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("stock_rollups")
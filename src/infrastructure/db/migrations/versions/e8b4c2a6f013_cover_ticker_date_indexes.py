@@ -0,0 +1,57 @@
+"""Cover the selected columns in the ticker/date indexes
+
+Revision ID: e8b4c2a6f013
+Revises: f2c6d8e1a4b9
+Create Date: 2026-10-18 21:12:44.908215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4c2a6f013"
+down_revision: Union[str, None] = "f2c6d8e1a4b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Range reads select these after (ticker, date); keeping them in the index
+# lets them be answered from the index alone
+COVERED_COLUMNS = {
+    "stock_prices": [
+        "open",
+        "high",
+        "low",
+        "close",
+        "adjusted_close",
+        "volume",
+    ],
+    "fundamentals": [
+        "pe_ratio",
+        "eps",
+        "market_cap",
+        "revenue",
+        "net_income",
+        "total_assets",
+    ],
+    # The news text is left out of the index to keep it narrow
+    "sentiment_analysis": ["sentiment_score"],
+}
+
+
+def upgrade() -> None:
+    for table, columns in COVERED_COLUMNS.items():
+        name = f"ix_{table}_ticker_date"
+        if table != "stock_prices":
+            op.drop_index(name, table_name=table)
+        op.create_index(name, table, ["ticker", "date", *columns])
+
+
+def downgrade() -> None:
+    for table in COVERED_COLUMNS:
+        name = f"ix_{table}_ticker_date"
+        op.drop_index(name, table_name=table)
+        if table != "stock_prices":
+            op.create_index(name, table, ["ticker", "date"])
@@ -0,0 +1,102 @@
+"""Replace the stocks table with a view over securities and daily_bars
+
+Revision ID: f2c6d8e1a4b9
+Revises: d3f9a6b2c715
+Create Date: 2026-10-18 17:24:51.603118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6d8e1a4b9"
+down_revision: Union[str, None] = "d3f9a6b2c715"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Epoch day of a stocks date, and the midnight timestamp of an epoch day
+DAY = {
+    "postgresql": "(s.date::date - DATE '1970-01-01')",
+    "sqlite": "CAST(julianday(date(s.date)) - 2440587.5 AS INTEGER)",
+}
+DATE = {
+    "postgresql": "CAST(DATE '1970-01-01' + b.day AS TIMESTAMP)",
+    "sqlite": "datetime(b.day * 86400, 'unixepoch')",
+}
+
+# The id is derived from the bar's key, so it stays stable across reads
+STOCKS_VIEW = (
+    "CREATE VIEW stocks AS "
+    "SELECT b.security_id * 1000000 + b.day AS id, s.ticker, s.name, "
+    "s.industry, s.sector, {date} AS date, b.open, b.high, b.low, b.close, "
+    "b.volume, s.market_cap, s.pe_ratio "
+    "FROM daily_bars b JOIN securities s ON s.security_id = b.security_id"
+)
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    dialect_name = dialect_name if dialect_name in DAY else "sqlite"
+
+    # Copy rows written to stocks since the split; bars already in
+    # daily_bars are kept, as the split migration did
+    op.execute(
+        "INSERT INTO securities "
+        "(ticker, name, industry, sector, market_cap, pe_ratio) "
+        "SELECT ticker, MAX(name), MAX(industry), MAX(sector), "
+        "MAX(market_cap), MAX(pe_ratio) FROM stocks s "
+        "WHERE NOT EXISTS "
+        "(SELECT 1 FROM securities sec WHERE sec.ticker = s.ticker) "
+        "GROUP BY ticker"
+    )
+    op.execute(
+        "INSERT INTO daily_bars "
+        "(security_id, day, open, high, low, close, volume) "
+        f"SELECT sec.security_id, {DAY[dialect_name]}, s.open, s.high, s.low, "
+        "s.close, CAST(s.volume AS BIGINT) "
+        "FROM stocks s JOIN securities sec ON sec.ticker = s.ticker "
+        "WHERE s.date IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+
+    if dialect_name == "postgresql":
+        # Drops the foreign keys other tables hold on stocks.ticker, which a
+        # view cannot back
+        op.execute("DROP TABLE stocks CASCADE")
+    else:
+        op.drop_table("stocks")
+    op.execute(STOCKS_VIEW.format(date=DATE[dialect_name]))
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW stocks")
+    op.create_table(
+        "stocks",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("ticker", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("industry", sa.String()),
+        sa.Column("sector", sa.String()),
+        sa.Column("date", sa.DateTime()),
+        sa.Column("open", sa.Float()),
+        sa.Column("high", sa.Float()),
+        sa.Column("low", sa.Float()),
+        sa.Column("close", sa.Float()),
+        sa.Column("volume", sa.Float()),
+        sa.Column("market_cap", sa.Float()),
+        sa.Column("pe_ratio", sa.Float()),
+        sa.UniqueConstraint("ticker", "date", name="uix_ticker_date"),
+    )
+    dialect_name = op.get_bind().dialect.name
+    op.execute(
+        "INSERT INTO stocks (ticker, name, industry, sector, date, open, high, "
+        "low, close, volume, market_cap, pe_ratio) "
+        "SELECT s.ticker, s.name, s.industry, s.sector, "
+        f"{DATE.get(dialect_name, DATE['sqlite'])}, b.open, b.high, b.low, "
+        "b.close, b.volume, s.market_cap, s.pe_ratio "
+        "FROM daily_bars b JOIN securities s ON s.security_id = b.security_id"
+    )
@@ -0,0 +1,267 @@
+# src/infrastructure/db/mmap_stock_repository.py
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional
+import numpy as np
+import pandas as pd
+from domain.models.stock import Stock
+from infrastructure.db.aggregation import as_granularity
+from interfaces.common.enums import Granularity
+from repositories.stock_repository import StockRepository
+
+# Column files in write order; date goes last so it bounds the row count
+COLUMN_DTYPES = {
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+    "date": np.dtype("<M8[us]"),
+}
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class MmapStockRepository(StockRepository):
+    """Store OHLCV bars as fixed-width binary column files per ticker.
+
+    Each ticker has ``root/ticker=<TICKER>/<column>.bin`` files holding one
+    little-endian value per bar, sorted by date. Reads map the files
+    read-only, binary-search the date column and return NumPy views, so a
+    range read copies nothing and every process reading the same files
+    shares the OS page cache.
+
+    Bars newer than the last stored one are appended in place; anything
+    else rewrites the ticker's files into a new directory that replaces the
+    old one. Appends write the date column last and readers only trust as
+    many rows as it holds, so a torn append is ignored and trimmed by the
+    next write. One process should write at a time.
+
+    Unlike the ``StockRepository`` interface, which returns ``Stock``
+    objects, ``get_stock_data`` returns a DataFrame of column views, since
+    building a ``Stock`` per bar would undo the zero-copy read. Only daily
+    bars are stored, so it rejects any other granularity.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._maps = {}
+
+    def create_stock(self, stock: Stock) -> Stock:
+        self.save_many([self._row_from_stock(stock)])
+        return stock
+
+    def save(self, stock: Stock) -> Stock:
+        return self.create_stock(stock)
+
+    def update(self, stock: Stock) -> Stock:
+        return self.create_stock(stock)
+
+    def get(self, ticker: str) -> Optional[Stock]:
+        """Return the latest bar for a ticker."""
+        columns = self._columns(ticker)
+        if not len(columns["date"]):
+            return None
+        return Stock(
+            ticker=ticker,
+            name=None,
+            industry=None,
+            sector=None,
+            date=columns["date"][-1].astype(datetime),
+            **{name: float(columns[name][-1]) for name in PRICE_COLUMNS},
+        )
+
+    def delete_stock(self, ticker: str) -> bool:
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return False
+        with self._lock:
+            self._maps.pop(ticker, None)
+            shutil.rmtree(ticker_dir)
+        return True
+
+    def save_many(self, bars) -> int:
+        """Write bars (dicts with ticker, date and OHLCV) to their tickers."""
+        frame = pd.DataFrame(list(bars))
+        if frame.empty:
+            return 0
+        written = 0
+        for ticker, ticker_bars in frame.groupby("ticker", sort=False):
+            written += self.write_frame(ticker, ticker_bars)
+        return written
+
+    def write_frame(self, ticker: str, frame) -> int:
+        """Append or merge a DataFrame of bars for one ticker.
+
+        Bars for a date already stored replace it, last one winning.
+        """
+        frame = self._normalize(frame)
+        if frame.empty:
+            return 0
+        with self._lock:
+            stored = self._columns(ticker)
+            if len(stored["date"]) and frame["date"].iloc[0] <= stored["date"][-1]:
+                existing = pd.DataFrame({name: stored[name] for name in COLUMN_DTYPES})
+                merged = self._normalize(pd.concat([existing, frame]))
+                self._rewrite(ticker, merged)
+            else:
+                self._append(ticker, frame, len(stored["date"]))
+        return len(frame)
+
+    def rebuild(self, ticker: str, frame) -> int:
+        """Replace everything stored for ``ticker`` with ``frame``."""
+        frame = self._normalize(frame)
+        with self._lock:
+            self._rewrite(ticker, frame)
+        return len(frame)
+
+    def get_range(self, ticker: str, start_date, end_date, columns=None) -> dict:
+        """Return ``{column: array}`` views of the bars between two dates.
+
+        The arrays are read-only slices of the mapped files, found with a
+        binary search on the date column; ``date`` is always included.
+        """
+        mapped = self._columns(ticker)
+        dates = mapped["date"]
+        first = np.searchsorted(dates, np.datetime64(start_date, "us"), side="left")
+        last = np.searchsorted(dates, np.datetime64(end_date, "us"), side="right")
+        names = ["date"] + [
+            name for name in (columns or PRICE_COLUMNS) if name != "date"
+        ]
+        return {name: mapped[name][first:last] for name in names}
+
+    def get_stock_data(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        granularity=None,
+        columns=None,
+    ):
+        """Return bars between the two dates as a DataFrame sorted by date.
+
+        Raises ValueError for a granularity other than daily; there is no
+        aggregation here.
+        """
+        granularity = as_granularity(granularity)
+        if granularity not in (None, Granularity.DAILY):
+            raise ValueError(
+                f"MmapStockRepository only stores daily bars, not {granularity.value}"
+            )
+        return pd.DataFrame(self.get_range(ticker, start_date, end_date, columns))
+
+    def get_latest_date(self, ticker: str) -> Optional[datetime]:
+        dates = self._columns(ticker)["date"]
+        return dates[-1].astype(datetime) if len(dates) else None
+
+    def tickers(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(self.root)
+            if name.startswith("ticker=")
+            and os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, f"ticker={ticker}")
+
+    def _columns(self, ticker):
+        """Read-only maps of a ticker's columns, trimmed to the stored rows.
+
+        Maps are reused until the date file is appended to or replaced.
+        """
+        ticker_dir = self._ticker_dir(ticker)
+        try:
+            stat = os.stat(os.path.join(ticker_dir, "date.bin"))
+        except FileNotFoundError:
+            return {name: np.empty(0, dtype) for name, dtype in COLUMN_DTYPES.items()}
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = self._maps.get(ticker)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        rows = stat.st_size // COLUMN_DTYPES["date"].itemsize
+        columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if rows:
+                columns[name] = np.memmap(
+                    os.path.join(ticker_dir, f"{name}.bin"),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(rows,),
+                )
+            else:
+                columns[name] = np.empty(0, dtype)
+        self._maps[ticker] = (signature, columns)
+        return columns
+
+    def _append(self, ticker, frame, rows):
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        for name, dtype in COLUMN_DTYPES.items():
+            path = os.path.join(ticker_dir, f"{name}.bin")
+            with open(path, "ab") as column_file:
+                # Drop values a torn append left behind the last full row
+                column_file.truncate(rows * dtype.itemsize)
+                column_file.write(frame[name].to_numpy(dtype).tobytes())
+                column_file.flush()
+                os.fsync(column_file.fileno())
+
+    def _rewrite(self, ticker, frame):
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = f"{ticker_dir}.tmp-{uuid.uuid4().hex[:8]}"
+        os.makedirs(tmp_dir)
+        for name, dtype in COLUMN_DTYPES.items():
+            with open(os.path.join(tmp_dir, f"{name}.bin"), "wb") as column_file:
+                column_file.write(frame[name].to_numpy(dtype).tobytes())
+                column_file.flush()
+                os.fsync(column_file.fileno())
+        # Readers holding maps of the old files keep reading them until
+        # they notice the new date file
+        old_dir = None
+        if os.path.isdir(ticker_dir):
+            old_dir = f"{ticker_dir}.old-{uuid.uuid4().hex[:8]}"
+            os.rename(ticker_dir, old_dir)
+        os.rename(tmp_dir, ticker_dir)
+        if old_dir is not None:
+            shutil.rmtree(old_dir)
+
+    @staticmethod
+    def _normalize(frame):
+        frame = frame.reindex(columns=list(COLUMN_DTYPES)).copy()
+        frame["date"] = pd.to_datetime(frame["date"])
+        if frame["date"].dt.tz is not None:
+            frame["date"] = frame["date"].dt.tz_localize(None)
+        frame[PRICE_COLUMNS] = frame[PRICE_COLUMNS].astype("float64")
+        frame = frame.drop_duplicates(subset="date", keep="last")
+        return frame.sort_values("date", kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _row_from_stock(stock):
+        return {
+            "ticker": stock.ticker,
+            "date": stock.date,
+            **{name: getattr(stock, name) for name in PRICE_COLUMNS},
+        }
+
+
+def rebuild_from_sql(store: MmapStockRepository, sql_repository, tickers=None) -> int:
+    """Rebuild the store's files from the SQL daily bars.
+
+    ``sql_repository`` is a ``StockRepositoryImpl``; its columnar
+    ``get_stock_frame`` read feeds each ticker. Every stored ticker is
+    rebuilt when ``tickers`` is not given. Returns the number of bars written.
+    """
+    if tickers is None:
+        tickers = sql_repository.tickers()
+    written = 0
+    for ticker in tickers:
+        frame = sql_repository.get_stock_frame(ticker, datetime.min, datetime.max)
+        written += store.rebuild(ticker, frame)
+    return written
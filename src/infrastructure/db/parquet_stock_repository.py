@@ -0,0 +1,298 @@
+# src/infrastructure/db/parquet_stock_repository.py
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from domain.models.stock import Stock
+from repositories.stock_repository import StockRepository
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for the Parquet repository
+    pa = pc = ds = pq = None
+
+BAR_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# Part files a partition may collect before it is compacted on write
+MAX_PARTS = 16
+
+
+def bar_schema():
+    return pa.schema(
+        [
+            ("date", pa.timestamp("us")),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.float64()),
+        ]
+    )
+
+
+class ParquetStockRepository(StockRepository):
+    """Store OHLCV bars as Parquet files partitioned by ticker and year.
+
+    Files live under ``root/ticker=<TICKER>/year=<YYYY>/``. Writes append a
+    new part file per partition; ``compact`` rewrites a partition as one
+    sorted file, keeping the newest value for each date. Range reads only
+    open the ticker and year partitions they need and push the date filter
+    and column projection down to the Parquet reader.
+
+    Writes, compaction and deletes hold a lock; reads do not, and read a
+    listing of part files again under the lock if compaction removed some
+    of them first.
+    """
+
+    def __init__(
+        self, root: str, max_parts: int = MAX_PARTS, compression: str = "zstd"
+    ):
+        if pa is None:
+            raise ImportError("pyarrow is required for ParquetStockRepository")
+        self.root = root
+        self.max_parts = max_parts
+        self.compression = compression
+        self._lock = threading.Lock()
+
+    def create_stock(self, stock: Stock) -> Stock:
+        self.save_many([self._row_from_stock(stock)])
+        return stock
+
+    def save(self, stock: Stock) -> Stock:
+        return self.create_stock(stock)
+
+    def update(self, stock: Stock) -> Stock:
+        # Newer part files win over older ones, so an update is an append
+        return self.create_stock(stock)
+
+    def get(self, ticker: str) -> Optional[Stock]:
+        """Return the latest bar for a ticker."""
+        latest = self.get_latest_date(ticker)
+        if latest is None:
+            return None
+        bars = self.get_stock_data(ticker, latest, latest)
+        if bars.empty:
+            return None
+        bar = bars.iloc[-1]
+        return Stock(
+            ticker=ticker,
+            name=None,
+            industry=None,
+            sector=None,
+            date=bar["date"].to_pydatetime(),
+            open=bar["open"],
+            high=bar["high"],
+            low=bar["low"],
+            close=bar["close"],
+            volume=bar["volume"],
+        )
+
+    def delete_stock(self, ticker: str) -> bool:
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return False
+        with self._lock:
+            shutil.rmtree(ticker_dir)
+        return True
+
+    def save_many(self, bars) -> int:
+        """Append bars (dicts with ticker, date and OHLCV) to their partitions."""
+        frame = pd.DataFrame(list(bars))
+        if frame.empty:
+            return 0
+        written = 0
+        for ticker, ticker_bars in frame.groupby("ticker", sort=False):
+            written += self.write_frame(ticker, ticker_bars)
+        return written
+
+    def write_frame(self, ticker: str, frame) -> int:
+        """Append a DataFrame of bars for one ticker, one part per year."""
+        if frame.empty:
+            return 0
+        frame = frame.reindex(columns=BAR_COLUMNS)
+        frame["date"] = pd.to_datetime(frame["date"])
+        if frame["date"].dt.tz is not None:
+            frame["date"] = frame["date"].dt.tz_localize(None)
+        with self._lock:
+            for year, year_bars in frame.groupby(frame["date"].dt.year):
+                partition = self._partition_dir(ticker, year)
+                os.makedirs(partition, exist_ok=True)
+                self._write(year_bars, os.path.join(partition, self._part_name()))
+                if len(self._parts(partition)) > self.max_parts:
+                    self._compact_partition(partition)
+        return len(frame)
+
+    def compact(self, ticker: str = None) -> int:
+        """Compact every partition of ``ticker`` (or of all tickers).
+
+        Returns the number of partitions that were rewritten.
+        """
+        tickers = [ticker] if ticker else self.tickers()
+        compacted = 0
+        with self._lock:
+            for name in tickers:
+                for partition in self._partitions(name):
+                    if len(self._parts(partition)) > 1:
+                        self._compact_partition(partition)
+                        compacted += 1
+        return compacted
+
+    def get_stock_data(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        granularity=None,
+        columns=None,
+    ):
+        """Return bars between the two dates as a DataFrame sorted by date.
+
+        ``columns`` limits the price columns that are read; ``date`` is
+        always included.
+        """
+        columns = ["date"] + [
+            name for name in (columns or BAR_COLUMNS) if name != "date"
+        ]
+
+        def list_files():
+            return [
+                path
+                for partition in self._partitions(ticker)
+                if start_date.year <= self._partition_year(partition) <= end_date.year
+                for path in self._parts(partition)
+            ]
+
+        def read(files):
+            if not files:
+                return None
+            dataset = ds.dataset(files, schema=bar_schema(), format="parquet")
+            return dataset.to_table(
+                columns=columns,
+                filter=(ds.field("date") >= pa.scalar(start_date, pa.timestamp("us")))
+                & (ds.field("date") <= pa.scalar(end_date, pa.timestamp("us"))),
+            )
+
+        table = self._read_snapshot(list_files, read)
+        if table is None:
+            return pd.DataFrame(columns=columns)
+        frame = table.to_pandas()
+        # Parts are read oldest first, so the last value for a date is newest
+        frame = frame.drop_duplicates(subset="date", keep="last")
+        return frame.sort_values("date", kind="stable").reset_index(drop=True)
+
+    def get_latest_date(self, ticker: str) -> Optional[datetime]:
+        def list_files():
+            return [self._parts(partition) for partition in self._partitions(ticker)]
+
+        def read(partitions):
+            for parts in reversed(partitions):
+                dates = ds.dataset(
+                    parts, schema=bar_schema(), format="parquet"
+                ).to_table(columns=["date"])["date"]
+                if len(dates):
+                    return pc.max(dates).as_py()
+            return None
+
+        return self._read_snapshot(list_files, read)
+
+    def _read_snapshot(self, list_files, read):
+        """Return ``read(list_files())`` without blocking writers.
+
+        Compaction and deletes may remove listed part files before they are
+        read. Then the listing and read are repeated once under the lock,
+        where no file can go away; the compacted file was written before
+        the parts were removed, so the new listing still covers every bar.
+        Other read errors are raised by the second attempt.
+        """
+        try:
+            return read(list_files())
+        except OSError:
+            pass
+        with self._lock:
+            return read(list_files())
+
+    def tickers(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(self.root)
+            if name.startswith("ticker=")
+        )
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, f"ticker={ticker}")
+
+    def _partition_dir(self, ticker, year):
+        return os.path.join(self._ticker_dir(ticker), f"year={year}")
+
+    def _partitions(self, ticker):
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return []
+        return sorted(
+            (
+                os.path.join(ticker_dir, name)
+                for name in os.listdir(ticker_dir)
+                if name.startswith("year=")
+            ),
+            key=self._partition_year,
+        )
+
+    @staticmethod
+    def _partition_year(partition):
+        return int(os.path.basename(partition).split("=", 1)[1])
+
+    @staticmethod
+    def _parts(partition):
+        # Part names start with a timestamp, so sorting gives write order
+        return sorted(
+            os.path.join(partition, name)
+            for name in os.listdir(partition)
+            if name.endswith(".parquet")
+        )
+
+    @staticmethod
+    def _part_name():
+        return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+    def _write(self, frame, path):
+        table = pa.Table.from_pandas(
+            frame[BAR_COLUMNS], schema=bar_schema(), preserve_index=False
+        )
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = path + ".tmp"
+        pq.write_table(table, tmp_path, compression=self.compression)
+        os.replace(tmp_path, path)
+
+    def _compact_partition(self, partition):
+        parts = self._parts(partition)
+        frame = (
+            ds.dataset(parts, schema=bar_schema(), format="parquet")
+            .to_table()
+            .to_pandas()
+            .drop_duplicates(subset="date", keep="last")
+            .sort_values("date", kind="stable")
+        )
+        self._write(frame, os.path.join(partition, self._part_name()))
+        for path in parts:
+            os.remove(path)
+
+    @staticmethod
+    def _row_from_stock(stock):
+        return {
+            "ticker": stock.ticker,
+            "date": stock.date,
+            "open": stock.open,
+            "high": stock.high,
+            "low": stock.low,
+            "close": stock.close,
+            "volume": stock.volume,
+        }
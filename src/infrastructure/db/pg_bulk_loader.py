@@ -0,0 +1,233 @@
+# src/infrastructure/db/pg_bulk_loader.py
+import io
+import pandas as pd
+from sqlalchemy import Integer, column, select, table
+from domain.models.security import DailyBar, Security, epoch_day
+from infrastructure.db.models import StockPrice
+from infrastructure.db.stock_price_writer import PRICE_COLUMNS as BAR_COLUMNS
+from infrastructure.db.stock_repository_impl import (
+    PRICE_COLUMNS as STOCK_COLUMNS,
+    SECURITY_COLUMNS,
+    rollup_refresh_statement,
+)
+
+# Rows serialized per COPY chunk, so large frames never become one CSV string
+COPY_CHUNK_ROWS = 50000
+
+# Table, conflict columns and columns refreshed on conflict
+TABLES = {
+    "stock_prices": (StockPrice.__table__, ["ticker", "date"], BAR_COLUMNS),
+}
+
+
+class PostgresBulkLoader:
+    """Bulk load DataFrames into PostgreSQL with COPY and a staging table.
+
+    Each load streams the frame in CSV chunks through ``COPY ... FROM STDIN``
+    into a temporary table, then merges it into the target table with one
+    ``INSERT ... SELECT ... ON CONFLICT (ticker, date) DO UPDATE``. The
+    staging table is dropped when the transaction commits. Loads into
+    ``stocks`` go to the ``securities`` and ``daily_bars`` tables behind it
+    and refresh the loaded tickers' ``stock_rollups`` in the same
+    transaction, unless ``rollups`` is False.
+    """
+
+    def __init__(self, engine, chunk_rows: int = COPY_CHUNK_ROWS, rollups: bool = True):
+        if engine.dialect.name != "postgresql":
+            raise ValueError(
+                f"COPY bulk loads need PostgreSQL, not {engine.dialect.name}"
+            )
+        self.engine = engine
+        self.chunk_rows = chunk_rows
+        self.rollups = rollups
+        self._quote = engine.dialect.identifier_preparer.quote
+
+    def load(self, table_name: str, frame) -> int:
+        """Upsert ``frame`` into ``table_name`` and return the rows merged."""
+        if table_name == "stocks":
+            return self.load_stocks(frame)
+        if table_name not in TABLES:
+            raise ValueError(f"Unsupported table for bulk load: {table_name}")
+        table, keys, update_columns = TABLES[table_name]
+
+        self._check_keys(frame, keys)
+        columns = [name for name in frame.columns if name in table.c]
+        # A key may appear once per INSERT ... ON CONFLICT, so the last one wins
+        frame = frame[columns].drop_duplicates(subset=keys, keep="last")
+        if frame.empty:
+            return 0
+        frame = self._cast_integer_columns(table, frame)
+
+        staging = self._quote(f"staging_{table.name}")
+        column_list = ", ".join(self._quote(name) for name in columns)
+        conflict = ", ".join(self._quote(name) for name in keys)
+        action = self._conflict_action(update_columns, columns)
+        return self._merge(
+            staging,
+            f"SELECT {column_list} FROM {self._quote(table.name)}",
+            columns,
+            frame,
+            [
+                f"INSERT INTO {self._quote(table.name)} ({column_list}) "
+                f"SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT ({conflict}) {action}"
+            ],
+        )
+
+    def load_stocks(self, frame) -> int:
+        """Upsert daily bars into ``securities`` and ``daily_bars``.
+
+        ``frame`` has the columns of the ``stocks`` view: ``ticker``,
+        ``date``, OHLCV and optionally the descriptive columns. Tickers not
+        stored yet get a security with those columns, stored ones keep
+        theirs, and bars are merged on ``(security_id, day)``; a bar's time
+        of day is dropped. The weekly and monthly rollups overlapping the
+        loaded days are then rewritten, as repository writes do. Returns the
+        bars merged.
+        """
+        keys = ["ticker", "date"]
+        self._check_keys(frame, keys)
+        prices = [name for name in STOCK_COLUMNS if name in frame.columns]
+        descriptive = [name for name in SECURITY_COLUMNS if name in frame.columns]
+        columns = keys + prices + descriptive
+        frame = frame[columns].assign(date=pd.to_datetime(frame["date"]).dt.normalize())
+        frame = frame.drop_duplicates(subset=keys, keep="last")
+        if frame.empty:
+            return 0
+        frame = self._cast_integer_columns(DailyBar.__table__, frame)
+
+        quote = self._quote
+        staging = quote("staging_daily_bars")
+        column_list = ", ".join(quote(name) for name in columns)
+        price_list = "".join(f", st.{quote(name)}" for name in prices)
+        attribute_list = "".join(f", MAX({quote(name)})" for name in descriptive)
+        action = self._conflict_action(STOCK_COLUMNS, prices)
+        return self._merge(
+            staging,
+            # The stocks view has every column a load can carry
+            f"SELECT {column_list} FROM stocks",
+            columns,
+            frame,
+            [
+                "INSERT INTO securities (ticker"
+                + "".join(f", {quote(name)}" for name in descriptive)
+                + f") SELECT ticker{attribute_list} FROM {staging} "
+                "GROUP BY ticker ON CONFLICT (ticker) DO NOTHING",
+                "INSERT INTO daily_bars (security_id, day"
+                + "".join(f", {quote(name)}" for name in prices)
+                + ") SELECT s.security_id, st.date::date - DATE '1970-01-01'"
+                f"{price_list} FROM {staging} st "
+                "JOIN securities s ON s.ticker = st.ticker "
+                f"ON CONFLICT (security_id, day) {action}",
+            ],
+            [self._rollup_refresh("staging_daily_bars", frame)] if self.rollups else [],
+        )
+
+    def _rollup_refresh(self, staging, frame):
+        """Compile the rollup refresh for the securities in ``staging``."""
+        security_ids = select(Security.security_id).where(
+            Security.ticker.in_(select(column("ticker")).select_from(table(staging)))
+        )
+        statement = rollup_refresh_statement(
+            self.engine.dialect.name,
+            security_ids,
+            epoch_day(frame["date"].min()),
+            epoch_day(frame["date"].max()),
+        )
+        return statement.compile(dialect=self.engine.dialect)
+
+    def _merge(
+        self, staging, shape_sql, columns, frame, merge_sqls, compiled=()
+    ) -> int:
+        """COPY ``frame`` into a staging table and run ``merge_sqls``.
+
+        The staging table takes its columns from ``shape_sql``, and the
+        ``compiled`` statements run after the merge in the same transaction.
+        Returns the row count of the last merge statement.
+        """
+        column_list = ", ".join(self._quote(name) for name in columns)
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"{shape_sql} WITH NO DATA"
+            )
+            copy_sql = f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+            for start in range(0, len(frame), self.chunk_rows):
+                stop = start + self.chunk_rows
+                self._copy(cursor, copy_sql, frame.iloc[start:stop])
+            for sql in merge_sqls:
+                cursor.execute(sql)
+            merged = cursor.rowcount
+            for statement in compiled:
+                cursor.execute(str(statement), statement.params)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        return merged
+
+    def _conflict_action(self, update_columns, columns) -> str:
+        updates = ", ".join(
+            f"{self._quote(name)} = EXCLUDED.{self._quote(name)}"
+            for name in update_columns
+            if name in columns
+        )
+        return f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+    @staticmethod
+    def _check_keys(frame, keys):
+        missing = [key for key in keys if key not in frame.columns]
+        if missing:
+            raise ValueError(f"Frame is missing key columns: {missing}")
+
+    def load_stock_prices(self, frame) -> int:
+        return self.load("stock_prices", frame)
+
+    def frame_sink(self, table_name: str):
+        """Return a ``sink(ticker, frame)`` for the async ingestion engine."""
+
+        def sink(ticker, frame):
+            if "ticker" not in frame.columns:
+                frame = frame.assign(ticker=ticker)
+            return self.load(table_name, frame)
+
+        return sink
+
+    @staticmethod
+    def _cast_integer_columns(table, frame):
+        """Cast columns bound for INTEGER columns to nullable integers.
+
+        COPY rejects ``100.0`` for an INTEGER column, and float volumes are
+        common since one missing value makes pandas store a column as
+        float64. Values are rounded the way PostgreSQL rounds on INSERT and
+        missing ones stay empty, which COPY reads as NULL.
+        """
+        integer_columns = [
+            name
+            for name in frame.columns
+            if name in table.c and isinstance(table.c[name].type, Integer)
+        ]
+        if not integer_columns:
+            return frame
+        frame = frame.copy()
+        for name in integer_columns:
+            frame[name] = pd.to_numeric(frame[name]).round().astype("Int64")
+        return frame
+
+    @staticmethod
+    def _copy(cursor, copy_sql, chunk):
+        # Empty unquoted CSV fields are read back as NULL
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2
+            cursor.copy_expert(copy_sql, buffer)
+        else:
+            # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
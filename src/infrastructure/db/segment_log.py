@@ -0,0 +1,231 @@
+# src/infrastructure/db/segment_log.py
+import json
+import os
+import struct
+import threading
+import zlib
+from datetime import date, datetime
+import numpy as np
+
+# Each record is its payload length and CRC32 followed by a JSON payload
+HEADER = struct.Struct("<II")
+SEGMENT_BYTES = 16 * 1024 * 1024
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot write {type(value).__name__} to the segment log")
+
+
+def _decode(bar):
+    if isinstance(bar.get("date"), str):
+        bar["date"] = datetime.fromisoformat(bar["date"])
+    return bar
+
+
+class SegmentLog:
+    """Append-only log of bar batches split into numbered segment files.
+
+    ``append`` writes a batch as one length-prefixed, checksummed record and
+    syncs it to disk before returning, so a batch that was appended survives
+    a crash. A record cut short by a crash fails its checksum and is ignored
+    along with anything after it. ``checkpoint`` stores how far a consumer
+    has applied the log.
+    """
+
+    def __init__(
+        self, directory: str, segment_bytes: int = SEGMENT_BYTES, fsync: bool = True
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # A crash can leave a torn record at the end of the last segment, so
+        # a reopened log always starts a new one. Numbering also continues
+        # past the checkpoint, whose segment may already have been removed,
+        # so new records are never read from a stale offset
+        last = max(self.segments(), default=-1)
+        checkpoint = self._read_checkpoint()
+        if checkpoint is not None:
+            last = max(last, checkpoint[0])
+        self._active = last + 1
+        self._file = None
+
+    def append(self, bars) -> int:
+        """Durably append a batch of bar dicts. Returns the batch size."""
+        bars = list(bars)
+        if not bars:
+            return 0
+        payload = json.dumps(bars, default=_encode).encode()
+        record = HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._file is None:
+                self._open(self._active)
+            elif self._file.tell() + len(record) > self.segment_bytes:
+                self._open(self._active + 1)
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        return len(bars)
+
+    def segments(self):
+        """Segment numbers on disk, oldest first."""
+        return sorted(
+            int(name.removeprefix("segment-").removesuffix(".log"))
+            for name in os.listdir(self.directory)
+            if name.startswith("segment-") and name.endswith(".log")
+        )
+
+    def read(self, segment: int, offset: int = 0):
+        """Yield ``(next_offset, bars)`` for each complete record from offset."""
+        try:
+            with open(self._path(segment), "rb") as segment_file:
+                segment_file.seek(offset)
+                while True:
+                    header = segment_file.read(HEADER.size)
+                    if len(header) < HEADER.size:
+                        return
+                    length, crc = HEADER.unpack(header)
+                    payload = segment_file.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        return
+                    offset += HEADER.size + length
+                    yield offset, [_decode(bar) for bar in json.loads(payload)]
+        except FileNotFoundError:
+            return
+
+    def is_active(self, segment: int) -> bool:
+        with self._lock:
+            return segment == self._active
+
+    def remove(self, segment: int):
+        """Delete a segment that has been applied and is no longer written."""
+        os.remove(self._path(segment))
+
+    def load_checkpoint(self):
+        """Return ``(segment, offset)`` up to which the log was applied."""
+        checkpoint = self._read_checkpoint()
+        if checkpoint is None:
+            segments = self.segments()
+            return (segments[0] if segments else 0), 0
+        return checkpoint
+
+    def save_checkpoint(self, segment: int, offset: int):
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump({"segment": segment, "offset": offset}, handle)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _read_checkpoint(self):
+        try:
+            with open(os.path.join(self.directory, CHECKPOINT_FILE)) as handle:
+                checkpoint = json.load(handle)
+        except FileNotFoundError:
+            return None
+        return checkpoint["segment"], checkpoint["offset"]
+
+    def _open(self, segment):
+        if self._file is not None:
+            self._file.close()
+        self._active = segment
+        self._file = open(self._path(segment), "ab")
+
+    def _path(self, segment):
+        return os.path.join(self.directory, f"segment-{segment:012d}.log")
+
+
+class SegmentDrainer:
+    """Apply a segment log to the database in the background.
+
+    ``sink(bars)`` does the write, typically a bulk upsert such as
+    ``StockRepositoryImpl.save_many``. Records are grouped into batches of
+    up to ``batch_size`` bars and the checkpoint moves only after the sink
+    succeeds, so after a crash or a failed write the same bars are applied
+    again on the next drain; upsert sinks make that harmless. Segments that
+    are fully applied are deleted.
+    """
+
+    def __init__(self, log: SegmentLog, sink, batch_size: int = 5000, interval=1.0):
+        self.log = log
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._drain_lock = threading.Lock()
+        self.stats = {"applied": 0, "failed": 0}
+
+    def drain_once(self) -> int:
+        """Apply everything written so far. Returns the bars applied."""
+        with self._drain_lock:
+            segment, offset = self.log.load_checkpoint()
+            applied = 0
+            for current in self.log.segments():
+                if current < segment:
+                    self.log.remove(current)
+                    continue
+                # Only a segment sealed before reading it is known to be complete
+                sealed = not self.log.is_active(current)
+                start = offset if current == segment else 0
+                applied += self._drain_segment(current, start)
+                if sealed:
+                    self.log.remove(current)
+            return applied
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True):
+        """Stop the background thread, applying what is left first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if drain:
+            self.drain_once()
+
+    def _drain_segment(self, segment, offset):
+        applied = 0
+        batch = []
+        for next_offset, bars in self.log.read(segment, offset):
+            batch.extend(bars)
+            offset = next_offset
+            if len(batch) >= self.batch_size:
+                applied += self._apply(batch, segment, offset)
+                batch = []
+        if batch:
+            applied += self._apply(batch, segment, offset)
+        return applied
+
+    def _apply(self, batch, segment, offset):
+        self.sink(batch)
+        self.log.save_checkpoint(segment, offset)
+        self.stats["applied"] += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain_once()
+            except Exception as e:
+                print(f"Failed to drain the ingestion log: {e}")
+                self.stats["failed"] += 1
+            self._stop.wait(self.interval)
@@ -0,0 +1,109 @@
+# src/infrastructure/db/session_manager.py
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+_managers = weakref.WeakSet()
+
+
+def current_task():
+    """Return the running asyncio task, or None outside a coroutine."""
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class SessionManager:
+    """Hand out one session per thread or asyncio task from a shared engine.
+
+    ``session()`` returns the session of the calling scope, so repositories
+    built in different worker threads or tasks never share one. A thread's
+    session goes away with the thread, and a task's session is closed when
+    the task finishes, so a later task never inherits it. Use
+    ``session_scope()`` to get a committed-or-rolled-back transaction that
+    releases the session when done; nested scopes reuse the outer session
+    and leave the commit to it. A session obtained with ``session()`` is
+    not a scope, so a ``session_scope()`` entered afterwards commits.
+    After ``os.fork`` the child drops the pooled connections it inherited
+    and starts with fresh sessions.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.registry = scoped_session(self.factory)
+        # Sessions of running tasks; each is dropped by its task's done
+        # callback, which runs on the task's own loop thread
+        self._task_sessions = {}
+        # Open session_scope() blocks per thread or task; each key belongs
+        # to a single thread or task, so no lock is needed
+        self._depths = {}
+        _managers.add(self)
+
+    def session(self):
+        task = current_task()
+        if task is None:
+            return self.registry()
+        session = self._task_sessions.get(task)
+        if session is None:
+            session = self._task_sessions[task] = self.factory()
+            task.add_done_callback(self._release_task)
+        return session
+
+    def remove(self):
+        """Close and forget the calling scope's session."""
+        task = current_task()
+        if task is None:
+            self.registry.remove()
+        else:
+            self._release_task(task)
+
+    def _release_task(self, task):
+        session = self._task_sessions.pop(task, None)
+        if session is not None:
+            session.close()
+
+    @contextmanager
+    def session_scope(self):
+        task = current_task()
+        key = threading.get_ident() if task is None else task
+        depth = self._depths.get(key, 0)
+        self._depths[key] = depth + 1
+        session = self.session()
+        if depth:
+            try:
+                yield session
+            finally:
+                self._depths[key] = depth
+            return
+
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            del self._depths[key]
+            self.remove()
+
+    def after_fork(self):
+        # The parent still owns the inherited connections, so they are
+        # dropped without being closed
+        self.engine.dispose(close=False)
+        self.registry = scoped_session(self.factory)
+        self._task_sessions = {}
+        self._depths = {}
+
+
+def _reset_after_fork():
+    for manager in list(_managers):
+        manager.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,162 @@
+# src/infrastructure/db/stock_price_partitions.py
+import re
+import threading
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    inspect,
+    select,
+)
+from infrastructure.db.stock_price_writer import PRICE_COLUMNS
+from infrastructure.db.upsert import chunk_rows, upsert_statement
+from utils.config import get_setting
+
+
+class StockPricePartitions:
+    """Split stock_prices into one table per year and route to them.
+
+    Bars for a year go to ``stock_prices_<YYYY>``, which is created with the
+    same columns and indexes as stock_prices the first time it is written
+    to. Range queries only read the tables for the years they span, so
+    their cost follows the range, not the whole history.
+    """
+
+    def __init__(self, engine, prefix: str = "stock_prices"):
+        self.engine = engine
+        self.prefix = prefix
+        self.metadata = MetaData()
+        self._tables = {}
+        self._years = None
+        self._lock = threading.Lock()
+
+    def table_name(self, year: int) -> str:
+        return f"{self.prefix}_{year}"
+
+    def years(self):
+        """Years that have a partition table, oldest first."""
+        with self._lock:
+            if self._years is None:
+                pattern = re.compile(rf"^{re.escape(self.prefix)}_(\d{{4}})$")
+                self._years = {
+                    int(match.group(1))
+                    for match in map(
+                        pattern.match, inspect(self.engine).get_table_names()
+                    )
+                    if match
+                }
+            return sorted(self._years)
+
+    def years_for_range(self, start, end):
+        return [year for year in self.years() if start.year <= year <= end.year]
+
+    def tables_for_range(self, start, end):
+        """Partition tables holding bars between two datetimes, oldest first."""
+        return [self.table(year) for year in self.years_for_range(start, end)]
+
+    def table(self, year: int, create: bool = False):
+        """Return the partition table for ``year``, creating it if asked."""
+        exists = year in self.years()
+        with self._lock:
+            if year not in self._tables:
+                self._tables[year] = self._define(year)
+            table = self._tables[year]
+            if create and not exists:
+                table.create(self.engine, checkfirst=True)
+                self._years.add(year)
+        return table
+
+    def write(self, bars, batch_size: int = 1000) -> int:
+        """Upsert bars into their year's partition in one transaction."""
+        rows_by_year = {}
+        for bar in bars:
+            row = {"ticker": bar["ticker"], "date": bar["date"]}
+            row.update({name: bar.get(name) for name in PRICE_COLUMNS})
+            rows_by_year.setdefault(bar["date"].year, {})[
+                (row["ticker"], row["date"])
+            ] = row
+        if not rows_by_year:
+            return 0
+
+        tables = {year: self.table(year, create=True) for year in rows_by_year}
+        with self.engine.begin() as connection:
+            for year, rows in rows_by_year.items():
+                for chunk in chunk_rows(list(rows.values()), batch_size):
+                    connection.execute(
+                        upsert_statement(
+                            self.engine.dialect.name,
+                            tables[year],
+                            chunk,
+                            ["ticker", "date"],
+                            PRICE_COLUMNS,
+                        )
+                    )
+        return sum(len(rows) for rows in rows_by_year.values())
+
+    def query_range(self, ticker: str, start, end, columns=None):
+        """Return bars for ``ticker`` between two datetimes, oldest first.
+
+        Rows are mappings with ``date`` plus ``columns`` (all price columns
+        by default).
+        """
+        columns = list(columns or PRICE_COLUMNS)
+        rows = []
+        with self.engine.connect() as connection:
+            # Partitions cover disjoint years, so reading them in order keeps
+            # the overall result sorted
+            for table in self.tables_for_range(start, end):
+                query = (
+                    select(table.c.date, *[table.c[name] for name in columns])
+                    .where(
+                        table.c.ticker == ticker,
+                        table.c.date >= start,
+                        table.c.date <= end,
+                    )
+                    .order_by(table.c.date)
+                )
+                rows.extend(connection.execute(query).mappings().all())
+        return rows
+
+    def _define(self, year):
+        name = self.table_name(year)
+        return Table(
+            name,
+            self.metadata,
+            Column("price_id", Integer, primary_key=True, autoincrement=True),
+            Column("ticker", String(10)),
+            Column("date", DateTime),
+            Column("open", Float),
+            Column("high", Float),
+            Column("low", Float),
+            Column("close", Float),
+            Column("adjusted_close", Float),
+            Column("volume", Integer),
+            UniqueConstraint("ticker", "date", name=f"uix_{name}_ticker_date"),
+            Index(f"ix_{name}_ticker_date", "ticker", "date", *PRICE_COLUMNS),
+        )
+
+
+def configured_partitions(engine, config=None):
+    """Return ``StockPricePartitions`` when partitioning is switched on.
+
+    ``PARTITION_STOCK_PRICES`` in the environment, else ``[DATABASE]
+    partition_stock_prices`` in config.ini, decides it; without either
+    bars stay in stock_prices and None is returned. Writers and readers
+    both ask here, so they agree on where bars live.
+    """
+    enabled = get_setting(
+        "DATABASE",
+        "partition_stock_prices",
+        env_var="PARTITION_STOCK_PRICES",
+        default="false",
+        config=config,
+    )
+    if enabled.lower() not in ("1", "true", "yes"):
+        return None
+    return StockPricePartitions(engine)
@@ -0,0 +1,58 @@
+# src/infrastructure/db/stock_price_writer.py
+from infrastructure.db.models import StockPrice
+from infrastructure.db.upsert import chunk_rows, upsert_statement
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "adjusted_close", "volume"]
+
+
+class StockPriceWriter:
+    """Upsert OHLCV bars into stock_prices with one commit per batch.
+
+    Bars are dicts with ``ticker``, ``date`` and any of the price columns.
+    A bar that already exists for its ticker and date is overwritten, so a
+    still-forming intraday bar can be written again as it updates. With
+    ``partitions`` (a ``StockPricePartitions``) bars go to per-year tables
+    instead of stock_prices.
+    """
+
+    def __init__(self, session_factory=None, batch_size: int = 1000, partitions=None):
+        if session_factory is None:
+            from infrastructure.db.db_setup import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.partitions = partitions
+
+    def write(self, bars) -> int:
+        # Last write wins for bars repeated within the batch
+        rows = {}
+        for bar in bars:
+            row = {"ticker": bar["ticker"], "date": bar["date"]}
+            row.update({name: bar.get(name) for name in PRICE_COLUMNS})
+            rows[(row["ticker"], row["date"])] = row
+        if not rows:
+            return 0
+        if self.partitions is not None:
+            return self.partitions.write(rows.values(), self.batch_size)
+
+        session = self.session_factory()
+        try:
+            dialect_name = session.get_bind().dialect.name
+            for chunk in chunk_rows(list(rows.values()), self.batch_size):
+                session.execute(
+                    upsert_statement(
+                        dialect_name,
+                        StockPrice.__table__,
+                        chunk,
+                        ["ticker", "date"],
+                        PRICE_COLUMNS,
+                    )
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return len(rows)
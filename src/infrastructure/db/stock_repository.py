@@ -1,48 +1,61 @@
-import time
 import yfinance as yf
 from requests.exceptions import RequestException
+from infrastructure.fetchers.resilience import (
+    CircuitOpenError,
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_budget,
+)
 
 
 class StockRepository:
-    def get_stock_data(self, ticker: str, period: str = "1mo", retries: int = 3):
-        attempt = 0
-        while attempt < retries:
-            try:
-                # Attempt to fetch the data
-                stock_data = yf.Ticker(ticker).history(period=period)
-
-                # Check if the data is empty
-                if stock_data.empty:
-                    return None
-
-                # Format the date to 'YYYY-MM-DD'
-                close = stock_data["Close"].iloc[-1]
-                date = stock_data.index[-1].strftime("%Y-%m-%d")
-
-                # Return the close price and date
-                return {"close": close, "date": date}
-
-            except RequestException as e:
-                print(
-                    f"Connection error while attempting to fetch data for \
-                        {ticker}. Retrying ({attempt + 1}/{retries})..."
-                )
-                print(e)
-                attempt += 1
-                time.sleep(2)  # Wait for 2 seconds before retrying
-
-            except ValueError as e:
-                print(f"Data parsing error for {ticker}: {e}")
-                print(e)
-                return None
+    def __init__(self, retry_policy=None, circuit_breaker=None):
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker("yahoo")
 
-            except Exception as e:
-                print(f"Unexpected error for {ticker}: {e}")
-                print(e)
+    def get_stock_data(self, ticker: str, period: str = "1mo", retries: int = 3):
+        retry_policy = self.retry_policy or RetryPolicy(
+            max_attempts=retries,
+            retry_on=(RequestException,),
+            budget=get_retry_budget("yahoo"),
+        )
+        try:
+            # Attempt to fetch the data, backing off between failed attempts
+            stock_data = retry_policy.call(
+                yf.Ticker(ticker).history,
+                period=period,
+                circuit_breaker=self.circuit_breaker,
+            )
+
+            # Check if the data is empty
+            if stock_data.empty:
                 return None
 
-        print(
-            f"Connection error: Failed to retrieve data \
-                for {ticker} after {retries} attempts."
-        )
-        return None
+            # Format the date to 'YYYY-MM-DD'
+            close = stock_data["Close"].iloc[-1]
+            date = stock_data.index[-1].strftime("%Y-%m-%d")
+
+            # Return the close price and date
+            return {"close": close, "date": date}
+
+        except CircuitOpenError as e:
+            print(f"Skipping {ticker}: {e}")
+            return None
+
+        except RequestException as e:
+            print(
+                f"Connection error: Failed to retrieve data \
+                    for {ticker} after {retry_policy.max_attempts} attempts."
+            )
+            print(e)
+            return None
+
+        except ValueError as e:
+            print(f"Data parsing error for {ticker}: {e}")
+            print(e)
+            return None
+
+        except Exception as e:
+            print(f"Unexpected error for {ticker}: {e}")
+            print(e)
+            return None
@@ -1,76 +1,536 @@
+from sqlalchemy import delete, func, literal, select, true, union_all, update
 from sqlalchemy.orm import Session
+from domain.models.security import DailyBar, Security, epoch_day, from_epoch_day
 from domain.models.stock import Stock
+from domain.models.stock_rollup import StockRollup
+from infrastructure.db.aggregation import (
+    SUPPORTED_DIALECTS,
+    as_datetime,
+    as_granularity,
+    bucket_start,
+    daily_bar_rollup_query,
+    epoch_day_timestamp,
+    next_bucket_start,
+    ohlcv_rollup_query,
+)
+from infrastructure.db.columnar import read_frame
+from infrastructure.db.models import StockPrice
+from infrastructure.db.unit_of_work import UnitOfWork
+from infrastructure.db.upsert import chunk_rows, upsert_from_select, upsert_statement
+from interfaces.common.enums import Granularity
 from repositories.stock_repository import StockRepository
-from datetime import datetime
+from datetime import datetime, time
 from typing import List, Optional
 from datetime import timedelta
+import pandas as pd
+
+# Columns refreshed when a bar for the same ticker and day already exists
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Descriptive columns, stored once per ticker in securities
+SECURITY_COLUMNS = ["name", "industry", "sector", "market_cap", "pe_ratio"]
+
+# Granularities kept precomputed in stock_rollups
+ROLLUP_GRANULARITIES = (Granularity.WEEKLY, Granularity.MONTHLY)
+
+
+def day_range(start, end):
+    """First and last epoch day whose midnight lies between two dates.
+
+    Bars are dated at midnight, so a ``start`` later in its day excludes
+    that day's bar, as a comparison on the bar date would.
+    """
+    first = epoch_day(start)
+    if isinstance(start, datetime) and start.time() != time.min:
+        first += 1
+    return first, epoch_day(end)
+
+
+def rollup_refresh_statement(dialect_name, security_ids, first_day, last_day):
+    """Return the upsert rewriting the rollup buckets overlapping two epoch days.
+
+    ``security_ids`` is a list of ids or a select returning them.
+    """
+    buckets = []
+    for granularity in ROLLUP_GRANULARITIES:
+        first = bucket_start(granularity, from_epoch_day(first_day))
+        after = next_bucket_start(granularity, from_epoch_day(last_day))
+        rollup = daily_bar_rollup_query(
+            DailyBar.__table__,
+            dialect_name,
+            security_ids,
+            epoch_day(first),
+            epoch_day(after) - 1,
+            granularity,
+        ).subquery()
+        buckets.append(
+            select(
+                Security.ticker,
+                literal(granularity.value).label("granularity"),
+                epoch_day_timestamp(dialect_name, rollup.c.day).label("date"),
+                *[rollup.c[name] for name in PRICE_COLUMNS],
+            )
+            .select_from(rollup)
+            .join(Security, Security.security_id == rollup.c.security_id)
+        )
+    rows = union_all(*buckets).subquery()
+    return upsert_from_select(
+        dialect_name,
+        StockRollup.__table__,
+        ["ticker", "granularity", "date", *PRICE_COLUMNS],
+        select(rows).where(true()),
+        ["ticker", "granularity", "date"],
+        PRICE_COLUMNS,
+    )
 
 
 class StockRepositoryImpl(StockRepository):
-    def __init__(self, session: Session):
+    """StockRepository over the ``securities`` and ``daily_bars`` tables.
+
+    Descriptive columns are stored once per ticker in ``securities`` and
+    each bar is a narrow ``daily_bars`` row keyed by security id and epoch
+    day. Callers keep working with ``Stock`` objects and bar dicts: the
+    ``Stock`` objects returned are built from those rows and are not in the
+    session, so changes to them are written back with ``update`` or
+    ``save``. A bar's time of day is not stored. Intraday bars are read
+    from ``stock_prices``, or from its per-year tables when ``partitions``
+    (a ``StockPricePartitions``) is given.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        batch_size: int = 1000,
+        unit_of_work=None,
+        rollups: bool = True,
+        partitions=None,
+    ):
         self.session = session
+        self.batch_size = batch_size
+        # Without a shared unit of work every write is committed on its own
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
+        self.rollups = rollups
+        self.partitions = partitions
+
+    def security_id(
+        self, ticker: str, create: bool = False, attributes=None
+    ) -> Optional[int]:
+        """Return the id for ``ticker``, registering it if ``create`` is set.
+
+        Ids are not cached: one created in a transaction that is later rolled
+        back could be handed out again to another ticker.
+        """
+        security_id = self.session.execute(
+            select(Security.security_id).where(Security.ticker == ticker)
+        ).scalar()
+        if security_id is None and create:
+            security = Security(ticker=ticker, **(attributes or {}))
+            self.session.add(security)
+            self.session.flush()
+            security_id = security.security_id
+        return security_id
+
+    def tickers(self) -> List[str]:
+        """Return every stored ticker in order."""
+        return list(
+            self.session.execute(
+                select(Security.ticker).order_by(Security.ticker)
+            ).scalars()
+        )
 
     def get(self, ticker: str) -> Optional[Stock]:
-        """Fetch stock by ticker from the database."""
-        return self.session.query(Stock).filter_by(ticker=ticker).first()
+        """Return the latest bar for a ticker.
+
+        A ticker stored without bars gives a ``Stock`` with no date.
+        """
+        security = self._security(ticker)
+        if security is None:
+            return None
+        bar = self.session.execute(
+            select(DailyBar)
+            .where(DailyBar.security_id == security.security_id)
+            .order_by(DailyBar.day.desc())
+            .limit(1)
+        ).scalar()
+        return self._to_stock(security, bar)
 
     def create_stock(self, stock: Stock) -> None:
-        """Insert a new stock record."""
-        self.session.add(stock)
-        self.session.commit()
+        """Insert a stock, or update the bar already stored for its day."""
+        self._write(stock)
 
     def save(self, stock: Stock) -> Stock:
         """Save or update a stock."""
-        existing_stock = self.get(stock.ticker)
-        if existing_stock:
-            return self.update(stock)
-        else:
-            self.create_stock(stock)
-            return stock
+        self._write(stock)
+        return stock
+
+    def save_many(self, bars, batch_size: int = None) -> int:
+        """Insert or update many bars as one batch of unit of work writes.
+
+        ``bars`` are dicts with ``ticker``, ``date`` and the OHLCV columns.
+        A ticker not stored yet gets a security with the descriptive columns
+        of its first bar that carries them; stored tickers keep theirs. Bars
+        are written with set-based ``INSERT ... ON CONFLICT (security_id,
+        day) DO UPDATE`` statements, ``batch_size`` rows per statement.
+        The rollup buckets between the earliest and the latest bar are
+        then refreshed for every ticker written, in one statement. The bars
+        are recorded as that many writes, so the unit of work's batch size
+        and latency decide when they are committed; the default one commits
+        them straight away. An error rolls back the pending batch. Returns
+        the number of bars written.
+        """
+        rows = {}
+        try:
+            security_ids = {}
+            for bar in bars:
+                if bar.get("date") is None:
+                    continue
+                ticker = bar["ticker"]
+                if ticker not in security_ids:
+                    security_ids[ticker] = self.security_id(
+                        ticker, create=True, attributes=self._attributes(bar)
+                    )
+                day = epoch_day(bar["date"])
+                # Last write wins for bars repeated within the call
+                rows[(ticker, day)] = self._bar_row(security_ids[ticker], day, bar)
+            if not rows:
+                return 0
+
+            self._upsert_bars(list(rows.values()), batch_size)
+            if self._rollups_enabled():
+                days = [day for _, day in rows]
+                self._refresh_rollups(list(security_ids.values()), min(days), max(days))
+        except Exception:
+            self.unit_of_work.rollback()
+            raise
+        self.unit_of_work.record_write(len(rows))
+        return len(rows)
 
     def update(self, stock: Stock) -> Stock:
-        """Update an existing stock."""
-        existing_stock = self.get(stock.ticker)
-        if existing_stock:
-            self.session.merge(stock)
-            self.session.commit()
-            return stock
-        return None
+        """Update a stored stock; returns None for an unknown ticker."""
+        if self.security_id(stock.ticker) is None:
+            return None
+        self._write(stock)
+        return stock
 
     def delete_stock(self, ticker: str) -> bool:
-        """Delete a stock by ticker."""
-        stock = self.get_by_ticker(ticker)
-        if stock:
-            self.session.delete(stock)
-            self.session.commit()
-            return True
-        return False
+        """Delete a ticker with its bars and rollups."""
+        security_id = self.security_id(ticker)
+        if security_id is None:
+            return False
+        self.session.execute(
+            delete(DailyBar).where(DailyBar.security_id == security_id)
+        )
+        self.session.execute(delete(StockRollup).where(StockRollup.ticker == ticker))
+        self.session.execute(
+            delete(Security).where(Security.security_id == security_id)
+        )
+        self.unit_of_work.record_write()
+        return True
+
+    def delete(self, stock: Stock) -> bool:
+        """Delete the ticker ``stock`` belongs to."""
+        return self.delete_stock(stock.ticker)
+
+    def _write(self, stock: Stock):
+        """Write ``stock``'s security and bar and register the write.
+
+        Descriptive columns set on ``stock`` replace the stored ones, and
+        the bar for its day is inserted or updated when it has a date.
+        """
+        attributes = self._attributes(stock)
+        security_id = self.security_id(stock.ticker, create=True)
+        if attributes:
+            self.session.execute(
+                update(Security)
+                .where(Security.security_id == security_id)
+                .values(**attributes)
+            )
+        if stock.date is not None:
+            day = epoch_day(stock.date)
+            self._upsert_bars([self._bar_row(security_id, day, stock)])
+            if self._rollups_enabled():
+                self._refresh_rollups([security_id], day, day)
+        # Registered last, as the unit of work may commit it
+        self.unit_of_work.record_write()
+
+    def _upsert_bars(self, rows, batch_size: int = None):
+        dialect_name = self.session.get_bind().dialect.name
+        for chunk in chunk_rows(rows, batch_size or self.batch_size):
+            self.session.execute(
+                upsert_statement(
+                    dialect_name,
+                    DailyBar.__table__,
+                    chunk,
+                    ["security_id", "day"],
+                    PRICE_COLUMNS,
+                )
+            )
+
+    @staticmethod
+    def _bar_row(security_id: int, day: int, source) -> dict:
+        """A daily_bars row from a ``Stock`` or bar dict."""
+        if isinstance(source, dict):
+            prices = {name: source.get(name) for name in PRICE_COLUMNS}
+        else:
+            prices = {name: getattr(source, name, None) for name in PRICE_COLUMNS}
+        return {"security_id": security_id, "day": day, **prices}
+
+    def refresh_rollups(self, tickers, start: datetime, end: datetime):
+        """Recompute the rollup buckets of tickers overlapping ``start``..``end``.
+
+        ``tickers`` is one ticker or a list of them.
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        security_ids = (
+            self.session.execute(
+                select(Security.security_id).where(Security.ticker.in_(list(tickers)))
+            )
+            .scalars()
+            .all()
+        )
+        if security_ids:
+            self._refresh_rollups(security_ids, epoch_day(start), epoch_day(end))
+
+    def _refresh_rollups(self, security_ids, first_day: int, last_day: int):
+        """Rewrite the rollup buckets overlapping two epoch days.
+
+        The buckets of every granularity are aggregated from daily_bars and
+        upserted with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` in
+        the current transaction, however many securities are touched. Bars
+        are only ever inserted or updated, so a bucket never loses all its
+        bars; ``delete_stock`` removes a ticker's rollups itself.
+        """
+        dialect_name = self.session.get_bind().dialect.name
+        self.session.execute(
+            rollup_refresh_statement(dialect_name, security_ids, first_day, last_day)
+        )
+
+    def rebuild_rollups(self, ticker: str = None) -> int:
+        """Recompute all rollups, or one ticker's, from daily_bars.
+
+        Repository writes keep rollups current; this is for bars written
+        around the repository, such as a restored dump. Returns the number
+        of tickers refreshed.
+        """
+        statement = (
+            select(DailyBar.security_id, func.min(DailyBar.day), func.max(DailyBar.day))
+            .join(Security, Security.security_id == DailyBar.security_id)
+            .group_by(DailyBar.security_id)
+        )
+        stale = delete(StockRollup)
+        if ticker is not None:
+            statement = statement.where(Security.ticker == ticker)
+            stale = stale.where(StockRollup.ticker == ticker)
+        ranges = self.session.execute(statement).all()
+        self.session.execute(stale)
+        for security_id, first, last in ranges:
+            self._refresh_rollups([security_id], first, last)
+        self.unit_of_work.commit()
+        return len(ranges)
 
     def get_stock_data(
         self, ticker: str, start: datetime, end: datetime, granularity: str = None
     ) -> List[Stock]:
-        query = self.session.query(Stock).filter(
-            Stock.ticker == ticker, Stock.date >= start, Stock.date <= end
+        """Return the bars for a ticker between two dates.
+
+        Without a granularity, or for ``daily``, the stored bars are
+        returned. Coarser granularities give one ``Stock`` per bucket, dated
+        at the bucket start, aggregated over the bars in the range. For
+        ``weekly`` and ``monthly`` the buckets lying wholly inside the range
+        are read from ``stock_rollups`` and the partial buckets at either
+        edge are aggregated from daily_bars in the database. ``hourly``
+        buckets are aggregated from the intraday bars in ``stock_prices``,
+        reading only the partitions the range spans when it is partitioned.
+        ``start`` and ``end`` may be datetimes, dates or ISO 8601 strings; a
+        date means midnight.
+        """
+        granularity = as_granularity(granularity)
+        start, end = as_datetime(start), as_datetime(end)
+        security = self._security(ticker)
+        if granularity == Granularity.HOURLY:
+            return self._aggregate_intraday(security, ticker, start, end, granularity)
+        if security is None:
+            return []
+        if granularity in (None, Granularity.DAILY):
+            first, last = day_range(start, end)
+            bars = self.session.execute(
+                select(DailyBar)
+                .where(
+                    DailyBar.security_id == security.security_id,
+                    DailyBar.day >= first,
+                    DailyBar.day <= last,
+                )
+                .order_by(DailyBar.day)
+            ).scalars()
+            return [self._to_stock(security, bar) for bar in bars]
+
+        if granularity in ROLLUP_GRANULARITIES and self._rollups_enabled():
+            return self._read_rollups(security, start, end, granularity)
+
+        return self._aggregate(security, start, end, granularity)
+
+    def _aggregate(self, security, start, end, granularity) -> List[Stock]:
+        first, last = day_range(start, end)
+        statement = daily_bar_rollup_query(
+            DailyBar.__table__,
+            self.session.get_bind().dialect.name,
+            [security.security_id],
+            first,
+            last,
+            granularity,
+        )
+        return [
+            self._bucket_stock(security, security.ticker, from_epoch_day(row.day), row)
+            for row in self.session.execute(statement)
+        ]
+
+    def _aggregate_intraday(
+        self, security, ticker, start, end, granularity
+    ) -> List[Stock]:
+        if self.partitions is None:
+            tables = [StockPrice.__table__]
+        else:
+            # Hourly buckets never cross a year, so each partition is
+            # aggregated on its own and the years are read oldest first
+            tables = self.partitions.tables_for_range(start, end)
+        dialect_name = self.session.get_bind().dialect.name
+        stocks = []
+        for table in tables:
+            statement = ohlcv_rollup_query(
+                table, dialect_name, ticker, start, end, granularity
+            )
+            stocks.extend(
+                self._bucket_stock(security, ticker, row.date, row)
+                for row in self.session.execute(statement)
+            )
+        return stocks
+
+    def _read_rollups(self, security, start, end, granularity) -> List[Stock]:
+        # Buckets starting at or after start and ending by end are complete
+        first_full = start
+        if bucket_start(granularity, start) != start:
+            first_full = next_bucket_start(granularity, start)
+        after_full = bucket_start(granularity, end + timedelta(microseconds=1))
+        if first_full >= after_full:
+            return self._aggregate(security, start, end, granularity)
+
+        head = []
+        if start < first_full:
+            last = first_full - timedelta(microseconds=1)
+            head = self._aggregate(security, start, last, granularity)
+        tail = []
+        if after_full <= end:
+            tail = self._aggregate(security, after_full, end, granularity)
+        rollups = self.session.execute(
+            select(StockRollup)
+            .where(
+                StockRollup.ticker == security.ticker,
+                StockRollup.granularity == granularity.value,
+                StockRollup.date >= first_full,
+                StockRollup.date < after_full,
+            )
+            .order_by(StockRollup.date)
+        ).scalars()
+        middle = [
+            self._bucket_stock(security, security.ticker, rollup.date, rollup)
+            for rollup in rollups
+        ]
+        return head + middle + tail
+
+    def _rollups_enabled(self) -> bool:
+        return (
+            self.rollups and self.session.get_bind().dialect.name in SUPPORTED_DIALECTS
         )
 
-        # Optional granularity-based logic
-        if granularity == "daily":
-            # Add any specific logic for daily granularity here if needed
-            pass
+    def get_stock_frame(
+        self, tickers, start: datetime, end: datetime, columns: List[str] = None
+    ) -> pd.DataFrame:
+        """Read bars for one or more tickers into a DataFrame.
+
+        Only ``ticker``, ``date`` and ``columns`` (the OHLCV columns by
+        default, or any of ``SECURITY_COLUMNS``) are selected, and no
+        ``Stock`` objects are built, so this is the read to use for
+        analytics over long ranges. Raises ValueError for an unknown column.
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        columns = columns or PRICE_COLUMNS
+        unknown = [
+            name
+            for name in columns
+            if name not in PRICE_COLUMNS and name not in SECURITY_COLUMNS
+        ]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        first, last = day_range(start, end)
+        statement = (
+            select(
+                Security.ticker,
+                DailyBar.day,
+                *[
+                    getattr(DailyBar if name in PRICE_COLUMNS else Security, name)
+                    for name in columns
+                ],
+            )
+            .join(DailyBar, DailyBar.security_id == Security.security_id)
+            .where(
+                Security.ticker.in_(list(tickers)),
+                DailyBar.day >= first,
+                DailyBar.day <= last,
+            )
+            .order_by(Security.ticker, DailyBar.day)
+        )
+        # read_frame runs on the connection, which skips autoflush, so
+        # pending writes from this session are flushed first
+        self.session.flush()
+        frame = read_frame(self.session.connection(), statement)
+        # Epoch days become datetime64 in one vectorized conversion
+        frame["day"] = pd.to_datetime(frame["day"].astype("int64"), unit="D")
+        return frame.rename(columns={"day": "date"})
 
-        return query.all()
+    def get_stored_bars(self, ticker: str, start: datetime, end: datetime):
+        """Return ``(date, open, high, low, close, volume)`` rows in a range."""
+        security_id = self.security_id(ticker)
+        if security_id is None:
+            return []
+        first, last = day_range(start, end)
+        columns = [getattr(DailyBar, name) for name in PRICE_COLUMNS]
+        rows = self.session.execute(
+            select(DailyBar.day, *columns).where(
+                DailyBar.security_id == security_id,
+                DailyBar.day >= first,
+                DailyBar.day <= last,
+            )
+        ).all()
+        return [(from_epoch_day(day), *prices) for day, *prices in rows]
 
     def get_by_ticker(self, ticker: str) -> Stock:
         """Fetch stock by ticker from the database."""
-        return self.session.query(Stock).filter_by(ticker=ticker).first()
+        return self.get(ticker)
 
     def stock_exists(self, ticker, period):
         """Check if stock data for the given ticker and period exists."""
         start_date, end_date = self.get_date_range_for_period(period)
-        query = self.session.query(Stock).filter(
-            Stock.ticker == ticker, Stock.date >= start_date, Stock.date <= end_date
+        query = (
+            select(DailyBar.day)
+            .join(Security, Security.security_id == DailyBar.security_id)
+            .where(
+                Security.ticker == ticker,
+                DailyBar.day >= epoch_day(start_date),
+                DailyBar.day <= epoch_day(end_date),
+            )
         )
-        return self.session.query(query.exists()).scalar()
+        return self.session.execute(select(query.exists())).scalar()
+
+    def get_latest_date(self, ticker: str) -> Optional[datetime]:
+        """Return the date of the latest stored bar for a ticker (watermark)."""
+        day = self.session.execute(
+            select(func.max(DailyBar.day))
+            .join(Security, Security.security_id == DailyBar.security_id)
+            .where(Security.ticker == ticker)
+        ).scalar()
+        return None if day is None else from_epoch_day(day)
 
     def get_date_range_for_period(self, period):
         """Helper method to calculate the date range based on the period."""
@@ -90,11 +550,60 @@ class StockRepositoryImpl(StockRepository):
         return start_date, today
 
     def get_sample_stock_data(self, ticker: str):
-        return self.session.query(Stock).filter_by(ticker=ticker).limit(5).all()
+        security = self._security(ticker)
+        if security is None:
+            return []
+        bars = self.session.execute(
+            select(DailyBar)
+            .where(DailyBar.security_id == security.security_id)
+            .order_by(DailyBar.day)
+            .limit(5)
+        ).scalars()
+        return [self._to_stock(security, bar) for bar in bars]
 
     def add_stock(self, stock: Stock):
-        self.session.add(stock)
-        self.session.commit()
+        self._write(stock)
 
     def commit(self):
-        self.session.commit()
+        self.unit_of_work.commit()
+
+    @staticmethod
+    def _attributes(source):
+        """Descriptive columns set on a ``Stock`` or bar dict."""
+        if isinstance(source, dict):
+            values = {name: source.get(name) for name in SECURITY_COLUMNS}
+        else:
+            values = {name: getattr(source, name, None) for name in SECURITY_COLUMNS}
+        return {name: value for name, value in values.items() if value is not None}
+
+    def _security(self, ticker: str) -> Optional[Security]:
+        return self.session.execute(
+            select(Security).where(Security.ticker == ticker)
+        ).scalar()
+
+    @staticmethod
+    def _to_stock(security, bar) -> Stock:
+        """A ``Stock`` for a security and one of its bars, if it has any."""
+        stock = Stock(
+            ticker=security.ticker,
+            name=security.name,
+            industry=security.industry,
+            sector=security.sector,
+            date=from_epoch_day(bar.day) if bar is not None else None,
+            **{name: getattr(bar, name, None) for name in PRICE_COLUMNS},
+        )
+        stock.market_cap = security.market_cap
+        stock.pe_ratio = security.pe_ratio
+        return stock
+
+    @staticmethod
+    def _bucket_stock(security, ticker, date, row) -> Stock:
+        """A ``Stock`` for one aggregated bucket."""
+        return Stock(
+            ticker=ticker,
+            name=security.name if security else None,
+            industry=security.industry if security else None,
+            sector=security.sector if security else None,
+            date=date,
+            **{name: getattr(row, name) for name in PRICE_COLUMNS},
+        )
@@ -0,0 +1,119 @@
+# src/infrastructure/db/unit_of_work.py
+import time
+from typing import Optional
+
+
+class UnitOfWork:
+    """Collect repository writes and commit them in batches.
+
+    Writes go to the session straight away but are only committed once
+    ``batch_size`` of them are pending, or when the oldest pending write is
+    ``max_latency_ms`` old at the time of the next write or of a
+    ``commit_if_due`` call. There is no timer thread, since a session must
+    not be used from two threads; a caller that goes idle between writes
+    calls ``commit_if_due`` from its loop. ``commit`` ends the batch early
+    and ``rollback`` discards everything not yet committed. The default
+    ``batch_size=1`` commits every write, as the repositories did before;
+    ``batch_size=None`` only commits when told to, for a caller that
+    commits once at the end of an operation.
+
+    ``close`` commits the trailing batch. Used as a context manager it does
+    so on exit, or rolls the batch back if the block raised.
+    """
+
+    def __init__(
+        self,
+        session,
+        batch_size: Optional[int] = 1,
+        max_latency_ms: float = None,
+        clock=None,
+    ):
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.session = session
+        self.batch_size = batch_size
+        self.max_latency_ms = max_latency_ms
+        self.clock = clock or time.monotonic
+        self.pending = 0
+        self.commits = 0
+        self._batch_started = None
+
+    def add(self, instance):
+        self.session.add(instance)
+        self._register_write()
+
+    def merge(self, instance):
+        merged = self.session.merge(instance)
+        self._register_write()
+        return merged
+
+    def delete(self, instance):
+        self.session.delete(instance)
+        self._register_write()
+
+    def record_write(self, count: int = 1):
+        """Count writes the caller already made on the session.
+
+        A bulk statement counts as the rows it wrote, so it fills the batch
+        the way as many single writes would.
+        """
+        self._register_write(count)
+
+    def commit_if_due(self) -> bool:
+        """Commit the pending batch if it is older than the max latency."""
+        if self.pending and self._batch_expired():
+            self.commit()
+            return True
+        return False
+
+    def close(self):
+        """Commit the writes still pending."""
+        if self.pending:
+            self.commit()
+
+    def flush(self):
+        self.session.flush()
+
+    def commit(self):
+        """Commit the current batch, rolling back if the commit fails."""
+        try:
+            self.session.commit()
+        except Exception:
+            self.rollback()
+            raise
+        self.commits += 1
+        self._reset()
+
+    def rollback(self):
+        """Discard every write since the last commit."""
+        self.session.rollback()
+        self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.rollback()
+        return False
+
+    def _register_write(self, count: int = 1):
+        if self._batch_started is None:
+            self._batch_started = self.clock()
+        self.pending += count
+        if self._batch_full() or self._batch_expired():
+            self.commit()
+
+    def _batch_full(self) -> bool:
+        return self.batch_size is not None and self.pending >= self.batch_size
+
+    def _batch_expired(self) -> bool:
+        if self.max_latency_ms is None:
+            return False
+        return (self.clock() - self._batch_started) * 1000 >= self.max_latency_ms
+
+    def _reset(self):
+        self.pending = 0
+        self._batch_started = None
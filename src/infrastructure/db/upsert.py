@@ -0,0 +1,50 @@
+# src/infrastructure/db/upsert.py
+from sqlalchemy.dialects import postgresql, sqlite
+
+# SQLite allows 32766 bound parameters per statement; stay well below it
+MAX_PARAMETERS = 30000
+
+
+def _insert(dialect_name):
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    raise ValueError(f"Upserts are not supported for dialect: {dialect_name}")
+
+
+def upsert_statement(dialect_name, table, rows, index_elements, update_columns):
+    """Build ``INSERT ... ON CONFLICT (index_elements) DO UPDATE`` for rows.
+
+    Supported for SQLite and PostgreSQL, which share the ON CONFLICT syntax.
+    """
+    statement = _insert(dialect_name)(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={name: statement.excluded[name] for name in update_columns},
+    )
+
+
+def upsert_from_select(
+    dialect_name, table, columns, select, index_elements, update_columns
+):
+    """Build ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` into ``columns``.
+
+    ``select`` must have a WHERE clause: SQLite would otherwise read the ON
+    CONFLICT as part of the SELECT's join.
+    """
+    statement = _insert(dialect_name)(table).from_select(columns, select)
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={name: statement.excluded[name] for name in update_columns},
+    )
+
+
+def chunk_rows(rows, batch_size):
+    """Split rows into batches that fit the bound parameter limit."""
+    if rows:
+        per_statement = max(1, MAX_PARAMETERS // max(1, len(rows[0])))
+        batch_size = min(batch_size, per_statement)
+    for start in range(0, len(rows), batch_size):
+        stop = start + batch_size
+        yield rows[start:stop]
@@ -0,0 +1,183 @@
+# src/infrastructure/fetchers/cached_fetcher.py
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a cached response stays fresh, by bar interval
+DEFAULT_TTLS = {
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "30m": 30 * 60,
+    "1h": 60 * 60,
+    "1d": 12 * 60 * 60,
+    "1wk": 24 * 60 * 60,
+    "1mo": 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CachedFetcher:
+    """Content-addressed on-disk cache in front of any fetcher.
+
+    Responses are keyed by provider, ticker, period, interval and any other
+    fetch arguments. Entries expire after the TTL of their interval and the
+    least recently used ones are evicted once the cache exceeds ``max_bytes``;
+    sizes and recency are tracked in memory after one scan of ``cache_dir``,
+    so a write does not walk the cache. In ``replay`` mode the wrapped
+    fetcher is never called: every cached entry is served regardless of age
+    and misses return None.
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        cache_dir,
+        provider=None,
+        ttls=None,
+        max_bytes=DEFAULT_MAX_BYTES,
+        replay=False,
+    ):
+        self.fetcher = fetcher
+        self.cache_dir = cache_dir
+        self.provider = provider or type(fetcher).__name__
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.replay = replay
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # path -> size in least to most recently used order, loaded lazily
+        self._index = None
+        self._total_bytes = 0
+
+    def fetch(self, ticker, period="1mo", **kwargs):
+        interval = kwargs.get("interval", "1d")
+        path = self._path(ticker, period, interval, kwargs)
+
+        cached = self._read(path, interval)
+        if cached is not None or self.replay:
+            return cached
+
+        data = self.fetcher.fetch(ticker, period, **kwargs)
+        if data is not None:
+            self._write(path, data)
+        return data
+
+    def fetch_many(self, tickers, period="1mo", interval="1d", **kwargs):
+        """Serve cached tickers from disk and batch-fetch only the misses."""
+        results = {}
+        misses = []
+        for ticker in dict.fromkeys(tickers):
+            path = self._path(ticker, period, interval, kwargs)
+            cached = self._read(path, interval)
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                misses.append(ticker)
+
+        if misses and not self.replay:
+            fetched = self.fetcher.fetch_many(misses, period, interval, **kwargs)
+            for ticker, data in fetched.items():
+                self._write(self._path(ticker, period, interval, kwargs), data)
+                results[ticker] = data
+        return results
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                os.remove(path)
+            self._index = OrderedDict()
+            self._total_bytes = 0
+
+    def _path(self, ticker, period, interval, kwargs):
+        key = {
+            "provider": self.provider,
+            "ticker": ticker,
+            "period": period,
+            "interval": interval,
+            "kwargs": {
+                name: str(value) for name, value in kwargs.items() if name != "interval"
+            },
+        }
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.pkl")
+
+    def _read(self, path, interval):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        ttl = self.ttls.get(interval, DEFAULT_TTL)
+        if not self.replay and time.time() - stat.st_mtime > ttl:
+            return None
+
+        try:
+            with open(path, "rb") as cache_file:
+                data = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Track recency on access time so mtime keeps the fetch time for TTLs;
+        # the access time orders the index when another instance loads it
+        os.utime(path, (time.time(), stat.st_mtime))
+        with self._lock:
+            index = self._load_index()
+            if path in index:
+                index.move_to_end(path)
+        return data
+
+    def _write(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # A unique temp file per write, so threads writing the same key
+        # never share one
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump(data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += size - index.pop(path, 0)
+            index[path] = size
+            self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    yield path, stat.st_size, stat.st_atime
+
+    def _load_index(self):
+        if self._index is None:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            self._index = OrderedDict((path, size) for path, size, _ in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _evict(self):
+        index = self._index
+        while self._total_bytes > self.max_bytes and index:
+            path, size = index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
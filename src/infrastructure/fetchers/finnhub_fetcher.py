@@ -0,0 +1,105 @@
+# src/infrastructure/fetchers/finnhub_fetcher.py
+import os
+from datetime import datetime, timedelta, timezone
+import finnhub
+import pandas as pd
+from requests.exceptions import RequestException
+from infrastructure.fetchers.formats import format_stock_data
+from infrastructure.fetchers.resilience import (
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_budget,
+)
+from infrastructure.fetchers.stock_fetcher import StockFetcher
+
+# Finnhub candle resolutions for the yfinance style intervals used elsewhere
+RESOLUTIONS = {
+    "1m": "1",
+    "5m": "5",
+    "15m": "15",
+    "30m": "30",
+    "1h": "60",
+    "1d": "D",
+    "1wk": "W",
+    "1mo": "M",
+}
+
+PERIODS = {
+    "1d": timedelta(days=1),
+    "5d": timedelta(days=5),
+    "1mo": timedelta(days=30),
+    "3mo": timedelta(days=91),
+    "6mo": timedelta(days=182),
+    "1y": timedelta(days=365),
+    "2y": timedelta(days=730),
+    "5y": timedelta(days=1826),
+    "10y": timedelta(days=3652),
+}
+
+RETRYABLE_ERRORS = (RequestException, ConnectionError, TimeoutError)
+
+
+class FinnhubFetcher(StockFetcher):
+    def __init__(
+        self,
+        api_key: str = None,
+        client=None,
+        retry_policy=None,
+        circuit_breaker=None,
+        raise_errors: bool = False,
+    ):
+        if client is None:
+            client = finnhub.Client(api_key=api_key or os.environ["FINNHUB_API_KEY"])
+        self.client = client
+        self.retry_policy = retry_policy or RetryPolicy(
+            retry_on=RETRYABLE_ERRORS, budget=get_retry_budget("finnhub")
+        )
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker("finnhub")
+        # See YahooFinanceFetcher
+        self.raise_errors = raise_errors
+
+    def fetch(
+        self, ticker, period="1mo", return_format="dataframe", start=None, interval="1d"
+    ):
+        """Fetch candles for ``ticker`` with the same options as Yahoo."""
+        if interval not in RESOLUTIONS:
+            raise ValueError(f"Unsupported interval: {interval}")
+
+        end = datetime.now(timezone.utc)
+        if start is not None:
+            start = datetime.combine(start, datetime.min.time(), timezone.utc)
+        elif period in PERIODS:
+            start = end - PERIODS[period]
+        else:
+            raise ValueError(f"Invalid period: {period}")
+
+        try:
+            candles = self.retry_policy.call(
+                self.client.stock_candles,
+                ticker,
+                RESOLUTIONS[interval],
+                int(start.timestamp()),
+                int(end.timestamp()),
+                circuit_breaker=self.circuit_breaker,
+            )
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            print(f"Network error occurred: {e}")
+            return None
+
+        # Finnhub reports "no_data" instead of an empty candle list
+        if not candles or candles.get("s") != "ok" or not candles.get("t"):
+            return None
+
+        stock_data = pd.DataFrame(
+            {
+                "date": pd.to_datetime(candles["t"], unit="s"),
+                "open": candles["o"],
+                "high": candles["h"],
+                "low": candles["l"],
+                "close": candles["c"],
+                "volume": candles["v"],
+            }
+        )
+        return format_stock_data(ticker, stock_data, return_format)
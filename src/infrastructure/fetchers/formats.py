@@ -0,0 +1,89 @@
+# src/infrastructure/fetchers/formats.py
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is only needed for return_format="arrow"
+    pa = None
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("date", "datetime64[ns]"),
+        ("open", "float64"),
+        ("high", "float64"),
+        ("low", "float64"),
+        ("close", "float64"),
+        ("volume", "float64"),
+    ]
+)
+
+
+def format_stock_data(ticker, stock_data, return_format):
+    """Convert a frame with a date column and OHLCV columns to return_format."""
+    if return_format == "dataframe":
+        # Columns the provider did not send come back as NaN
+        return stock_data.reindex(columns=["date"] + OHLCV_COLUMNS)
+    elif return_format == "list":
+        columns = _record_columns(ticker, stock_data)
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+    elif return_format == "dict":
+        columns = _record_columns(ticker, stock_data)
+        dates = columns.pop("date")
+        keys = list(columns)
+        return {
+            date: dict(zip(keys, row))
+            for date, row in zip(dates, zip(*columns.values()))
+        }
+    elif return_format == "columns":
+        return _columns(stock_data)
+    elif return_format == "numpy":
+        columns = _columns(stock_data)
+        array = np.empty(len(stock_data), dtype=RECORD_DTYPE)
+        for name in array.dtype.names:
+            array[name] = columns[name]
+        return array
+    elif return_format == "arrow":
+        if pa is None:
+            raise ImportError("pyarrow is required for return_format='arrow'")
+        return pa.RecordBatch.from_pydict(_columns(stock_data))
+    else:
+        raise ValueError("Unsupported return_format")
+
+
+def _naive_dates(stock_data):
+    # Keep the exchange-local wall time and drop the timezone
+    dates = stock_data["date"]
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates
+
+
+def _columns(stock_data):
+    """Return a dict of NumPy column arrays without per-row work."""
+    columns = {"date": _naive_dates(stock_data).to_numpy(dtype="datetime64[ns]")}
+    for name in OHLCV_COLUMNS:
+        if name in stock_data:
+            columns[name] = stock_data[name].to_numpy(dtype="float64")
+        else:
+            columns[name] = np.full(len(stock_data), np.nan)
+    return columns
+
+
+def _record_columns(ticker, stock_data):
+    """Return the list and dict format fields as plain column lists."""
+    size = len(stock_data)
+    dates = _naive_dates(stock_data).to_numpy(dtype="datetime64[ns]")
+    columns = {
+        "ticker": [ticker] * size,
+        "date": np.datetime_as_string(dates, unit="D").tolist(),
+    }
+    for name in OHLCV_COLUMNS:
+        # Columns the provider did not send are reported as None
+        if name in stock_data:
+            columns[name] = stock_data[name].tolist()
+        else:
+            columns[name] = [None] * size
+    return columns
@@ -0,0 +1,37 @@
+# src/infrastructure/fetchers/normalization.py
+import pandas as pd
+from infrastructure.fetchers.formats import OHLCV_COLUMNS
+
+# Names providers give the date, as the index or as a column
+DATE_COLUMNS = ("date", "datetime")
+
+
+def normalize_columns(stock_data):
+    """Normalize a raw provider frame into NumPy buffers for date and OHLCV.
+
+    Works on the frame's arrays directly instead of copying it through
+    ``reset_index`` and ``rename``, so it is cheap enough to run in the
+    fetching thread. Dates are exchange-local wall time without a timezone
+    and the OHLCV columns keep the provider's dtypes. Columns the provider
+    did not send are left out; the output formats fill them in.
+    """
+    lowercase = {str(name).lower(): name for name in stock_data.columns}
+    date_column = next(
+        (lowercase[name] for name in DATE_COLUMNS if name in lowercase), None
+    )
+    dates = pd.DatetimeIndex(
+        stock_data.index if date_column is None else stock_data[date_column]
+    )
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    columns = {"date": dates.to_numpy(dtype="datetime64[ns]")}
+
+    for name in OHLCV_COLUMNS:
+        if name in lowercase:
+            columns[name] = stock_data[lowercase[name]].to_numpy()
+    return columns
+
+
+def normalize_frame(stock_data):
+    """Turn a raw provider frame into a date column plus OHLCV columns."""
+    return pd.DataFrame(normalize_columns(stock_data))
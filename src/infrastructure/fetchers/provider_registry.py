@@ -0,0 +1,187 @@
+# src/infrastructure/fetchers/provider_registry.py
+import os
+import threading
+import time
+from collections import deque
+from utils.config import get_setting
+
+DEFAULT_PRIORITY = "yahoo,finnhub"
+
+
+class ProviderStats:
+    """Rolling latency and error rate over the last ``window`` requests."""
+
+    def __init__(self, window: int = 50):
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+
+    def record(self, latency: float, ok: bool):
+        self._samples.append((latency, ok))
+        self.requests += 1
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    @property
+    def avg_latency(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(latency for latency, _ in self._samples) / len(self._samples)
+
+
+class ProviderRegistry:
+    """Route fetches to the healthiest registered provider with failover.
+
+    Providers whose recent error rate is above ``max_error_rate`` are tried
+    last, and so are providers slower than ``slow_factor`` times the fastest
+    healthy one. Ties keep the configured priority order. A provider that
+    raises falls through to the next one; one that answers without data
+    (nothing new since ``start``, say) has answered, so its empty result is
+    returned and not counted as an error. Register fetchers with
+    ``raise_errors=True`` so their network errors reach the registry.
+    """
+
+    def __init__(
+        self, max_error_rate: float = 0.5, slow_factor: float = 3.0, window=50
+    ):
+        self.max_error_rate = max_error_rate
+        self.slow_factor = slow_factor
+        self.window = window
+        self._providers = {}
+        self._stats = {}
+        self._priority = []
+        self._lock = threading.Lock()
+
+    def register(self, name: str, fetcher):
+        with self._lock:
+            self._providers[name] = fetcher
+            self._stats[name] = ProviderStats(self.window)
+            if name not in self._priority:
+                self._priority.append(name)
+
+    def set_priority(self, names):
+        """Set the preferred order; unknown names are ignored."""
+        with self._lock:
+            ordered = [name for name in names if name in self._providers]
+            rest = [name for name in self._priority if name not in ordered]
+            self._priority = ordered + rest
+
+    def get(self, name: str):
+        return self._providers[name]
+
+    def ranked(self):
+        """Return provider names, healthiest first."""
+        with self._lock:
+            healthy_latencies = [
+                self._stats[name].avg_latency
+                for name in self._priority
+                if self._stats[name].error_rate <= self.max_error_rate
+                and self._stats[name].requests
+            ]
+            fastest = min(healthy_latencies, default=0.0)
+
+            def rank(name):
+                stats = self._stats[name]
+                unhealthy = stats.error_rate > self.max_error_rate
+                slow = fastest > 0 and stats.avg_latency > self.slow_factor * fastest
+                return (unhealthy, slow, self._priority.index(name))
+
+            return sorted(self._priority, key=rank)
+
+    def fetch(self, ticker, *args, **kwargs):
+        for name in self.ranked():
+            ok, data = self._timed_call(name, "fetch", ticker, *args, **kwargs)
+            if ok:
+                return data
+        print(f"Every provider failed for {ticker}.")
+        return None
+
+    def fetch_many(
+        self, tickers, period="1mo", interval="1d", return_format="dataframe"
+    ):
+        """Batch-fetch through providers that support it, failing over errors.
+
+        Tickers a provider answered for without data are left out of the
+        result; only tickers whose call raised go to the next provider.
+        """
+        results = {}
+        pending = list(dict.fromkeys(tickers))
+        for name in self.ranked():
+            if not pending:
+                break
+            answered = set()
+            if hasattr(self._providers[name], "fetch_many"):
+                ok, fetched = self._timed_call(
+                    name, "fetch_many", pending, period, interval, return_format
+                )
+                if ok:
+                    results.update(fetched or {})
+                    answered.update(pending)
+            else:
+                for ticker in pending:
+                    ok, data = self._timed_call(
+                        name,
+                        "fetch",
+                        ticker,
+                        period,
+                        return_format=return_format,
+                        interval=interval,
+                    )
+                    if ok:
+                        answered.add(ticker)
+                        if data is not None:
+                            results[ticker] = data
+            pending = [ticker for ticker in pending if ticker not in answered]
+        return results
+
+    def stats(self):
+        """Return request count, error rate and mean latency per provider."""
+        with self._lock:
+            return {
+                name: {
+                    "requests": self._stats[name].requests,
+                    "error_rate": self._stats[name].error_rate,
+                    "avg_latency": self._stats[name].avg_latency,
+                }
+                for name in self._priority
+            }
+
+    def _timed_call(self, name, method, *args, **kwargs):
+        """Call a provider, record its latency and return ``(ok, data)``."""
+        started = time.monotonic()
+        try:
+            data = getattr(self._providers[name], method)(*args, **kwargs)
+            ok = True
+        except Exception as e:
+            print(f"Provider {name} failed: {e}")
+            data, ok = None, False
+        with self._lock:
+            self._stats[name].record(time.monotonic() - started, ok)
+        return ok, data
+
+
+def build_provider_registry(priority: str = None) -> ProviderRegistry:
+    """Build a registry of the providers available in this environment.
+
+    The order comes from ``priority``, the STOCK_PROVIDERS environment
+    variable or ``[PROVIDERS] priority`` in config.ini. Finnhub is only
+    registered when FINNHUB_API_KEY is set.
+    """
+    # Imported here so the registry module does not depend on provider SDKs
+    from infrastructure.fetchers.yahoo_finance_fetcher import YahooFinanceFetcher
+
+    registry = ProviderRegistry()
+    registry.register("yahoo", YahooFinanceFetcher(raise_errors=True))
+    if os.environ.get("FINNHUB_API_KEY"):
+        from infrastructure.fetchers.finnhub_fetcher import FinnhubFetcher
+
+        registry.register("finnhub", FinnhubFetcher(raise_errors=True))
+
+    priority = priority or get_setting(
+        "PROVIDERS", "priority", env_var="STOCK_PROVIDERS", default=DEFAULT_PRIORITY
+    )
+    registry.set_priority([name.strip() for name in priority.split(",")])
+    return registry
@@ -0,0 +1,236 @@
+# src/infrastructure/fetchers/resilience.py
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open."""
+
+
+class RetryBudget:
+    """Limit retries to a share of the calls made in a rolling window.
+
+    Keeps a failing provider from receiving a multiple of the normal load.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window=60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self._calls.append(time.monotonic())
+
+    def try_acquire(self) -> bool:
+        """Consume one retry if the budget allows it."""
+        with self._lock:
+            now = time.monotonic()
+            for events in (self._calls, self._retries):
+                while events and now - events[0] > self.window:
+                    events.popleft()
+            allowed = self.min_retries + self.ratio * len(self._calls)
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker:
+    """Fail fast while a provider keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds. Then a single trial call
+    is let through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at >= self.reset_timeout:
+                    self.state = self.HALF_OPEN
+                    return
+            # Open, or half open with the trial call already in flight
+            raise CircuitOpenError("Circuit is open, provider calls are paused")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._opened_at = None
+
+    def release_trial(self):
+        """Give back the half-open trial slot without judging the provider.
+
+        Used when the trial call ends in an error that says nothing about the
+        provider's health; the next call becomes the trial instead.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_circuit_breakers = {}
+_retry_budgets = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, **kwargs) -> CircuitBreaker:
+    """Return the circuit breaker shared by every caller of ``provider``."""
+    with _registry_lock:
+        if provider not in _circuit_breakers:
+            _circuit_breakers[provider] = CircuitBreaker(**kwargs)
+        return _circuit_breakers[provider]
+
+
+def get_retry_budget(provider: str, **kwargs) -> RetryBudget:
+    """Return the retry budget shared by every caller of ``provider``."""
+    with _registry_lock:
+        if provider not in _retry_budgets:
+            _retry_budgets[provider] = RetryBudget(**kwargs)
+        return _retry_budgets[provider]
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, a retry budget and a breaker.
+
+    Only exceptions listed in ``retry_on`` are retried and counted against
+    the circuit breaker; anything else is raised straight away and, if the
+    call was the breaker's half-open trial, hands the trial slot back. Pass
+    the provider's shared ``get_retry_budget`` so the budget spans calls.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_on=(Exception,),
+        budget: RetryBudget = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given (zero-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(self, func, *args, circuit_breaker: CircuitBreaker = None, **kwargs):
+        self.budget.record_call()
+        for attempt in range(self.max_attempts):
+            if circuit_breaker is not None:
+                circuit_breaker.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except self.retry_on as e:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if not self._should_retry(attempt):
+                    raise
+                print(
+                    f"Attempt {attempt + 1}/{self.max_attempts} failed: {e}. "
+                    "Retrying..."
+                )
+                time.sleep(self.delay(attempt))
+            except BaseException:
+                if circuit_breaker is not None:
+                    circuit_breaker.release_trial()
+                raise
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                return result
+
+    async def call_async(
+        self, func, *args, circuit_breaker: CircuitBreaker = None, **kwargs
+    ):
+        """Coroutine version of ``call`` that backs off without blocking."""
+        self.budget.record_call()
+        for attempt in range(self.max_attempts):
+            if circuit_breaker is not None:
+                circuit_breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except self.retry_on:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if not self._should_retry(attempt):
+                    raise
+                await asyncio.sleep(self.delay(attempt))
+            except BaseException:
+                if circuit_breaker is not None:
+                    circuit_breaker.release_trial()
+                raise
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                return result
+
+    def _should_retry(self, attempt: int) -> bool:
+        return attempt + 1 < self.max_attempts and self.budget.try_acquire()
+
+
+class ResilientFetcher:
+    """Apply a retry policy and circuit breaker to any fetcher.
+
+    Use it for fetchers that raise on network errors. Fetchers that swallow
+    errors should run their provider calls through a policy themselves.
+    """
+
+    def __init__(self, fetcher, provider=None, retry_policy=None, circuit_breaker=None):
+        self.fetcher = fetcher
+        self.provider = provider or type(fetcher).__name__
+        self.retry_policy = retry_policy or RetryPolicy(
+            budget=get_retry_budget(self.provider)
+        )
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.provider)
+
+    def fetch(self, ticker, *args, **kwargs):
+        return self.retry_policy.call(
+            self.fetcher.fetch,
+            ticker,
+            *args,
+            circuit_breaker=self.circuit_breaker,
+            **kwargs,
+        )
+
+    def fetch_many(self, tickers, *args, **kwargs):
+        return self.retry_policy.call(
+            self.fetcher.fetch_many,
+            tickers,
+            *args,
+            circuit_breaker=self.circuit_breaker,
+            **kwargs,
+        )
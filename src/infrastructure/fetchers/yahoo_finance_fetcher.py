@@ -1,13 +1,55 @@
 import yfinance as yf
 import pandas as pd
+from requests.exceptions import RequestException
+from infrastructure.fetchers.formats import format_stock_data
+from infrastructure.fetchers.normalization import normalize_frame
+from infrastructure.fetchers.resilience import (
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_budget,
+)
+
+# Number of symbols sent to Yahoo in a single download request
+BATCH_SIZE = 100
+
+# Errors worth retrying; anything else is treated as a bad request or bad data
+RETRYABLE_ERRORS = (RequestException, ConnectionError, TimeoutError)
 
 
 class YahooFinanceFetcher:
-    def fetch(self, ticker, return_format="dataframe"):
+    def __init__(
+        self,
+        batch_size: int = BATCH_SIZE,
+        retry_policy=None,
+        circuit_breaker=None,
+        raise_errors: bool = False,
+    ):
+        self.batch_size = batch_size
+        # Let network errors propagate instead of returning no data, so a
+        # ProviderRegistry can tell a failure from an empty answer
+        self.raise_errors = raise_errors
+        self.retry_policy = retry_policy or RetryPolicy(
+            retry_on=RETRYABLE_ERRORS, budget=get_retry_budget("yahoo")
+        )
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker("yahoo")
+
+    def fetch(
+        self, ticker, period="1mo", return_format="dataframe", start=None, interval="1d"
+    ):
+        """Fetch history for ``ticker``.
+
+        When ``start`` is given only bars from that date onwards are requested
+        and ``period`` is ignored.
+        """
         try:
             stock = yf.Ticker(ticker)
-            stock_data = stock.history()
+            if start is not None:
+                stock_data = self._call(stock.history, start=start, interval=interval)
+            else:
+                stock_data = self._call(stock.history, period=period, interval=interval)
         except Exception as e:
+            if self.raise_errors:
+                raise
             print(f"Network error occurred: {e}")
             return None
 
@@ -15,37 +57,71 @@ class YahooFinanceFetcher:
         if stock_data.empty:
             return None
 
-        stock_data = stock_data.reset_index().rename(columns={"Date": "date"})
-        stock_data["date"] = pd.to_datetime(stock_data["date"])
-        stock_data.columns = [col.lower() for col in stock_data.columns]
-
-        # Handle different return formats
-        if return_format == "dataframe":
-            return stock_data[["date", "open", "high", "low", "close", "volume"]]
-        elif return_format == "list":
-            return [
-                {
-                    "ticker": ticker,
-                    "date": row["date"].strftime("%Y-%m-%d"),
-                    "open": row["open"],
-                    "high": row["high"],
-                    "low": row["low"],
-                    "close": row["close"],
-                    "volume": row.get("volume", None),
-                }
-                for _, row in stock_data.iterrows()
-            ]
-        elif return_format == "dict":
-            return {
-                row["date"].strftime("%Y-%m-%d"): {
-                    "ticker": ticker,
-                    "open": row["open"],
-                    "high": row["high"],
-                    "low": row["low"],
-                    "close": row["close"],
-                    "volume": row.get("volume", None),
-                }
-                for _, row in stock_data.iterrows()
-            }
-        else:
-            raise ValueError("Unsupported return_format")
+        stock_data = normalize_frame(stock_data)
+        return format_stock_data(ticker, stock_data, return_format)
+
+    def fetch_many(
+        self, tickers, period="1mo", interval="1d", return_format="dataframe"
+    ):
+        """Fetch several tickers using one download request per batch.
+
+        Returns a dict mapping each ticker to its data in ``return_format``.
+        Tickers with no data are left out of the result.
+        """
+        results = {}
+        for batch in self._batches(tickers):
+            try:
+                batch_data = self._call(
+                    yf.download,
+                    batch,
+                    period=period,
+                    interval=interval,
+                    group_by="ticker",
+                    progress=False,
+                )
+            except Exception as e:
+                if self.raise_errors:
+                    raise
+                print(f"Network error occurred: {e}")
+                continue
+
+            if batch_data is None or batch_data.empty:
+                continue
+
+            frames = self._split_batch(batch, batch_data)
+            for ticker, stock_data in frames.items():
+                stock_data = normalize_frame(stock_data)
+                results[ticker] = format_stock_data(ticker, stock_data, return_format)
+        return results
+
+    def _call(self, func, *args, **kwargs):
+        """Run a provider call under the retry policy and circuit breaker."""
+        return self.retry_policy.call(
+            func, *args, circuit_breaker=self.circuit_breaker, **kwargs
+        )
+
+    def _batches(self, tickers):
+        """Yield the unique tickers in chunks of ``batch_size``."""
+        unique_tickers = list(dict.fromkeys(tickers))
+        for start in range(0, len(unique_tickers), self.batch_size):
+            stop = start + self.batch_size
+            yield unique_tickers[start:stop]
+
+    @staticmethod
+    def _split_batch(batch, batch_data):
+        """Split a grouped download into one frame per ticker."""
+        frames = {}
+        grouped = isinstance(batch_data.columns, pd.MultiIndex)
+        for ticker in batch:
+            if grouped:
+                if ticker not in batch_data.columns.get_level_values(0):
+                    continue
+                stock_data = batch_data[ticker]
+            else:
+                stock_data = batch_data
+
+            # Symbols missing from part of the window come back as NaN rows
+            stock_data = stock_data.dropna(how="all")
+            if not stock_data.empty:
+                frames[ticker] = stock_data
+        return frames
@@ -1,9 +1,27 @@
 from utils.stock_plotting import plot_stock_prices
 from application.generate_stock_data import save_stock_data_to_csv
-from infrastructure.fetchers.yahoo_finance_fetcher import YahooFinanceFetcher
+from infrastructure.fetchers.provider_registry import build_provider_registry
+from infrastructure.db import db_setup
 from infrastructure.db.db_setup import get_session
 from application.use_cases.manage_stock import ManageStockUseCase
+from application.bar_deduplication import BarDeduplicator
+from application.ingestion_engine import AsyncIngestionEngine, RateLimiter
+from application.refresh_scheduler import RefreshScheduler
+from application.streaming_ingestion import (
+    BACKPRESSURE_POLICIES,
+    IntradayPoller,
+    MicroBatchWriter,
+    StreamingIngestion,
+)
+from infrastructure.db.mmap_stock_repository import (
+    MmapStockRepository,
+    rebuild_from_sql,
+)
+from infrastructure.db.segment_log import SegmentDrainer, SegmentLog
+from infrastructure.db.stock_price_partitions import configured_partitions
+from infrastructure.db.stock_price_writer import StockPriceWriter
 from infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from infrastructure.db.unit_of_work import UnitOfWork
 from datetime import datetime
 import click
 import sys
@@ -52,16 +70,168 @@ def fetch(ticker, period):
     """Fetch stock data for a specified ticker and period, and log the status."""
     with get_session() as session:
         stock_repo = StockRepositoryImpl(session)
-        stock_fetcher = YahooFinanceFetcher()
-        stock_use_case = ManageStockUseCase(stock_repo, stock_fetcher)
+        stock_fetcher = build_provider_registry()
+        stock_use_case = ManageStockUseCase(
+            stock_repo, stock_fetcher, deduplicator=BarDeduplicator(stock_repo)
+        )
 
-        # Check if the stock data already exists in the database
-        existing_data = stock_use_case.check_stock_exists(ticker, period)
-        if existing_data:
-            click.echo(f"Data for {ticker} in the period {period} already exists.")
+        # Only the bars from the latest stored one on are fetched, and of
+        # those only the new or changed ones are written
+        stored_rows = stock_use_case.sync_stock_data(ticker, period)
+        if stored_rows:
+            click.echo(
+                f"Fetch complete for {ticker} in the period {period}. "
+                f"Stored {len(stored_rows)} new or changed rows."
+            )
         else:
-            stock_use_case.fetch_stock_data(ticker, period)
-            click.echo(f"Fetch complete for {ticker} in the period {period}.")
+            click.echo(f"Data for {ticker} in the period {period} is up to date.")
+
+
+# Command to fetch many tickers concurrently
+
+
+@click.command()
+@click.argument("tickers")
+@click.argument("period")
+@click.option("--concurrency", default=10, help="Maximum fetches in flight.")
+@click.option("--rate", type=float, help="Maximum requests per second.")
+def ingest(tickers, period, concurrency, rate):
+    """Fetch and store a comma-separated list of tickers concurrently."""
+    tickers_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    if not tickers_list:
+        raise click.ClickException("Error: No tickers to ingest.")
+
+    engine = AsyncIngestionEngine(
+        build_provider_registry(),
+        max_concurrency=concurrency,
+        rate_limiter=RateLimiter(rate) if rate else None,
+    )
+    with get_session() as session:
+        # The sink runs on the event loop thread, which owns the session
+        stock_repo = StockRepositoryImpl(session)
+        stock_use_case = ManageStockUseCase(
+            stock_repo, deduplicator=BarDeduplicator(stock_repo)
+        )
+        summary = engine.ingest(
+            tickers_list,
+            stock_use_case.store_stock_data,
+            period=period,
+            return_format="list",
+        )
+    click.echo(
+        f"Ingested {summary['fetched']} of {len(tickers_list)} tickers, "
+        f"{summary['empty']} without data."
+    )
+    if summary["failed"]:
+        raise click.ClickException(f"Failed: {', '.join(summary['failed'])}")
+
+
+# Command to keep a watchlist fresh in a single long-running process
+
+
+@click.command()
+@click.option("--tickers", default="", help="Comma-separated list of tickers.")
+@click.option(
+    "--watchlist",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one ticker per line.",
+)
+@click.option("--period", default="1mo", help="Period fetched for new tickers.")
+@click.option("--every", default=3600.0, help="Seconds between refreshes.")
+@click.option("--workers", default=4, help="Number of concurrent refreshes.")
+@click.option(
+    "--log-dir",
+    type=click.Path(file_okay=False),
+    help="Directory of a segment log that fetched bars are written to first.",
+)
+def schedule(tickers, watchlist, period, every, workers, log_dir):
+    """Refresh a watchlist periodically until interrupted."""
+    tickers_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    if watchlist:
+        with open(watchlist) as watchlist_file:
+            tickers_list += [line.strip() for line in watchlist_file if line.strip()]
+    if not tickers_list:
+        raise click.ClickException("Error: No tickers to refresh.")
+
+    stock_fetcher = build_provider_registry()
+    ingestion_log = drainer = None
+    if log_dir:
+        ingestion_log = SegmentLog(log_dir)
+
+        def load_bars(bars):
+            with get_session() as session:
+                StockRepositoryImpl(session).save_many(bars)
+
+        # Replays anything a previous run left unapplied before new fetches
+        drainer = SegmentDrainer(ingestion_log, load_bars)
+        drainer.drain_once()
+        drainer.start()
+
+    def run_job(ticker, job_period):
+        with get_session() as session:
+            stock_repo = StockRepositoryImpl(session)
+            stock_use_case = ManageStockUseCase(
+                stock_repo, stock_fetcher, ingestion_log, BarDeduplicator(stock_repo)
+            )
+            return stock_use_case.sync_stock_data(ticker, job_period)
+
+    scheduler = RefreshScheduler(run_job, max_workers=workers)
+    for ticker in tickers_list:
+        scheduler.schedule(ticker, period, every=every)
+
+    click.echo(f"Refreshing {len(tickers_list)} tickers every {every} seconds.")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    if drainer is not None:
+        drainer.stop()
+        ingestion_log.close()
+    click.echo(f"Scheduler stopped: {scheduler.stats()}")
+
+
+# Command to stream intraday bars into stock_prices, or its per-year tables
+# when partition_stock_prices is set
+
+
+@click.command()
+@click.option("--tickers", required=True, help="Comma-separated list of tickers.")
+@click.option("--interval", default="1m", help="Bar interval, e.g. 1m or 5m.")
+@click.option("--poll-seconds", default=30.0, help="Seconds between polls.")
+@click.option("--batch-size", default=500, help="Maximum bars per write.")
+@click.option("--max-latency", default=1.0, help="Maximum seconds a bar waits.")
+@click.option("--queue-size", default=10000, help="Maximum bars waiting to be written.")
+@click.option(
+    "--policy",
+    type=click.Choice(BACKPRESSURE_POLICIES),
+    default="block",
+    help="What to do when the queue is full.",
+)
+def stream(
+    tickers, interval, poll_seconds, batch_size, max_latency, queue_size, policy
+):
+    """Stream intraday bars into the database until interrupted."""
+    tickers_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    if not tickers_list:
+        raise click.ClickException("Error: No tickers to stream.")
+
+    poller = IntradayPoller(build_provider_registry(), tickers_list, interval=interval)
+    batch_writer = MicroBatchWriter(
+        StockPriceWriter(partitions=configured_partitions(db_setup.engine)),
+        batch_size=batch_size,
+        max_latency=max_latency,
+        max_queue=queue_size,
+        policy=policy,
+    )
+    ingestion = StreamingIngestion(poller, batch_writer, poll_interval=poll_seconds)
+
+    click.echo(f"Streaming {interval} bars for {len(tickers_list)} tickers.")
+    try:
+        stats = ingestion.run()
+    except KeyboardInterrupt:
+        ingestion.stop()
+        stats = batch_writer.stats()
+    click.echo(f"Streaming stopped: {stats}")
 
 
 # Command to create a new stock entry
@@ -86,10 +256,14 @@ def create(ticker, name, industry, sector, close, date, stock_fetcher=None):
         )
 
     with get_session() as session:
-        stock_repo = StockRepositoryImpl(session)
+        # Writes are committed once, when create_stock returns
+        unit_of_work = UnitOfWork(session, batch_size=None)
+        stock_repo = StockRepositoryImpl(session, unit_of_work=unit_of_work)
         if stock_fetcher is None:
-            stock_fetcher = YahooFinanceFetcher()
-        stock_use_case = ManageStockUseCase(stock_repo, stock_fetcher)
+            stock_fetcher = build_provider_registry()
+        stock_use_case = ManageStockUseCase(
+            stock_repo, stock_fetcher, unit_of_work=unit_of_work
+        )
         stock_use_case.create_stock(
             ticker=ticker,
             name=name,
@@ -106,8 +280,10 @@ def create(ticker, name, industry, sector, close, date, stock_fetcher=None):
 def delete(ticker):
     """Delete a stock entry."""
     with get_session() as session:
-        stock_repo = StockRepositoryImpl(session)
-        stock_use_case = ManageStockUseCase(stock_repo)  # No need to pass stock_fetcher
+        unit_of_work = UnitOfWork(session, batch_size=None)
+        stock_repo = StockRepositoryImpl(session, unit_of_work=unit_of_work)
+        # No need to pass stock_fetcher
+        stock_use_case = ManageStockUseCase(stock_repo, unit_of_work=unit_of_work)
         result = stock_use_case.delete_stock(ticker)
         if result:
             click.echo(f"Deleted stock {ticker}")
@@ -143,6 +319,29 @@ def generate_data(tickers, start_date, end_date, output_file):
     click.echo(f"Generated stock data for {tickers} and saved to {output_file}")
 
 
+# Command to rebuild the memory-mapped bar store
+
+
+@click.command(name="rebuild-mmap")
+@click.option(
+    "--root",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="Directory of the memory-mapped bar store.",
+)
+@click.option("--tickers", default="", help="Comma-separated tickers; all if empty.")
+def rebuild_mmap(root, tickers):
+    """Rebuild the memory-mapped bar store from the SQL daily bars."""
+    tickers_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    with get_session() as session:
+        written = rebuild_from_sql(
+            MmapStockRepository(root),
+            StockRepositoryImpl(session),
+            tickers_list or None,
+        )
+    click.echo(f"Wrote {written} bars to {root}.")
+
+
 # Command to plot stock data
 
 
@@ -158,9 +357,13 @@ def plot_data(csv_file, ticker):
 # Register commands
 cli.add_command(check_data)
 cli.add_command(fetch)
+cli.add_command(ingest)
+cli.add_command(schedule)
+cli.add_command(stream)
 cli.add_command(create)
 cli.add_command(delete)
 cli.add_command(generate_data)
+cli.add_command(rebuild_mmap)
 cli.add_command(plot_data)
 
 
@@ -27,6 +27,10 @@ class StockRepository(ABC):
     def save(self, stock):
         pass
 
+    @abstractmethod
+    def save_many(self, bars) -> int:
+        pass
+
     @abstractmethod
     def get_stock_data(
         self,
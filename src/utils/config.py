@@ -0,0 +1,27 @@
+# src/utils/config.py
+import configparser
+import os
+
+# config/config.ini at the repository root
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "config",
+    "config.ini",
+)
+
+
+def load_config(path: str = None) -> configparser.ConfigParser:
+    """Read config.ini. Missing files yield an empty configuration."""
+    config = configparser.ConfigParser()
+    config.read(path or os.environ.get("STOCKSTREAMDB_CONFIG", CONFIG_PATH))
+    return config
+
+
+def get_setting(
+    section: str, option: str, env_var: str = None, default=None, config=None
+):
+    """Look a setting up in the environment first, then in config.ini."""
+    if env_var and os.environ.get(env_var):
+        return os.environ[env_var]
+    config = config if config is not None else load_config()
+    return config.get(section, option, fallback=default)
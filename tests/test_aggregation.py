@@ -0,0 +1,149 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.stock import Stock
+from src.domain.models.security import DailyBar
+from src.infrastructure.db.aggregation import (
+    daily_bar_rollup_query,
+    ohlcv_rollup_query,
+)
+from src.infrastructure.db.stock_price_writer import StockPrice, StockPriceWriter
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from src.interfaces.common.enums import Granularity
+
+
+def bar(ticker, when, close, volume=10):
+    return {
+        "ticker": ticker,
+        "date": when,
+        "open": close - 1,
+        "high": close + 1,
+        "low": close - 2,
+        "close": close,
+        "volume": volume,
+    }
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    StockPrice.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield StockRepositoryImpl(session)
+    session.close()
+
+
+def test_weekly_buckets_start_on_monday(repo):
+    # 2024-01-01 is a Monday; two full weeks of daily bars
+    start = datetime(2024, 1, 1)
+    repo.save_many(
+        [bar("AAPL", start + timedelta(days=i), 100.0 + i) for i in range(14)]
+        + [bar("MSFT", start, 5.0)]
+    )
+
+    weeks = repo.get_stock_data("AAPL", start, datetime(2024, 1, 31), "weekly")
+
+    assert [week.date for week in weeks] == [datetime(2024, 1, 1), datetime(2024, 1, 8)]
+    first = weeks[0]
+    assert (first.open, first.high, first.low, first.close, first.volume) == (
+        99.0,
+        107.0,
+        98.0,
+        106.0,
+        70,
+    )
+    assert weeks[1].open == 106.0
+    assert weeks[1].close == 113.0
+
+
+def test_monthly_buckets(repo):
+    start = datetime(2023, 1, 1)
+    repo.save_many(
+        [bar("AAPL", start + timedelta(days=i), 100.0) for i in range(0, 365, 3)]
+    )
+
+    months = repo.get_stock_data(
+        "AAPL", start, datetime(2023, 12, 31), Granularity.MONTHLY
+    )
+
+    assert len(months) == 12
+    assert months[1].date == datetime(2023, 2, 1)
+    assert all(month.ticker == "AAPL" for month in months)
+
+
+def test_weekly_buckets_before_1970(repo):
+    # 1969-12-29 is a Monday, and the week runs into 1970
+    start = datetime(1969, 12, 27)
+    repo.save_many([bar("AAPL", start + timedelta(days=i), 10.0 + i) for i in range(9)])
+
+    weeks = repo.get_stock_data("AAPL", start, datetime(1970, 1, 4), "weekly")
+
+    assert [week.date for week in weeks] == [
+        datetime(1969, 12, 22),
+        datetime(1969, 12, 29),
+    ]
+    assert [week.close for week in weeks] == [11.0, 18.0]
+
+
+def test_hourly_buckets(repo):
+    # Hourly buckets come from the intraday bars in stock_prices
+    start = datetime(2024, 1, 2, 9, 30)
+    writer = StockPriceWriter(sessionmaker(bind=repo.session.get_bind()))
+    writer.write(
+        [bar("AAPL", start + timedelta(minutes=15 * i), 10.0 + i) for i in range(8)]
+    )
+
+    hours = repo.get_stock_data("AAPL", start, start + timedelta(hours=3), "hourly")
+
+    assert [hour.date.hour for hour in hours] == [9, 10, 11]
+    assert [hour.close for hour in hours] == [11.0, 15.0, 17.0]
+    assert hours[1].open == 11.0
+
+
+def test_daily_returns_stored_bars(repo):
+    repo.save_many([bar("AAPL", datetime(2024, 1, 1), 1.0)])
+
+    stocks = repo.get_stock_data(
+        "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 2), "daily"
+    )
+
+    assert [(stock.date, stock.close) for stock in stocks] == [
+        (datetime(2024, 1, 1), 1.0)
+    ]
+
+
+def test_unknown_granularity_is_rejected(repo):
+    with pytest.raises(ValueError):
+        repo.get_stock_data(
+            "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 2), "yearly"
+        )
+
+
+def test_postgresql_uses_date_trunc():
+    statement = ohlcv_rollup_query(
+        Stock.__table__,
+        "postgresql",
+        ["AAPL"],
+        datetime(2024, 1, 1),
+        datetime(2024, 2, 1),
+        Granularity.WEEKLY,
+    )
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "date_trunc" in sql
+    assert "GROUP BY" in sql
+
+
+def test_postgresql_buckets_epoch_days_by_month():
+    statement = daily_bar_rollup_query(
+        DailyBar.__table__, "postgresql", [1], 19723, 19783, Granularity.MONTHLY
+    )
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "date_trunc" in sql
+    assert "DATE '1970-01-01'" in sql
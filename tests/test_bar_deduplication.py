@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.application.bar_deduplication import BarDeduplicator, fingerprint
+from src.domain.models.stock import Stock
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def bar(ticker, day, close, volume=1000):
+    return {
+        "ticker": ticker,
+        "date": datetime(2024, 1, day),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": volume,
+    }
+
+
+def test_fingerprint_ignores_integer_and_float_types():
+    ints = pd.DataFrame([{"open": 1, "high": 2, "low": 1, "close": 2, "volume": 5}])
+    floats = ints.astype("float64")
+
+    assert fingerprint(ints).tolist() == fingerprint(floats).tolist()
+
+
+def test_filter_keeps_only_new_and_changed_bars(session):
+    repo = StockRepositoryImpl(session)
+    repo.save_many([bar("AAPL", day, 100.0) for day in range(1, 6)])
+    incoming = [bar("AAPL", day, 100.0) for day in range(1, 6)]
+    incoming[2] = bar("AAPL", 3, 101.0)
+    incoming.append(bar("AAPL", 6, 102.0))
+    incoming.append(bar("MSFT", 1, 50.0))
+
+    rows = BarDeduplicator(repo).filter(incoming)
+
+    assert [(row["ticker"], row["date"].day) for row in rows] == [
+        ("AAPL", 3),
+        ("AAPL", 6),
+        ("MSFT", 1),
+    ]
+    assert type(rows[0]["date"]) is datetime
+    assert rows[0]["close"] == 101.0
+
+
+def test_filter_dedupes_incoming_bars_last_wins():
+    repo = MagicMock()
+    repo.get_stored_bars.return_value = []
+
+    rows = BarDeduplicator(repo).filter([bar("AAPL", 1, 1.0), bar("AAPL", 1, 2.0)])
+
+    assert len(rows) == 1
+    assert rows[0]["close"] == 2.0
+    repo.get_stored_bars.assert_called_once_with(
+        "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 1)
+    )
+
+
+def test_filter_empty_input_skips_the_repository():
+    repo = MagicMock()
+
+    assert BarDeduplicator(repo).filter([]) == []
+    repo.get_stored_bars.assert_not_called()
+
+
+def test_fully_overlapping_refresh_writes_nothing(session):
+    repo = StockRepositoryImpl(session)
+    bars = [bar("AAPL", day, 100.0 + day) for day in range(1, 21)]
+    repo.save_many(bars)
+
+    assert BarDeduplicator(repo).filter(bars) == []
@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import MagicMock
+from src.infrastructure.fetchers.cached_fetcher import CachedFetcher
+import pandas as pd
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = MagicMock()
+    fetcher.fetch.side_effect = lambda ticker, period, **kwargs: pd.DataFrame(
+        {"ticker": [ticker], "period": [period], "close": [152.0]}
+    )
+    return fetcher
+
+
+@pytest.fixture
+def cached_fetcher(fetcher, tmp_path):
+    return CachedFetcher(fetcher, str(tmp_path), provider="yahoo")
+
+
+def test_second_fetch_is_served_from_disk(cached_fetcher, fetcher):
+    first = cached_fetcher.fetch("AAPL", "1mo")
+    second = cached_fetcher.fetch("AAPL", "1mo")
+
+    fetcher.fetch.assert_called_once_with("AAPL", "1mo")
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_key_includes_period_and_interval(cached_fetcher, fetcher):
+    cached_fetcher.fetch("AAPL", "1mo")
+    cached_fetcher.fetch("AAPL", "1y")
+    cached_fetcher.fetch("AAPL", "1mo", interval="1h")
+    cached_fetcher.fetch("AAPL", "1mo", interval="1d")
+
+    # interval="1d" is the default, so the last call is a hit
+    assert fetcher.fetch.call_count == 3
+
+
+def test_expired_entry_is_refetched(fetcher, tmp_path):
+    cached_fetcher = CachedFetcher(fetcher, str(tmp_path), ttls={"1d": 60})
+    cached_fetcher.fetch("AAPL", "1mo")
+
+    for root, _, files in os.walk(tmp_path):
+        for name in files:
+            old = time.time() - 120
+            os.utime(os.path.join(root, name), (old, old))
+
+    cached_fetcher.fetch("AAPL", "1mo")
+    assert fetcher.fetch.call_count == 2
+
+
+def test_replay_never_calls_provider(cached_fetcher, fetcher, tmp_path):
+    cached_fetcher.fetch("AAPL", "1mo")
+    replay = CachedFetcher(fetcher, str(tmp_path), provider="yahoo", replay=True)
+
+    assert replay.fetch("AAPL", "1mo") is not None
+    assert replay.fetch("MSFT", "1mo") is None
+    fetcher.fetch.assert_called_once()
+
+
+def test_none_results_are_not_cached(cached_fetcher, fetcher):
+    fetcher.fetch.side_effect = None
+    fetcher.fetch.return_value = None
+
+    assert cached_fetcher.fetch("AAPL", "1mo") is None
+    assert cached_fetcher.fetch("AAPL", "1mo") is None
+    assert fetcher.fetch.call_count == 2
+
+
+def cached_files(tmp_path):
+    return [name for _, _, files in os.walk(tmp_path) for name in files]
+
+
+def test_lru_eviction_respects_size_cap(cached_fetcher, fetcher, tmp_path):
+    cached_fetcher.fetch("AAPL", "1mo")
+    (entry,) = [
+        os.path.join(root, name)
+        for root, _, files in os.walk(tmp_path)
+        for name in files
+    ]
+    # Room for two entries of the same size
+    cached_fetcher.max_bytes = 2 * os.path.getsize(entry)
+    cached_fetcher.fetch("MSFT", "1mo")
+    cached_fetcher.fetch("AAPL", "1mo")  # hit, AAPL is now most recent
+
+    cached_fetcher.fetch("GOOG", "1mo")
+
+    assert len(cached_files(tmp_path)) == 2
+    fetcher.fetch.reset_mock()
+    cached_fetcher.fetch("AAPL", "1mo")
+    cached_fetcher.fetch("GOOG", "1mo")
+    fetcher.fetch.assert_not_called()
+    # MSFT was the least recently used entry and was evicted
+    cached_fetcher.fetch("MSFT", "1mo")
+    fetcher.fetch.assert_called_once_with("MSFT", "1mo")
+
+
+def test_size_index_is_loaded_from_existing_entries(fetcher, tmp_path):
+    first = CachedFetcher(fetcher, str(tmp_path), provider="yahoo")
+    first.fetch("AAPL", "1mo")
+    first.fetch("MSFT", "1mo")
+
+    second = CachedFetcher(fetcher, str(tmp_path), provider="yahoo", max_bytes=1)
+    second.fetch("GOOG", "1mo")
+
+    assert cached_files(tmp_path) == []
+
+
+def test_concurrent_writes_of_one_key(cached_fetcher, tmp_path):
+    path = cached_fetcher._path("AAPL", "1mo", "1d", {})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cached_fetcher._write(path, i), range(200)))
+
+    assert cached_files(tmp_path) == [os.path.basename(path)]
+
+
+def test_fetch_many_fetches_only_misses(cached_fetcher, fetcher):
+    fetcher.fetch_many.return_value = {"MSFT": "msft-data"}
+    cached_fetcher.fetch("AAPL", "1mo")
+
+    result = cached_fetcher.fetch_many(["AAPL", "MSFT"], "1mo")
+
+    fetcher.fetch_many.assert_called_once_with(["MSFT"], "1mo", "1d")
+    assert set(result) == {"AAPL", "MSFT"}
+    assert cached_fetcher.fetch_many(["MSFT"], "1mo") == {"MSFT": "msft-data"}
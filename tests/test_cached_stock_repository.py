@@ -0,0 +1,235 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.stock import Stock
+from src.infrastructure.db.cached_stock_repository import (
+    MISSING,
+    CachedStockRepository,
+    LRUCache,
+)
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from src.infrastructure.db.unit_of_work import UnitOfWork
+from src.use_cases.stock_service import StockService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bar(ticker, day, close):
+    return {
+        "ticker": ticker,
+        "date": datetime(2024, 1, day),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": 10.0,
+    }
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement),
+    )
+    return executed
+
+
+@pytest.fixture
+def repo(engine):
+    session = sessionmaker(bind=engine)()
+    repo = CachedStockRepository(StockRepositoryImpl(session))
+    repo.save_many([bar("AAPL", day, 100.0 + day) for day in range(1, 6)])
+    yield repo
+    session.close()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put(("get", "A"), 1)
+    cache.put(("get", "B"), 2)
+    cache.get(("get", "A"))
+    cache.put(("get", "C"), 3)
+
+    assert cache.get(("get", "B")) is MISSING
+    assert cache.get(("get", "A")) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put(("get", "A"), None)
+
+    clock.now = 9.9
+    assert cache.get(("get", "A")) is None
+    clock.now = 10
+    assert cache.get(("get", "A")) is MISSING
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidate_drops_only_that_ticker():
+    cache = LRUCache()
+    cache.put(("get", "A"), 1)
+    cache.put(("range", "A", 1, 2, None), [1])
+    cache.put(("get", "B"), 2)
+
+    cache.invalidate("A")
+
+    assert cache.stats()["size"] == 1
+    assert cache.get(("get", "B")) == 2
+
+
+def test_repeated_lookups_do_not_touch_the_database(repo, statements):
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    first = repo.get("AAPL")
+    bars = repo.get_stock_data("AAPL", start, end)
+    repo.get_latest_date("AAPL")
+    queries = len(statements)
+
+    for _ in range(10):
+        assert repo.get("AAPL").close == first.close
+        assert len(repo.get_stock_data("AAPL", start, end)) == len(bars)
+        repo.get_latest_date("AAPL")
+
+    assert len(statements) == queries
+    stats = repo.stats()
+    assert (stats["hits"], stats["misses"]) == (30, 3)
+    # Cached entities are copies that stay readable
+    repo.session.commit()
+    assert first.ticker == "AAPL"
+    assert [stock.close for stock in bars] == [101.0, 102.0, 103.0, 104.0, 105.0]
+
+
+def test_lookups_return_copies(repo):
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    stock = repo.get("AAPL")
+    stock.close = 0.0
+    repo.get_stock_data("AAPL", start, end)[0].close = 0.0
+
+    assert repo.get("AAPL") is not stock
+    assert repo.get("AAPL").close == 105.0
+    assert repo.get_stock_data("AAPL", start, end)[0].close == 101.0
+    assert repo.stats()["misses"] == 2
+
+
+def test_update_through_cache_persists(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stocks.db'}")
+    Stock.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    cache = LRUCache()
+    # Wired as Container.stock_repository is
+    repo = CachedStockRepository(StockRepositoryImpl(Session()), cache=cache)
+    repo.save_many([bar("AAPL", 1, 100.0)])
+
+    stock = repo.get("AAPL")
+    stock.close = 150.0
+    repo.update(stock)
+
+    assert repo.get("AAPL").close == 150.0
+    with Session() as session:
+        assert StockRepositoryImpl(session).get("AAPL").close == 150.0
+    repo.repository.session.close()
+
+
+def test_invalidates_again_when_the_write_commits(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stocks.db'}")
+    Stock.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    cache = LRUCache()
+    writer_session, reader_session = Session(), Session()
+    unit_of_work = UnitOfWork(writer_session, batch_size=None)
+    writer = CachedStockRepository(
+        StockRepositoryImpl(writer_session, unit_of_work=unit_of_work), cache
+    )
+    reader = CachedStockRepository(StockRepositoryImpl(reader_session), cache)
+    writer.save_many([bar("AAPL", 1, 100.0)])
+    unit_of_work.commit()
+
+    writer.save_many([bar("AAPL", 2, 101.0)])
+    # Another session caches the committed rows before the write commits
+    assert reader.get_latest_date("AAPL") == datetime(2024, 1, 1)
+    reader_session.rollback()
+    unit_of_work.commit()
+
+    assert reader.get_latest_date("AAPL") == datetime(2024, 1, 2)
+    writer_session.close()
+    reader_session.close()
+
+
+def test_writes_invalidate_the_ticker(repo):
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    assert len(repo.get_stock_data("AAPL", start, end)) == 5
+
+    repo.save_many([bar("AAPL", 6, 106.0)])
+    assert len(repo.get_stock_data("AAPL", start, end)) == 6
+
+    repo.delete_stock("AAPL")
+    assert repo.get_stock_data("AAPL", start, end) == []
+
+
+@pytest.mark.parametrize("method", ["create_stock", "save", "update"])
+def test_entity_writes_invalidate(method):
+    inner = MagicMock()
+    inner.get.side_effect = ["old", "new"]
+    repo = CachedStockRepository(inner)
+    stock = Stock("AAPL", None, None, None, datetime(2024, 1, 1))
+
+    assert repo.get("AAPL") == "old"
+    getattr(repo, method)(stock)
+
+    getattr(inner, method).assert_called_once_with(stock)
+    assert repo.get("AAPL") == "new"
+
+
+def test_failed_write_still_invalidates():
+    inner = MagicMock()
+    inner.get.side_effect = ["old", "new"]
+    inner.save_many.side_effect = RuntimeError("database is locked")
+    repo = CachedStockRepository(inner)
+    repo.get("AAPL")
+
+    with pytest.raises(RuntimeError):
+        repo.save_many([bar("AAPL", 1, 1.0)])
+
+    assert repo.get("AAPL") == "new"
+
+
+def test_other_methods_pass_through(repo):
+    assert repo.stock_exists is not None
+    assert (
+        repo.get_stock_frame("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31)).shape[
+            0
+        ]
+        == 5
+    )
+
+
+def test_stock_service_fetch_is_served_from_cache(repo, statements):
+    service = StockService(repo, MagicMock())
+    service.fetch_stock("AAPL")
+    queries = len(statements)
+
+    stock = service.fetch_stock("AAPL")
+
+    assert stock.ticker == "AAPL"
+    assert len(statements) == queries
+    service.stock_fetcher.fetch.assert_not_called()
@@ -68,10 +68,7 @@ class TestCLI(unittest.TestCase):
             mock_manage_stock_use_case_class.return_value
         )
 
-        # Ensure that check_stock_exists returns False, simulating no data in DB
-        mock_manage_stock_use_case_instance.check_stock_exists.return_value = False
-
-        # Mock the fetch_stock_data method to return a mock data object
+        # Mock sync_stock_data to return the rows it wrote
         mock_fetch_data = [
             {
                 "date": "2023-01-01",
@@ -82,7 +79,7 @@ class TestCLI(unittest.TestCase):
                 "volume": 100000,
             }
         ]
-        mock_manage_stock_use_case_instance.fetch_stock_data.return_value = (
+        mock_manage_stock_use_case_instance.sync_stock_data.return_value = (
             mock_fetch_data
         )
 
@@ -93,16 +90,32 @@ class TestCLI(unittest.TestCase):
         # Assert that the command exited without errors
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Fetch complete for AAPL in the period 1mo.", result.output)
+        self.assertIn("Stored 1 new or changed rows.", result.output)
 
-        # Assert that check_stock_exists was called once with correct arguments
-        mock_manage_stock_use_case_instance.check_stock_exists.assert_called_once_with(
+        # Assert that sync_stock_data was called once with correct arguments
+        mock_manage_stock_use_case_instance.sync_stock_data.assert_called_once_with(
             "AAPL", "1mo"
         )
 
-        # Assert that fetch_stock_data was called once with correct arguments
-        mock_manage_stock_use_case_instance.fetch_stock_data.assert_called_once_with(
-            "AAPL", "1mo"
+    @patch("src.interfaces.cli.cli.ManageStockUseCase")
+    @patch("src.interfaces.cli.cli.get_session")
+    def test_cli_fetch_up_to_date(
+        self, mock_get_session, mock_manage_stock_use_case_class
+    ):
+        """Test the CLI fetch command when no new bars are available."""
+        mock_session = MagicMock()
+        mock_get_session.return_value.__enter__.return_value = mock_session
+
+        mock_manage_stock_use_case_instance = (
+            mock_manage_stock_use_case_class.return_value
         )
+        mock_manage_stock_use_case_instance.sync_stock_data.return_value = []
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["fetch", "AAPL", "1mo"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Data for AAPL in the period 1mo is up to date.", result.output)
 
     @patch("src.interfaces.cli.cli.ManageStockUseCase")
     @patch("src.interfaces.cli.cli.get_session")
@@ -191,6 +204,160 @@ class TestCLI(unittest.TestCase):
         # Ensure that create_stock was not called
         mock_manage_stock_use_case_instance.create_stock.assert_not_called()
 
+    @patch("src.interfaces.cli.cli.ManageStockUseCase")
+    @patch("src.interfaces.cli.cli.get_session")
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    def test_cli_ingest(
+        self,
+        mock_build_provider_registry,
+        mock_get_session,
+        mock_manage_stock_use_case_class,
+    ):
+        """Test the CLI ingest command stores each fetched ticker."""
+        mock_build_provider_registry.return_value.fetch.side_effect = (
+            lambda ticker, **kwargs: (None if ticker == "EMPTY" else [{"t": ticker}])
+        )
+        mock_get_session.return_value.__enter__.return_value = MagicMock()
+        use_case = mock_manage_stock_use_case_class.return_value
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["ingest", "AAPL,MSFT,EMPTY", "1mo"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Ingested 2 of 3 tickers, 1 without data.", result.output)
+        use_case.store_stock_data.assert_any_call("AAPL", [{"t": "AAPL"}])
+        use_case.store_stock_data.assert_any_call("MSFT", [{"t": "MSFT"}])
+        mock_build_provider_registry.return_value.fetch.assert_any_call(
+            "AAPL", period="1mo", return_format="list"
+        )
+
+    @patch("src.interfaces.cli.cli.ManageStockUseCase")
+    @patch("src.interfaces.cli.cli.get_session")
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    def test_cli_ingest_reports_failures(
+        self,
+        mock_build_provider_registry,
+        mock_get_session,
+        mock_manage_stock_use_case_class,
+    ):
+        """Test the CLI ingest command exits non-zero when a ticker fails."""
+        mock_build_provider_registry.return_value.fetch.return_value = [{}]
+        use_case = mock_manage_stock_use_case_class.return_value
+        use_case.store_stock_data.side_effect = RuntimeError("disk full")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["ingest", "AAPL", "1mo"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Failed: AAPL", result.output)
+
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    @patch("src.interfaces.cli.cli.RefreshScheduler")
+    def test_cli_schedule(self, mock_scheduler_class, mock_build_provider_registry):
+        """Test the CLI schedule command queues every ticker once."""
+        mock_scheduler = mock_scheduler_class.return_value
+        mock_scheduler.stats.return_value = {"succeeded": 0}
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["schedule", "--tickers", "AAPL,MSFT", "--every", "60"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Refreshing 2 tickers every 60.0 seconds.", result.output)
+        mock_scheduler.schedule.assert_any_call("AAPL", "1mo", every=60.0)
+        mock_scheduler.schedule.assert_any_call("MSFT", "1mo", every=60.0)
+        mock_scheduler.run_forever.assert_called_once()
+
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    @patch("src.interfaces.cli.cli.RefreshScheduler")
+    @patch("src.interfaces.cli.cli.SegmentDrainer")
+    @patch("src.interfaces.cli.cli.SegmentLog")
+    def test_cli_schedule_with_log_dir(
+        self,
+        mock_log_class,
+        mock_drainer_class,
+        mock_scheduler_class,
+        mock_build_provider_registry,
+    ):
+        """Test the CLI schedule command replays and drains the segment log."""
+        mock_scheduler_class.return_value.stats.return_value = {"succeeded": 0}
+        mock_drainer = mock_drainer_class.return_value
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["schedule", "--tickers", "AAPL", "--log-dir", "wal"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        mock_log_class.assert_called_once_with("wal")
+        mock_drainer.drain_once.assert_called_once()
+        mock_drainer.start.assert_called_once()
+        mock_drainer.stop.assert_called_once()
+
+    def test_cli_schedule_without_tickers(self):
+        """Test the CLI schedule command rejects an empty watchlist."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["schedule"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Error: No tickers to refresh.", result.output)
+
+    @patch("src.interfaces.cli.cli.get_session")
+    @patch("src.interfaces.cli.cli.rebuild_from_sql")
+    def test_cli_rebuild_mmap(self, mock_rebuild_from_sql, mock_get_session):
+        """Test the CLI rebuild-mmap command rebuilds the listed tickers."""
+        mock_rebuild_from_sql.return_value = 42
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["rebuild-mmap", "--root", "bars", "--tickers", "AAPL, MSFT"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Wrote 42 bars to bars.", result.output)
+        store, _, tickers = mock_rebuild_from_sql.call_args[0]
+        self.assertEqual(store.root, "bars")
+        self.assertEqual(tickers, ["AAPL", "MSFT"])
+
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    @patch("src.interfaces.cli.cli.StockPriceWriter")
+    @patch("src.interfaces.cli.cli.StreamingIngestion")
+    def test_cli_stream(
+        self, mock_ingestion_class, mock_writer_class, mock_build_provider_registry
+    ):
+        """Test the CLI stream command runs the streaming ingestion."""
+        mock_ingestion_class.return_value.run.return_value = {"written": 3}
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["stream", "--tickers", "AAPL,MSFT", "--policy", "drop_oldest"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Streaming 1m bars for 2 tickers.", result.output)
+        self.assertIn("Streaming stopped: {'written': 3}", result.output)
+        poller, batch_writer = mock_ingestion_class.call_args.args
+        self.assertEqual(poller.tickers, ["AAPL", "MSFT"])
+        self.assertEqual(batch_writer.policy, "drop_oldest")
+        mock_writer_class.assert_called_once_with(partitions=None)
+
+    @patch.dict("os.environ", {"PARTITION_STOCK_PRICES": "true"})
+    @patch("src.interfaces.cli.cli.build_provider_registry")
+    @patch("src.interfaces.cli.cli.StockPriceWriter")
+    @patch("src.interfaces.cli.cli.StreamingIngestion")
+    def test_cli_stream_partitioned(
+        self, mock_ingestion_class, mock_writer_class, mock_build_provider_registry
+    ):
+        """Test the CLI stream command writes to partitions when configured."""
+        mock_ingestion_class.return_value.run.return_value = {"written": 0}
+
+        result = CliRunner().invoke(cli, ["stream", "--tickers", "AAPL"])
+
+        self.assertEqual(result.exit_code, 0)
+        partitions = mock_writer_class.call_args.kwargs["partitions"]
+        self.assertEqual(partitions.prefix, "stock_prices")
+
 
 if __name__ == "__main__":
     unittest.main()
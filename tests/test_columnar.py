@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.security import DailyBar, Security
+from src.domain.models.stock import Stock
+from src.infrastructure.db.columnar import bar_range_query, read_frame
+from src.infrastructure.db.stock_repository_impl import (
+    PRICE_COLUMNS,
+    StockRepositoryImpl,
+)
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = StockRepositoryImpl(session)
+    repo.save_many(
+        [
+            {
+                "ticker": ticker,
+                "date": datetime(2024, 1, day),
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": float(day),
+                "volume": 100 * day,
+            }
+            for ticker in ["AAPL", "MSFT", "IBM"]
+            for day in range(1, 11)
+        ]
+    )
+    yield repo
+    session.close()
+
+
+def test_get_stock_frame_projects_columns(repo):
+    frame = repo.get_stock_frame(
+        "AAPL", datetime(2024, 1, 3), datetime(2024, 1, 5), columns=["close"]
+    )
+
+    assert list(frame.columns) == ["ticker", "date", "close"]
+    assert pd.api.types.is_datetime64_any_dtype(frame["date"])
+    assert frame["close"].dtype == "float64"
+    assert frame["close"].tolist() == [3.0, 4.0, 5.0]
+
+
+def test_get_stock_frame_reads_several_tickers_in_order(repo):
+    frame = repo.get_stock_frame(
+        ["MSFT", "AAPL"], datetime(2024, 1, 1), datetime(2024, 1, 2)
+    )
+
+    assert list(frame.columns) == ["ticker", "date", *PRICE_COLUMNS]
+    assert frame["ticker"].tolist() == ["AAPL", "AAPL", "MSFT", "MSFT"]
+    assert frame["volume"].tolist() == [100, 200, 100, 200]
+    assert frame["date"].iloc[1] == pd.Timestamp(2024, 1, 2)
+
+
+def test_get_stock_frame_sees_pending_writes(repo):
+    repo.session.autoflush = False
+    stored = (
+        repo.session.query(DailyBar)
+        .join(Security, Security.security_id == DailyBar.security_id)
+        .filter(Security.ticker == "AAPL")
+        .order_by(DailyBar.day)
+        .first()
+    )
+    stored.close = 99.0
+
+    frame = repo.get_stock_frame("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 1))
+
+    assert frame["close"].tolist() == [99.0]
+
+
+def test_get_stock_frame_empty_range(repo):
+    frame = repo.get_stock_frame("AAPL", datetime(2025, 1, 1), datetime(2025, 2, 1))
+
+    assert frame.empty
+    assert "close" in frame.columns
+
+
+def test_unknown_column_is_rejected():
+    with pytest.raises(ValueError, match="Unknown columns: price"):
+        bar_range_query(Stock.__table__, "AAPL", None, None, ["price"])
+
+
+def test_read_frame_keeps_nulls_as_nan(repo):
+    repo.save_many([{"ticker": "NEW", "date": datetime(2024, 1, 1), "close": None}])
+    statement = bar_range_query(
+        Stock.__table__, "NEW", datetime(2024, 1, 1), datetime(2024, 1, 1), ["close"]
+    )
+
+    frame = read_frame(repo.session.connection(), statement)
+
+    assert frame["close"].isna().all()
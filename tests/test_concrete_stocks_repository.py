@@ -33,37 +33,15 @@ def sample_stock():
 
 
 def test_get_stock_data(stock_repository, mock_session):
-    # Prepare sample data
-    sample_stock_data = [
-        Stock(
-            ticker="AAPL",
-            name="Apple Inc.",
-            industry="Technology",
-            sector="Consumer Electronics",
-            date=datetime(2024, 9, 26),
-            close=150.0,
-        ),
-        Stock(
-            ticker="AAPL",
-            name="Apple Inc.",
-            industry="Technology",
-            sector="Consumer Electronics",
-            date=datetime(2024, 9, 27),
-            close=155.0,
-        ),
-        Stock(
-            ticker="AAPL",
-            name="Apple Inc.",
-            industry="Technology",
-            sector="Consumer Electronics",
-            date=datetime(2024, 9, 28),
-            close=160.0,
-        ),
+    # Rows come straight from the DBAPI cursor as tuples
+    result = mock_session.connection.return_value.execute.return_value
+    result.keys.return_value = ["ticker", "date", "close"]
+    result.cursor.fetchall.return_value = [
+        ("AAPL", "2024-09-26", 150.0),
+        ("AAPL", "2024-09-27", 155.0),
+        ("AAPL", "2024-09-28", 160.0),
     ]
 
-    # Mock the query result to return sample stock data
-    mock_session.query().filter().all.return_value = sample_stock_data
-
     # Call the get_stock_data method
     start_date = datetime(2024, 9, 26)
     end_date = datetime(2024, 9, 28)
@@ -82,11 +60,14 @@ def test_get_stock_data(stock_repository, mock_session):
     )
 
     pd.testing.assert_frame_equal(df.reset_index(drop=True), expected_df)
+    mock_session.query.assert_not_called()
 
 
 def test_get_stock_data_no_data(stock_repository, mock_session):
     # Mock the query result to return no data
-    mock_session.query().filter().all.return_value = []
+    result = mock_session.connection.return_value.execute.return_value
+    result.keys.return_value = ["ticker", "date", "close"]
+    result.cursor.fetchall.return_value = []
 
     # Call the get_stock_data method and expect a ValueError
     start_date = datetime(2024, 9, 26)
@@ -0,0 +1,79 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from src.infrastructure.fetchers.finnhub_fetcher import FinnhubFetcher
+from src.infrastructure.fetchers.resilience import CircuitBreaker
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.stock_candles.return_value = {
+        "s": "ok",
+        "t": [1693526400, 1693872000],
+        "o": [150.0, 151.0],
+        "h": [155.0, 156.0],
+        "l": [149.0, 150.0],
+        "c": [152.0, 153.0],
+        "v": [1000000, 1100000],
+    }
+    return client
+
+
+@pytest.fixture
+def fetcher(client):
+    return FinnhubFetcher(client=client, circuit_breaker=CircuitBreaker())
+
+
+def test_fetch_list_format(fetcher, client):
+    result = fetcher.fetch("AAPL", "1mo", return_format="list")
+
+    assert result[0] == {
+        "ticker": "AAPL",
+        "date": "2023-09-01",
+        "open": 150.0,
+        "high": 155.0,
+        "low": 149.0,
+        "close": 152.0,
+        "volume": 1000000,
+    }
+    symbol, resolution, start, end = client.stock_candles.call_args.args
+    assert (symbol, resolution) == ("AAPL", "D")
+    assert end - start == 30 * 24 * 60 * 60
+
+
+def test_fetch_from_start_date(fetcher, client):
+    fetcher.fetch("AAPL", start=date(2023, 9, 1), interval="1h")
+
+    _, resolution, start, _ = client.stock_candles.call_args.args
+    assert resolution == "60"
+    assert start == 1693526400
+
+
+def test_fetch_no_data(fetcher, client):
+    client.stock_candles.return_value = {"s": "no_data"}
+
+    assert fetcher.fetch("AAPL") is None
+
+
+def test_fetch_network_error(fetcher, client):
+    client.stock_candles.side_effect = Exception("Network Error")
+
+    assert fetcher.fetch("AAPL") is None
+
+
+def test_fetch_raises_network_errors_when_asked(client):
+    client.stock_candles.side_effect = Exception("Network Error")
+    fetcher = FinnhubFetcher(
+        client=client, circuit_breaker=CircuitBreaker(), raise_errors=True
+    )
+
+    with pytest.raises(Exception, match="Network Error"):
+        fetcher.fetch("AAPL")
+
+
+def test_fetch_invalid_arguments(fetcher):
+    with pytest.raises(ValueError):
+        fetcher.fetch("AAPL", period="forever")
+    with pytest.raises(ValueError):
+        fetcher.fetch("AAPL", interval="2d")
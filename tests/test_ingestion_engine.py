@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.application.ingestion_engine import AsyncIngestionEngine, RateLimiter
+
+
+class SlowFetcher:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, ticker, period="1mo"):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if ticker == "EMPTY":
+            return None
+        if ticker == "FAIL":
+            raise Exception("Network Error")
+        return {"ticker": ticker, "period": period}
+
+
+def test_ingest_streams_results_to_sink():
+    fetcher = SlowFetcher()
+    engine = AsyncIngestionEngine(fetcher, max_concurrency=3)
+    sink = MagicMock()
+
+    summary = engine.ingest(["AAPL", "MSFT", "EMPTY", "FAIL"], sink, period="1y")
+
+    assert summary == {"fetched": 2, "empty": 1, "failed": ["FAIL"]}
+    sink.assert_any_call("AAPL", {"ticker": "AAPL", "period": "1y"})
+    sink.assert_any_call("MSFT", {"ticker": "MSFT", "period": "1y"})
+    assert sink.call_count == 2
+
+
+def test_ingest_respects_concurrency_limit():
+    fetcher = SlowFetcher()
+    engine = AsyncIngestionEngine(fetcher, max_concurrency=2)
+
+    engine.ingest([f"T{i}" for i in range(6)], MagicMock())
+
+    assert fetcher.max_active == 2
+
+
+def test_ingest_awaits_coroutine_fetcher_and_sink():
+    received = []
+
+    class AsyncFetcher:
+        async def fetch(self, ticker):
+            return ticker.lower()
+
+    async def sink(ticker, data):
+        received.append((ticker, data))
+
+    engine = AsyncIngestionEngine(AsyncFetcher())
+    summary = engine.ingest(["AAPL", "AAPL"], sink)
+
+    # Duplicate tickers are only fetched once
+    assert received == [("AAPL", "aapl")]
+    assert summary["fetched"] == 1
+
+
+def test_rate_limiter_spaces_requests():
+    engine = AsyncIngestionEngine(
+        SlowFetcher(delay=0), max_concurrency=5, rate_limiter=RateLimiter(rate=20)
+    )
+
+    start = time.monotonic()
+    engine.ingest(["A", "B", "C", "D"], MagicMock())
+
+    # One token up front, then one every 50ms
+    assert time.monotonic() - start >= 0.14
+
+
+def test_sink_failure_is_isolated():
+    def sink(ticker, data):
+        if ticker == "MSFT":
+            raise RuntimeError("database is locked")
+
+    engine = AsyncIngestionEngine(SlowFetcher(delay=0), max_concurrency=2)
+    summary = engine.ingest(["AAPL", "MSFT", "NVDA"], sink)
+
+    assert summary == {"fetched": 2, "empty": 0, "failed": ["MSFT"]}
+
+
+def test_rate_limiter_is_shared_across_event_loops():
+    rate_limiter = RateLimiter(rate=100)
+    engine = AsyncIngestionEngine(
+        SlowFetcher(delay=0), max_concurrency=4, rate_limiter=rate_limiter
+    )
+
+    # Each ingest runs its own event loop, and tasks wait on the lock in both
+    for _ in range(2):
+        summary = engine.ingest(["A", "B", "C", "D"], MagicMock())
+        assert summary["fetched"] == 4
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        AsyncIngestionEngine(MagicMock(), max_concurrency=0)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
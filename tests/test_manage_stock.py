@@ -1,9 +1,14 @@
 from math import isclose
 import pytest
 from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.application.bar_deduplication import BarDeduplicator
 from src.application.use_cases.manage_stock import ManageStockUseCase
 from src.domain.models.stock import Stock
-from datetime import date  # Add this import
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from src.infrastructure.db.unit_of_work import UnitOfWork
+from datetime import date, datetime  # Add this import
 
 
 @pytest.fixture
@@ -225,3 +230,211 @@ def test_delete_stock_failure(manage_stock_use_case, stock_repo):
 
     # Ensure delete_stock was not called
     stock_repo.delete_stock.assert_not_called()
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_create_stock_commits_once_through_unit_of_work(sqlite_session):
+    unit_of_work = UnitOfWork(sqlite_session, batch_size=None)
+    stock_repo = StockRepositoryImpl(sqlite_session, unit_of_work=unit_of_work)
+    use_case = ManageStockUseCase(stock_repo, unit_of_work=unit_of_work)
+
+    use_case.create_stock("AAPL", "Apple", "Tech", "Hardware", 150.0, "2023-09-01")
+
+    assert unit_of_work.commits == 1
+    assert stock_repo.get("AAPL").close == 150.0
+
+
+def test_update_stock_commits_once_through_unit_of_work(sqlite_session, mock_stock):
+    unit_of_work = UnitOfWork(sqlite_session, batch_size=None)
+    stock_repo = StockRepositoryImpl(sqlite_session, unit_of_work=unit_of_work)
+    stock_repo.create_stock(Stock(**mock_stock))
+    unit_of_work.commit()
+    use_case = ManageStockUseCase(stock_repo, unit_of_work=unit_of_work)
+
+    use_case.update_stock("AAPL", close=155.0)
+
+    assert unit_of_work.commits == 2
+    assert stock_repo.get("AAPL").close == 155.0
+
+
+def test_fetched_bars_commit_at_use_case_boundary(sqlite_session):
+    unit_of_work = UnitOfWork(sqlite_session, batch_size=1000)
+    stock_repo = StockRepositoryImpl(sqlite_session, unit_of_work=unit_of_work)
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    stock_fetcher = MagicMock()
+    stock_fetcher.fetch.return_value = [dict(bar, date="2023-09-01")]
+    use_case = ManageStockUseCase(stock_repo, stock_fetcher, unit_of_work=unit_of_work)
+
+    assert use_case.fetch_and_store_stock("AAPL", "1mo") == 1
+
+    # The partial batch is not left pending
+    assert (unit_of_work.commits, unit_of_work.pending) == (1, 0)
+
+
+def test_failed_write_is_rolled_back_at_use_case_boundary():
+    stock_repo = MagicMock()
+    stock_repo.save.side_effect = RuntimeError("database is locked")
+    session = MagicMock()
+    use_case = ManageStockUseCase(
+        stock_repo, unit_of_work=UnitOfWork(session, batch_size=None)
+    )
+
+    with pytest.raises(RuntimeError):
+        use_case.create_stock("AAPL", "Apple", "Tech", "Hardware", 150.0, "2023-09-01")
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+
+
+def test_sync_stock_data_without_watermark(manage_stock_use_case, stock_repo):
+    stock_repo.get_latest_date = MagicMock(return_value=None)
+    records = [
+        {
+            "ticker": "AAPL",
+            "date": "2023-09-01",
+            "open": 148.0,
+            "high": 151.0,
+            "low": 147.0,
+            "close": 150.0,
+            "volume": 1000000,
+        }
+    ]
+    manage_stock_use_case.stock_fetcher.fetch = MagicMock(return_value=records)
+
+    result = manage_stock_use_case.sync_stock_data("AAPL", "1mo")
+
+    # The whole period is fetched when nothing is stored yet
+    manage_stock_use_case.stock_fetcher.fetch.assert_called_once_with(
+        "AAPL", "1mo", return_format="list"
+    )
+    (saved,) = stock_repo.save_many.call_args[0][0]
+    assert result == [saved]
+    assert saved["ticker"] == "AAPL"
+    assert saved["date"] == datetime(2023, 9, 1)
+
+
+def test_sync_stock_data_fetches_only_tail(manage_stock_use_case, stock_repo):
+    stock_repo.get_latest_date = MagicMock(return_value=datetime(2023, 9, 1))
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    manage_stock_use_case.stock_fetcher.fetch = MagicMock(
+        return_value=[
+            dict(bar, date="2023-09-01"),
+            dict(bar, date="2023-09-05"),
+        ]
+    )
+
+    result = manage_stock_use_case.sync_stock_data("AAPL", "1mo")
+
+    manage_stock_use_case.stock_fetcher.fetch.assert_called_once_with(
+        "AAPL", "1mo", return_format="list", start=date(2023, 9, 1)
+    )
+    # The bar at the watermark is fetched again so save_many can correct it
+    assert [row["date"] for row in result] == [
+        datetime(2023, 9, 1),
+        datetime(2023, 9, 5),
+    ]
+    stock_repo.save_many.assert_called_once()
+    stock_repo.save.assert_not_called()
+
+
+def test_sync_stock_data_refetches_watermark_day(manage_stock_use_case, stock_repo):
+    today = date.today()
+    stock_repo.get_latest_date = MagicMock(
+        return_value=datetime.combine(today, datetime.min.time())
+    )
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 152.5, "volume": 9}
+    manage_stock_use_case.stock_fetcher.fetch = MagicMock(
+        return_value=[dict(bar, date=today.isoformat())]
+    )
+
+    result = manage_stock_use_case.sync_stock_data("AAPL", "1mo")
+
+    # A bar stored mid-session is refreshed with the final values
+    manage_stock_use_case.stock_fetcher.fetch.assert_called_once_with(
+        "AAPL", "1mo", return_format="list", start=today
+    )
+    assert len(result) == 1
+    (saved,) = stock_repo.save_many.call_args[0][0]
+    assert saved["close"] == 152.5
+
+
+def test_sync_stock_data_returns_only_changed_rows(sqlite_session, stock_fetcher):
+    stock_repo = StockRepositoryImpl(sqlite_session)
+    use_case = ManageStockUseCase(
+        stock_repo, stock_fetcher, deduplicator=BarDeduplicator(stock_repo)
+    )
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    stock_fetcher.fetch = MagicMock(return_value=[dict(bar, date="2023-09-01")])
+    assert len(use_case.sync_stock_data("AAPL", "1mo")) == 1
+
+    # The refetched watermark bar is unchanged, so nothing is written
+    assert use_case.sync_stock_data("AAPL", "1mo") == []
+
+    stock_fetcher.fetch = MagicMock(
+        return_value=[
+            dict(bar, date="2023-09-01"),
+            dict(bar, date="2023-09-05", close=152.0),
+        ]
+    )
+    (row,) = use_case.sync_stock_data("AAPL", "1mo")
+    assert (row["date"], row["close"]) == (datetime(2023, 9, 5), 152.0)
+
+
+def test_sync_stock_data_watermark_in_future(manage_stock_use_case, stock_repo):
+    stock_repo.get_latest_date = MagicMock(return_value=datetime(2999, 1, 1))
+
+    result = manage_stock_use_case.sync_stock_data("AAPL", "1mo")
+
+    assert result == []
+    manage_stock_use_case.stock_fetcher.fetch.assert_not_called()
+    stock_repo.save_many.assert_not_called()
+
+
+def test_fetch_and_store_stock_saves_in_bulk(manage_stock_use_case, stock_repo):
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    manage_stock_use_case.stock_fetcher.fetch = MagicMock(
+        return_value=[dict(bar, date="2023-09-01"), dict(bar, date="2023-09-05")]
+    )
+    stock_repo.save_many.return_value = 2
+
+    assert manage_stock_use_case.fetch_and_store_stock("AAPL", "1mo") == 2
+    rows = stock_repo.save_many.call_args[0][0]
+    assert [row["date"] for row in rows] == [
+        datetime(2023, 9, 1),
+        datetime(2023, 9, 5),
+    ]
+    stock_repo.save.assert_not_called()
+
+
+def test_fetch_and_store_stock_appends_to_ingestion_log(stock_repo, stock_fetcher):
+    ingestion_log = MagicMock()
+    ingestion_log.append.return_value = 1
+    use_case = ManageStockUseCase(stock_repo, stock_fetcher, ingestion_log)
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    stock_fetcher.fetch.return_value = [dict(bar, date="2023-09-01")]
+
+    assert use_case.fetch_and_store_stock("AAPL", "1mo") == 1
+    rows = ingestion_log.append.call_args[0][0]
+    assert rows[0]["ticker"] == "AAPL"
+    stock_repo.save_many.assert_not_called()
+
+
+def test_fetch_and_store_stock_skips_stored_bars(stock_repo, stock_fetcher):
+    deduplicator = MagicMock()
+    deduplicator.filter.return_value = []
+    use_case = ManageStockUseCase(stock_repo, stock_fetcher, deduplicator=deduplicator)
+    bar = {"open": 148.0, "high": 151.0, "low": 147.0, "close": 150.0, "volume": 1}
+    stock_fetcher.fetch.return_value = [dict(bar, date="2023-09-01")]
+    stock_repo.save_many.return_value = 0
+
+    assert use_case.fetch_and_store_stock("AAPL", "1mo") == 0
+    assert deduplicator.filter.call_args[0][0][0]["ticker"] == "AAPL"
+    stock_repo.save_many.assert_called_once_with([])
@@ -1,4 +1,8 @@
-from sqlalchemy import create_engine, text
+from datetime import datetime
+import os
+import uuid
+import pandas as pd
+from sqlalchemy import create_engine, inspect, make_url, text
 from sqlalchemy.orm import sessionmaker
 from alembic import command
 from alembic.config import Config
@@ -6,6 +10,10 @@ import pytest
 
 # Assuming Base is the declarative_base from your models.py
 from src.infrastructure.db.models import Base
+from src.infrastructure.db.pg_bulk_loader import PostgresBulkLoader
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+
+POSTGRES_URL = os.environ.get("DATABASE_URL", "")
 
 
 @pytest.fixture(scope="function")
@@ -66,6 +74,116 @@ def test_insert_data_after_migration(setup_database):
     assert result[3] == "Consumer Electronics"
 
 
+def upgrade(monkeypatch, url, revision="head"):
+    # env.py takes the database from DATABASE_URL
+    monkeypatch.setenv("DATABASE_URL", url)
+    command.upgrade(Config("config/alembic.ini"), revision)
+
+
+def bar(ticker, day, close):
+    return {
+        "ticker": ticker,
+        "date": datetime(2024, 1, day),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": 100.0,
+    }
+
+
+def check_upgraded_schema(engine):
+    """Write and read bars through a database built by the migrations."""
+    session = sessionmaker(bind=engine)()
+    try:
+        repo = StockRepositoryImpl(session)
+        repo.save_many([bar("AAPL", day, 100.0 + day) for day in (1, 2, 3)])
+
+        weekly = repo.get_stock_data(
+            "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31), "weekly"
+        )
+        assert [(stock.date, stock.close) for stock in weekly] == [
+            (datetime(2024, 1, 1), 103.0)
+        ]
+        count = session.execute(
+            text("SELECT COUNT(*) FROM stock_rollups WHERE ticker = 'AAPL'")
+        ).scalar()
+        assert count == 2
+        stocks = session.execute(
+            text("SELECT date, close FROM stocks WHERE ticker = 'AAPL' ORDER BY date")
+        ).fetchall()
+        assert [row.close for row in stocks] == [101.0, 102.0, 103.0]
+    finally:
+        session.close()
+
+
+def test_upgrade_empty_sqlite_database(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+
+    upgrade(monkeypatch, url, "e3cab1a2d06b")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO stocks (ticker, name, date) "
+                "VALUES ('MSFT', 'Microsoft', '2023-12-29')"
+            )
+        )
+    upgrade(monkeypatch, url)
+
+    inspector = inspect(engine)
+    assert "stocks" in inspector.get_view_names()
+    assert not inspector.get_foreign_keys("stock_prices")
+    with engine.connect() as connection:
+        assert connection.execute(
+            text("SELECT ticker, name FROM securities")
+        ).fetchall() == [("MSFT", "Microsoft")]
+    check_upgraded_schema(engine)
+
+
+@pytest.fixture
+def postgres_url():
+    """A DATABASE_URL PostgreSQL database, confined to a throwaway schema."""
+    if not POSTGRES_URL.startswith("postgresql"):
+        pytest.skip("needs a PostgreSQL DATABASE_URL")
+    schema = f"test_migrations_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    url = make_url(POSTGRES_URL).update_query_dict(
+        {"options": f"-csearch_path={schema}"}
+    )
+    yield url.render_as_string(hide_password=False)
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
+
+
+def test_upgrade_empty_postgresql_database(postgres_url, monkeypatch):
+    upgrade(monkeypatch, postgres_url)
+
+    engine = create_engine(postgres_url)
+    try:
+        assert "stocks" in inspect(engine).get_view_names()
+        check_upgraded_schema(engine)
+
+        frame = pd.DataFrame([bar("MSFT", day, 300.0 + day) for day in (1, 2)])
+        assert PostgresBulkLoader(engine).load("stocks", frame) == 2
+        with engine.connect() as connection:
+            rollups = connection.execute(
+                text(
+                    "SELECT granularity, close FROM stock_rollups "
+                    "WHERE ticker = 'MSFT' ORDER BY granularity"
+                )
+            ).fetchall()
+        assert [tuple(row) for row in rollups] == [
+            ("monthly", 302.0),
+            ("weekly", 302.0),
+        ]
+    finally:
+        engine.dispose()
+
+
 # TODO: It needed verify downgrade migration
 # def test_downgrade_migration(setup_database):
 #     alembic_cfg = Config("alembic.ini")
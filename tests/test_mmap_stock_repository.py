@@ -0,0 +1,140 @@
+import os
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.stock import Stock
+from src.infrastructure.db.mmap_stock_repository import (
+    MmapStockRepository,
+    rebuild_from_sql,
+)
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return MmapStockRepository(str(tmp_path / "bars"))
+
+
+def bar(ticker, date, close):
+    return {
+        "ticker": ticker,
+        "date": date,
+        "open": close - 1,
+        "high": close + 1,
+        "low": close - 2,
+        "close": close,
+        "volume": 1000,
+    }
+
+
+def days(ticker, first, count, start=datetime(2024, 1, 1)):
+    return [
+        bar(ticker, start + timedelta(days=first + i), 100.0 + first + i)
+        for i in range(count)
+    ]
+
+
+def test_range_read_is_a_zero_copy_slice(repo):
+    repo.save_many(days("AAPL", 0, 30))
+
+    bars = repo.get_range(
+        "AAPL", datetime(2024, 1, 5), datetime(2024, 1, 7), columns=["close"]
+    )
+
+    assert list(bars) == ["date", "close"]
+    assert bars["close"].tolist() == [104.0, 105.0, 106.0]
+    assert isinstance(bars["close"], np.memmap)
+    assert not bars["close"].flags.writeable
+    assert bars["date"][0] == np.datetime64("2024-01-05")
+
+
+def test_appends_in_place_and_new_readers_see_them(repo):
+    repo.save_many(days("AAPL", 0, 3))
+    first_read = repo.get_range("AAPL", datetime(2024, 1, 1), datetime(2024, 12, 31))
+    ticker_dir = os.path.join(repo.root, "ticker=AAPL")
+    inode = os.stat(os.path.join(ticker_dir, "date.bin")).st_ino
+
+    repo.save_many(days("AAPL", 3, 2))
+
+    assert os.stat(os.path.join(ticker_dir, "date.bin")).st_ino == inode
+    assert len(first_read["date"]) == 3
+    reader = MmapStockRepository(repo.root)
+    assert (
+        len(
+            reader.get_range("AAPL", datetime(2024, 1, 1), datetime(2025, 1, 1))["date"]
+        )
+        == 5
+    )
+    assert reader.get_latest_date("AAPL") == datetime(2024, 1, 5)
+
+
+def test_overlapping_write_merges_last_wins(repo):
+    repo.save_many(days("AAPL", 0, 5))
+
+    repo.save_many(
+        [
+            bar("AAPL", datetime(2024, 1, 2), 500.0),
+            bar("AAPL", datetime(2023, 12, 31), 1.0),
+        ]
+    )
+
+    frame = repo.get_stock_data("AAPL", datetime(2023, 1, 1), datetime(2025, 1, 1))
+    assert frame["date"].is_monotonic_increasing
+    assert frame["close"].tolist() == [1.0, 100.0, 500.0, 102.0, 103.0, 104.0]
+    assert repo.tickers() == ["AAPL"]
+
+
+def test_torn_append_is_ignored_and_trimmed(repo):
+    repo.save_many(days("AAPL", 0, 2))
+    with open(os.path.join(repo.root, "ticker=AAPL", "open.bin"), "ab") as column:
+        column.write(np.float64(42.0).tobytes())
+
+    assert (
+        len(repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2025, 1, 1)))
+        == 2
+    )
+    repo.save_many(days("AAPL", 2, 1))
+
+    frame = repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2025, 1, 1))
+    assert frame["open"].tolist() == [99.0, 100.0, 101.0]
+
+
+def test_get_stock_data_rejects_other_granularities(repo):
+    repo.save_many(days("AAPL", 0, 3))
+    start, end = datetime(2024, 1, 1), datetime(2025, 1, 1)
+
+    assert len(repo.get_stock_data("AAPL", start, end, "daily")) == 3
+    with pytest.raises(ValueError, match="only stores daily bars, not weekly"):
+        repo.get_stock_data("AAPL", start, end, "weekly")
+
+
+def test_get_and_delete(repo):
+    assert repo.get("AAPL") is None
+    repo.create_stock(
+        Stock("AAPL", None, None, None, datetime(2024, 1, 2), 1, 2, 0, 1.5, 10)
+    )
+
+    stock = repo.get("AAPL")
+    assert (stock.date, stock.close, stock.volume) == (datetime(2024, 1, 2), 1.5, 10.0)
+    assert repo.delete_stock("AAPL") is True
+    assert repo.delete_stock("AAPL") is False
+    assert repo.get_latest_date("AAPL") is None
+    assert repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2025, 1, 1)).empty
+
+
+def test_rebuild_from_sql(repo):
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    sql_repo = StockRepositoryImpl(session, rollups=False)
+    sql_repo.save_many(days("AAPL", 0, 10) + days("MSFT", 0, 4))
+    repo.save_many(days("AAPL", 20, 1))
+
+    assert rebuild_from_sql(repo, sql_repo) == 14
+
+    assert repo.tickers() == ["AAPL", "MSFT"]
+    assert repo.get_latest_date("AAPL") == datetime(2024, 1, 10)
+    assert not any(".old-" in name or ".tmp-" in name for name in os.listdir(repo.root))
+    session.close()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.infrastructure.fetchers.normalization import normalize_columns
+from src.infrastructure.fetchers.yahoo_finance_fetcher import YahooFinanceFetcher
+
+
+def make_history(periods=3, volume=True):
+    index = pd.date_range(
+        "2023-09-01", periods=periods, freq="D", tz="America/New_York", name="Date"
+    )
+    data = {
+        "Open": np.full(periods, 150.0),
+        "High": np.full(periods, 155.0),
+        "Low": np.full(periods, 149.0),
+        "Close": np.full(periods, 152.0),
+        "Dividends": np.zeros(periods),
+    }
+    if volume:
+        data["Volume"] = np.full(periods, 1000000)
+    return pd.DataFrame(data, index=index)
+
+
+def test_normalize_columns_returns_compact_buffers():
+    columns = normalize_columns(make_history())
+
+    assert list(columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert columns["date"].dtype == np.dtype("datetime64[ns]")
+    assert str(columns["date"][0]) == "2023-09-01T00:00:00.000000000"
+    assert columns["close"].dtype == np.dtype("float64")
+    # Integer volumes keep the provider's dtype
+    assert columns["volume"].dtype == np.dtype("int64")
+
+
+def test_normalize_columns_leaves_out_missing_columns():
+    columns = normalize_columns(make_history(volume=False))
+
+    assert "volume" not in columns
+
+
+def test_normalize_columns_reads_a_date_column():
+    history = make_history().reset_index()
+
+    columns = normalize_columns(history)
+
+    np.testing.assert_array_equal(
+        columns["date"], normalize_columns(make_history())["date"]
+    )
+    assert columns["open"].tolist() == [150.0, 150.0, 150.0]
+
+
+@pytest.mark.parametrize("return_format", ["dataframe", "list", "columns"])
+@patch("yfinance.download")
+@patch("yfinance.Ticker")
+def test_fetch_and_fetch_many_agree(mock_ticker, mock_download, return_format):
+    mock_ticker.return_value.history.return_value = make_history()
+    mock_download.return_value = pd.concat(
+        {"AAPL": make_history(), "MSFT": make_history(volume=False)}, axis=1
+    )
+    fetcher = YahooFinanceFetcher()
+
+    single = fetcher.fetch("AAPL", return_format=return_format)
+    many = fetcher.fetch_many(["AAPL", "MSFT"], return_format=return_format)
+
+    if return_format == "dataframe":
+        # Both return naive exchange-local dates
+        assert single["date"].dt.tz is None
+        pd.testing.assert_frame_equal(single, many["AAPL"])
+    elif return_format == "list":
+        assert single == many["AAPL"]
+    else:
+        for name, values in single.items():
+            np.testing.assert_array_equal(values, many["AAPL"][name])
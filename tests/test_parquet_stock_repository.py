@@ -0,0 +1,165 @@
+import os
+import threading
+import pytest
+from datetime import datetime
+from src.domain.models.stock import Stock
+from src.infrastructure.db.parquet_stock_repository import ParquetStockRepository
+
+# pyarrow is an optional dependency, only needed by the Parquet repository
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return ParquetStockRepository(str(tmp_path / "bars"))
+
+
+def bar(ticker, date, close):
+    return {
+        "ticker": ticker,
+        "date": date,
+        "open": close - 1,
+        "high": close + 1,
+        "low": close - 2,
+        "close": close,
+        "volume": 1000.0,
+    }
+
+
+def parts(repo, ticker, year):
+    return os.listdir(os.path.join(repo.root, f"ticker={ticker}", f"year={year}"))
+
+
+def test_save_many_partitions_by_ticker_and_year(repo):
+    written = repo.save_many(
+        [
+            bar("AAPL", datetime(2023, 12, 29), 190.0),
+            bar("AAPL", datetime(2024, 1, 2), 185.0),
+            bar("MSFT", datetime(2024, 1, 2), 370.0),
+        ]
+    )
+
+    assert written == 3
+    assert repo.tickers() == ["AAPL", "MSFT"]
+    assert len(parts(repo, "AAPL", 2023)) == 1
+    assert len(parts(repo, "AAPL", 2024)) == 1
+
+
+def test_get_stock_data_filters_and_projects(repo):
+    repo.save_many(
+        [bar("AAPL", datetime(2023, 12, d), 100.0 + d) for d in range(20, 32)]
+        + [bar("AAPL", datetime(2024, 1, d), 200.0 + d) for d in range(1, 10)]
+    )
+
+    data = repo.get_stock_data(
+        "AAPL", datetime(2023, 12, 30), datetime(2024, 1, 2), columns=["close"]
+    )
+
+    assert list(data.columns) == ["date", "close"]
+    assert list(data["close"]) == [130.0, 131.0, 201.0, 202.0]
+
+
+def test_get_stock_data_missing_ticker(repo):
+    data = repo.get_stock_data("NONE", datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    assert data.empty
+
+
+def test_newer_writes_win_and_compaction_keeps_them(repo):
+    repo.save_many([bar("AAPL", datetime(2024, 1, d), 100.0) for d in range(1, 4)])
+    repo.save_many([bar("AAPL", datetime(2024, 1, 2), 150.0)])
+    assert len(parts(repo, "AAPL", 2024)) == 2
+
+    before = repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert list(before["close"]) == [100.0, 150.0, 100.0]
+
+    assert repo.compact("AAPL") == 1
+    assert len(parts(repo, "AAPL", 2024)) == 1
+    after = repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert after.equals(before)
+
+
+def test_partition_is_compacted_after_max_parts(tmp_path):
+    repo = ParquetStockRepository(str(tmp_path), max_parts=3)
+
+    for day in range(1, 6):
+        repo.save_many([bar("AAPL", datetime(2024, 1, day), float(day))])
+
+    assert len(parts(repo, "AAPL", 2024)) <= 3
+    data = repo.get_stock_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert list(data["close"]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_stock_methods(repo):
+    stock = Stock("AAPL", None, None, None, datetime(2024, 1, 3), close=185.0)
+    repo.save_many([bar("AAPL", datetime(2024, 1, 2), 180.0)])
+
+    repo.save(stock)
+
+    assert repo.get_latest_date("AAPL") == datetime(2024, 1, 3)
+    latest = repo.get("AAPL")
+    assert latest.date == datetime(2024, 1, 3)
+    assert latest.close == 185.0
+    assert repo.delete_stock("AAPL") is True
+    assert repo.get("AAPL") is None
+    assert repo.delete_stock("AAPL") is False
+
+
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda repo: repo.get_stock_data(
+            "AAPL", datetime(2024, 1, 1), datetime(2024, 12, 31)
+        )["close"].tolist(),
+        lambda repo: repo.get_latest_date("AAPL"),
+    ],
+    ids=["get_stock_data", "get_latest_date"],
+)
+def test_reads_survive_compaction_between_listing_and_reading(repo, monkeypatch, read):
+    dataset_module = pytest.importorskip("pyarrow.dataset")
+    for day in (2, 3, 4):
+        repo.save_many([bar("AAPL", datetime(2024, 1, day), 100.0 + day)])
+    expected = read(repo)
+
+    dataset = dataset_module.dataset
+    compacted = []
+
+    def compact_after_listing(files, **kwargs):
+        # The reader has listed the parts; compaction now removes them
+        if not compacted:
+            compacted.append(files)
+            repo.compact("AAPL")
+        return dataset(files, **kwargs)
+
+    monkeypatch.setattr(dataset_module, "dataset", compact_after_listing)
+
+    assert read(repo) == expected
+    assert not any(os.path.exists(path) for path in compacted[0])
+
+
+def test_concurrent_reads_and_compaction(tmp_path):
+    repo = ParquetStockRepository(str(tmp_path / "bars"), max_parts=2)
+    repo.save_many([bar("AAPL", datetime(2024, 1, 1), 100.0)])
+    errors = []
+    done = threading.Event()
+
+    def read_until_done():
+        try:
+            while not done.is_set():
+                start, end = datetime(2024, 1, 1), datetime(2024, 12, 31)
+                assert not repo.get_stock_data("AAPL", start, end).empty
+                assert repo.get_latest_date("AAPL") is not None
+        except Exception as error:
+            errors.append(error)
+
+    readers = [threading.Thread(target=read_until_done) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    # Every third write compacts the partition
+    for day in range(2, 60):
+        repo.save_many([bar("AAPL", datetime(2024, 1, 1 + day % 28), 100.0 + day)])
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
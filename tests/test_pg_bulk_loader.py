@@ -0,0 +1,166 @@
+import pandas as pd
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql, sqlite
+from src.infrastructure.db.pg_bulk_loader import PostgresBulkLoader
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if sql.startswith("INSERT"):
+            self.rowcount = sum(payload.count("\n") for _, payload in self.copied)
+
+    def copy_expert(self, sql, buffer):
+        self.copied.append((sql, buffer.read()))
+
+
+@pytest.fixture
+def cursor():
+    return FakeCursor()
+
+
+@pytest.fixture
+def connection(cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    return connection
+
+
+@pytest.fixture
+def engine(connection):
+    engine = MagicMock()
+    engine.dialect = postgresql.dialect()
+    engine.raw_connection.return_value = connection
+    return engine
+
+
+def bars(*closes):
+    return pd.DataFrame(
+        {
+            "ticker": "AAPL",
+            "date": [datetime(2024, 1, 10, 9, 30 + i) for i in range(len(closes))],
+            "open": closes,
+            "high": closes,
+            "low": closes,
+            "close": closes,
+            "volume": [100.0] * len(closes),
+        }
+    )
+
+
+def test_requires_postgresql():
+    engine = MagicMock()
+    engine.dialect = sqlite.dialect()
+
+    with pytest.raises(ValueError):
+        PostgresBulkLoader(engine)
+
+
+def test_load_copies_through_staging_table(engine, connection, cursor):
+    loader = PostgresBulkLoader(engine, chunk_rows=2)
+
+    merged = loader.load_stock_prices(bars(1.0, 2.0, 3.0))
+
+    assert merged == 3
+    create, insert = cursor.statements
+    assert create.startswith("CREATE TEMP TABLE staging_stock_prices ON COMMIT DROP")
+    assert "WITH NO DATA" in create
+    assert len(cursor.copied) == 2
+    copy_sql, payload = cursor.copied[0]
+    assert copy_sql.startswith("COPY staging_stock_prices (ticker, date, open,")
+    # volume is INTEGER in stock_prices, which COPY will not read as 100.0
+    assert payload.splitlines()[0] == "AAPL,2024-01-10 09:30:00,1.0,1.0,1.0,1.0,100"
+    assert insert.startswith("INSERT INTO stock_prices")
+    assert "ON CONFLICT (ticker, date) DO UPDATE SET open = EXCLUDED.open" in insert
+    connection.commit.assert_called_once()
+    connection.close.assert_called_once()
+
+
+def test_load_keeps_last_duplicate_and_writes_nulls(engine, cursor):
+    frame = bars(1.0, 2.0)
+    frame.loc[1, "date"] = frame.loc[0, "date"]
+    frame.loc[1, "volume"] = None
+
+    PostgresBulkLoader(engine).load_stocks(frame)
+
+    ((_, payload),) = cursor.copied
+    assert payload == "AAPL,2024-01-10,2.0,2.0,2.0,2.0,\n"
+
+
+def test_load_stocks_merges_into_securities_and_daily_bars(engine, cursor):
+    frame = bars(1.0, 2.0).assign(name="Apple")
+
+    merged = PostgresBulkLoader(engine).load("stocks", frame)
+
+    # Both bars fall on one day, so the later one is kept
+    assert merged == 1
+    create, securities, daily_bars, rollups = cursor.statements
+    assert create.startswith("CREATE TEMP TABLE staging_daily_bars ON COMMIT DROP")
+    assert securities.startswith("INSERT INTO securities (ticker, name) ")
+    assert "ON CONFLICT (ticker) DO NOTHING" in securities
+    assert daily_bars.startswith("INSERT INTO daily_bars (security_id, day, open,")
+    assert "ON CONFLICT (security_id, day) DO UPDATE SET open = EXCLUDED.open" in (
+        daily_bars
+    )
+    # Rollups of the loaded tickers are refreshed in the same transaction
+    assert rollups.startswith("INSERT INTO stock_rollups")
+    assert "FROM staging_daily_bars" in rollups
+
+
+def test_load_stocks_without_rollups(engine, cursor):
+    PostgresBulkLoader(engine, rollups=False).load_stocks(bars(1.0))
+
+    assert not any("stock_rollups" in sql for sql in cursor.statements)
+
+
+def test_load_casts_integer_columns_with_nulls(engine, cursor):
+    frame = bars(1.0, 2.0, 3.0)
+    frame["volume"] = [100.0, None, 2.6]
+
+    PostgresBulkLoader(engine).load_stock_prices(frame)
+
+    ((_, payload),) = cursor.copied
+    assert [line.rsplit(",", 1)[1] for line in payload.splitlines()] == [
+        "100",
+        "",
+        "3",
+    ]
+
+
+def test_load_rolls_back_on_error(engine, connection, cursor):
+    cursor.copy_expert = MagicMock(side_effect=RuntimeError("bad row"))
+
+    with pytest.raises(RuntimeError):
+        PostgresBulkLoader(engine).load_stock_prices(bars(1.0))
+
+    connection.rollback.assert_called_once()
+    connection.commit.assert_not_called()
+    connection.close.assert_called_once()
+
+
+def test_load_validates_input(engine):
+    loader = PostgresBulkLoader(engine)
+
+    with pytest.raises(ValueError):
+        loader.load("fundamentals", bars(1.0))
+    with pytest.raises(ValueError):
+        loader.load_stock_prices(bars(1.0).drop(columns="ticker"))
+    assert loader.load_stock_prices(bars()) == 0
+    engine.raw_connection.assert_not_called()
+
+
+def test_frame_sink_adds_ticker(engine, cursor):
+    sink = PostgresBulkLoader(engine).frame_sink("stock_prices")
+
+    sink("MSFT", bars(1.0).drop(columns="ticker"))
+
+    ((copy_sql, payload),) = cursor.copied
+    assert copy_sql.startswith("COPY staging_stock_prices (date, open,")
+    assert payload.rstrip().endswith(",MSFT")
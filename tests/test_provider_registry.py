@@ -0,0 +1,115 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.infrastructure.fetchers.provider_registry import (
+    ProviderRegistry,
+    build_provider_registry,
+)
+
+
+@pytest.fixture
+def yahoo():
+    return MagicMock(spec=["fetch", "fetch_many"])
+
+
+@pytest.fixture
+def finnhub():
+    return MagicMock(spec=["fetch"])
+
+
+@pytest.fixture
+def registry(yahoo, finnhub):
+    registry = ProviderRegistry()
+    registry.register("yahoo", yahoo)
+    registry.register("finnhub", finnhub)
+    return registry
+
+
+def test_fetch_uses_priority_order(registry, yahoo, finnhub):
+    yahoo.fetch.return_value = "yahoo-data"
+
+    assert registry.fetch("AAPL", "1mo") == "yahoo-data"
+    yahoo.fetch.assert_called_once_with("AAPL", "1mo")
+    finnhub.fetch.assert_not_called()
+
+
+def test_fetch_fails_over(registry, yahoo, finnhub):
+    yahoo.fetch.side_effect = Exception("rate limited")
+    finnhub.fetch.return_value = "finnhub-data"
+
+    assert registry.fetch("AAPL", "1mo") == "finnhub-data"
+    assert registry.stats()["yahoo"]["error_rate"] == 1.0
+
+
+def test_empty_result_is_not_an_error(registry, yahoo, finnhub):
+    # Nothing new since the watermark is a normal answer
+    yahoo.fetch.return_value = None
+
+    assert registry.fetch("AAPL", "1mo", start="2023-09-01") is None
+    finnhub.fetch.assert_not_called()
+    assert registry.stats()["yahoo"]["error_rate"] == 0.0
+    assert registry.ranked() == ["yahoo", "finnhub"]
+
+
+def test_unhealthy_provider_is_demoted(registry, yahoo, finnhub):
+    yahoo.fetch.side_effect = Exception("rate limited")
+    finnhub.fetch.return_value = "finnhub-data"
+    registry.fetch("AAPL")
+
+    assert registry.ranked() == ["finnhub", "yahoo"]
+    registry.fetch("AAPL")
+    # Second request goes straight to the healthy provider
+    assert yahoo.fetch.call_count == 1
+
+
+def test_slow_provider_is_demoted(registry):
+    registry._stats["yahoo"].record(2.0, True)
+    registry._stats["finnhub"].record(0.1, True)
+
+    assert registry.ranked() == ["finnhub", "yahoo"]
+
+
+def test_set_priority(registry):
+    registry.set_priority(["finnhub", "unknown"])
+
+    assert registry.ranked() == ["finnhub", "yahoo"]
+
+
+def test_fetch_many_fails_over_on_errors(registry, yahoo, finnhub):
+    yahoo.fetch_many.side_effect = Exception("rate limited")
+    finnhub.fetch.side_effect = lambda ticker, *args, **kwargs: (
+        None if ticker == "NVDA" else f"finnhub-{ticker}"
+    )
+
+    result = registry.fetch_many(["AAPL", "MSFT", "NVDA"], "1y")
+
+    assert result == {"AAPL": "finnhub-AAPL", "MSFT": "finnhub-MSFT"}
+    yahoo.fetch_many.assert_called_once_with(
+        ["AAPL", "MSFT", "NVDA"], "1y", "1d", "dataframe"
+    )
+    finnhub.fetch.assert_any_call(
+        "MSFT", "1y", return_format="dataframe", interval="1d"
+    )
+    assert registry.stats()["finnhub"]["error_rate"] == 0.0
+
+
+def test_fetch_many_keeps_clean_partial_answer(registry, yahoo, finnhub):
+    yahoo.fetch_many.return_value = {"AAPL": "yahoo-aapl"}
+
+    result = registry.fetch_many(["AAPL", "MSFT"], "1y")
+
+    # MSFT had no data at Yahoo, which is an answer rather than a failure
+    assert result == {"AAPL": "yahoo-aapl"}
+    finnhub.fetch.assert_not_called()
+
+
+def test_build_provider_registry(monkeypatch):
+    monkeypatch.delenv("FINNHUB_API_KEY", raising=False)
+    registry = build_provider_registry()
+    assert registry.ranked() == ["yahoo"]
+    assert registry.get("yahoo").raise_errors
+
+    monkeypatch.setenv("FINNHUB_API_KEY", "test-key")
+    monkeypatch.setenv("STOCK_PROVIDERS", "finnhub,yahoo")
+    with patch("finnhub.Client"):
+        registry = build_provider_registry()
+    assert registry.ranked() == ["finnhub", "yahoo"]
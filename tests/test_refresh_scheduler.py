@@ -0,0 +1,146 @@
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+from src.application.refresh_scheduler import MarketHours, RefreshScheduler
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def ts(*args):
+    return datetime(*args, tzinfo=NEW_YORK).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    # Wednesday 2024-01-10, 10:00 in New York: market open
+    return FakeClock(ts(2024, 1, 10, 10, 0))
+
+
+@pytest.fixture
+def run_job():
+    return MagicMock(return_value=[{"date": "2024-01-10"}])
+
+
+@pytest.fixture
+def scheduler(run_job, clock):
+    return RefreshScheduler(run_job, max_workers=2, clock=clock)
+
+
+def test_market_hours():
+    hours = MarketHours()
+
+    assert hours.is_open(ts(2024, 1, 10, 10, 0))
+    assert not hours.is_open(ts(2024, 1, 10, 17, 0))
+    assert not hours.is_open(ts(2024, 1, 13, 10, 0))  # Saturday
+    assert hours.next_open(ts(2024, 1, 12, 17, 0)) == ts(2024, 1, 15, 9, 30)
+    assert hours.next_open(ts(2024, 1, 10, 8, 0)) == ts(2024, 1, 10, 9, 30)
+
+
+def test_runs_due_jobs_by_priority(scheduler, run_job):
+    scheduler.schedule("MSFT", "1mo", priority=5)
+    scheduler.schedule("AAPL", "1mo", priority=1)
+
+    assert scheduler.run_pending() == 2
+    assert [c.args for c in run_job.call_args_list] == [
+        ("AAPL", "1mo"),
+        ("MSFT", "1mo"),
+    ]
+    stats = scheduler.stats()
+    assert stats["succeeded"] == 2
+    assert stats["rows"] == 2
+
+
+def test_duplicate_jobs_are_collapsed(scheduler, run_job, clock):
+    assert scheduler.schedule("AAPL", "1mo", at=clock.now + 60)
+    assert not scheduler.schedule("AAPL", "1mo")
+    assert scheduler.schedule("AAPL", "1y")
+
+    scheduler.run_pending()
+
+    # The duplicate moved the queued job forward instead of adding another
+    assert run_job.call_count == 2
+    assert scheduler.stats()["deduplicated"] == 1
+
+
+def test_in_flight_jobs_are_collapsed(clock):
+    release = threading.Event()
+    scheduler = RefreshScheduler(
+        lambda ticker, period: release.wait(1) and [], clock=clock
+    )
+    scheduler.schedule("AAPL")
+    worker = threading.Thread(target=scheduler.run_pending)
+    worker.start()
+    while scheduler.stats()["in_flight"] == 0:
+        pass
+
+    assert not scheduler.schedule("AAPL")
+    release.set()
+    worker.join()
+    assert scheduler.stats()["succeeded"] == 1
+
+
+def test_one_off_refresh_keeps_queued_recurrence(scheduler, run_job, clock):
+    scheduler.schedule("AAPL", every=120, at=clock.now + 60)
+    assert not scheduler.schedule("AAPL")
+
+    assert scheduler.run_pending() == 1
+    # The job still recurs after the merged one-off run
+    assert scheduler._queue[0][0] == clock.now + 120
+    assert scheduler.stats()["queued"] == 1
+
+
+def test_recurring_schedule_joins_queued_one_off(scheduler, clock):
+    scheduler.schedule("AAPL")
+    assert not scheduler.schedule("AAPL", every=120, at=clock.now + 60)
+
+    scheduler.run_pending()
+
+    assert scheduler._queue[0][0] == clock.now + 120
+
+
+def test_recurring_schedule_joins_in_flight_job(clock):
+    release = threading.Event()
+    scheduler = RefreshScheduler(
+        lambda ticker, period: release.wait(1) and [], clock=clock
+    )
+    scheduler.schedule("AAPL")
+    worker = threading.Thread(target=scheduler.run_pending)
+    worker.start()
+    while scheduler.stats()["in_flight"] == 0:
+        pass
+
+    assert not scheduler.schedule("AAPL", every=120)
+    release.set()
+    worker.join()
+    assert scheduler._queue[0][0] == clock.now + 120
+
+
+def test_recurring_job_waits_for_market_open(scheduler, clock):
+    clock.now = ts(2024, 1, 12, 15, 59)  # Friday, just before the close
+    scheduler.schedule("AAPL", every=120)
+    scheduler.run_pending()
+    assert scheduler._queue[0][0] == ts(2024, 1, 12, 16, 1)
+
+    # The refresh after the close is the last one until Monday's open
+    clock.now = ts(2024, 1, 12, 16, 1)
+    assert scheduler.run_pending() == 1
+    assert scheduler._queue[0][0] == ts(2024, 1, 15, 9, 30)
+
+
+def test_failed_jobs_are_counted(scheduler, run_job):
+    run_job.side_effect = Exception("provider down")
+    scheduler.schedule("AAPL")
+
+    scheduler.run_pending()
+
+    assert scheduler.stats()["failed"] == 1
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from src.infrastructure.fetchers.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientFetcher,
+    RetryBudget,
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("time.sleep", return_value=None) as mock_sleep:
+        yield mock_sleep
+
+
+def test_retry_until_success(no_sleep):
+    func = MagicMock(side_effect=[ConnectionError("down"), "data"])
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0)
+
+    assert policy.call(func, "AAPL", period="1mo") == "data"
+    func.assert_called_with("AAPL", period="1mo")
+    assert no_sleep.call_count == 1
+
+
+def test_retry_gives_up_after_max_attempts():
+    func = MagicMock(side_effect=ConnectionError("down"))
+    policy = RetryPolicy(max_attempts=3)
+
+    with pytest.raises(ConnectionError):
+        policy.call(func)
+    assert func.call_count == 3
+
+
+def test_non_retryable_errors_are_raised_immediately():
+    func = MagicMock(side_effect=ValueError("bad data"))
+    policy = RetryPolicy(max_attempts=3, retry_on=(ConnectionError,))
+
+    with pytest.raises(ValueError):
+        policy.call(func)
+    assert func.call_count == 1
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    for attempt, cap in [(0, 1.0), (1, 2.0), (2, 4.0), (5, 5.0)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0, min_retries=1)
+    policy = RetryPolicy(max_attempts=5, budget=budget)
+    func = MagicMock(side_effect=ConnectionError("down"))
+
+    with pytest.raises(ConnectionError):
+        policy.call(func)
+    # One retry allowed by the budget, then the error is raised
+    assert func.call_count == 2
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    policy = RetryPolicy(max_attempts=1)
+    failing = MagicMock(side_effect=ConnectionError("down"))
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            policy.call(failing, circuit_breaker=breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # reset_timeout elapsed: one trial call closes the circuit again
+    assert policy.call(lambda: "data", circuit_breaker=breaker) == "data"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    func = MagicMock()
+
+    with pytest.raises(CircuitOpenError):
+        RetryPolicy().call(func, circuit_breaker=breaker)
+    func.assert_not_called()
+
+
+def test_circuit_breakers_are_shared_per_provider():
+    assert get_circuit_breaker("test-provider") is get_circuit_breaker("test-provider")
+    assert get_circuit_breaker("test-provider") is not get_circuit_breaker("other")
+
+
+def test_retry_budgets_are_shared_per_provider():
+    assert get_retry_budget("test-provider") is get_retry_budget("test-provider")
+    assert get_retry_budget("test-provider") is not get_retry_budget("other")
+
+
+def test_non_retryable_error_releases_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    policy = RetryPolicy(max_attempts=1, retry_on=(ConnectionError,))
+
+    with pytest.raises(ValueError):
+        policy.call(MagicMock(side_effect=ValueError("bad")), circuit_breaker=breaker)
+
+    # The trial slot is free again, so the next call is let through
+    assert policy.call(lambda: "data", circuit_breaker=breaker) == "data"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_async_trial_releases_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    policy = RetryPolicy(max_attempts=1)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(policy.call_async(cancelled, circuit_breaker=breaker))
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_call_async_retries():
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("down")
+        return "data"
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    assert asyncio.run(policy.call_async(fetch)) == "data"
+    assert len(attempts) == 2
+
+
+def test_resilient_fetcher_wraps_fetch():
+    fetcher = MagicMock()
+    fetcher.fetch.side_effect = [ConnectionError("down"), {"close": 152.0}]
+    resilient = ResilientFetcher(
+        fetcher, retry_policy=RetryPolicy(), circuit_breaker=CircuitBreaker()
+    )
+
+    assert resilient.fetch("AAPL", "1mo") == {"close": 152.0}
+    assert fetcher.fetch.call_count == 2
@@ -0,0 +1,181 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from src.infrastructure.db.engine import create_db_engine
+from src.infrastructure.db.session_manager import SessionManager
+
+metadata = MetaData()
+events = Table(
+    "events",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("source", String),
+)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+    metadata.create_all(engine)
+    yield SessionManager(engine)
+    engine.dispose()
+
+
+def count_events(manager):
+    with manager.session_scope() as session:
+        return session.execute(select(func.count()).select_from(events)).scalar()
+
+
+def test_session_per_thread(manager):
+    sessions = {}
+
+    def grab(name):
+        sessions[name] = (manager.session(), manager.session())
+        manager.remove()
+
+    threads = [threading.Thread(target=grab, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(first is second for first, second in sessions.values())
+    assert len({id(first) for first, _ in sessions.values()}) == 3
+
+
+def test_session_per_asyncio_task(manager):
+    async def grab():
+        session = manager.session()
+        await asyncio.sleep(0)
+        assert manager.session() is session
+        manager.remove()
+        return id(session)
+
+    async def main():
+        return await asyncio.gather(grab(), grab(), grab())
+
+    assert len(set(asyncio.run(main()))) == 3
+
+
+def test_task_session_closed_when_task_finishes(manager):
+    async def grab():
+        session = manager.session()
+        session.execute(select(func.count()).select_from(events))
+        return session
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+
+    # Task ids are reused, but a finished task's session is not
+    assert first is not second
+    assert not first.in_transaction()
+    assert manager._task_sessions == {}
+
+
+def test_thread_session_not_inherited(manager):
+    sessions = []
+
+    for _ in range(2):
+        # Thread idents are reused once a thread exits
+        thread = threading.Thread(target=lambda: sessions.append(manager.session()))
+        thread.start()
+        thread.join()
+
+    first, second = sessions
+    assert first is not second
+
+
+def test_session_scope_commits_and_releases(manager):
+    with manager.session_scope() as session:
+        session.execute(events.insert().values(source="test"))
+        with manager.session_scope() as nested:
+            assert nested is session
+
+    assert not manager.registry.registry.has()
+    assert count_events(manager) == 1
+
+
+def test_session_scope_after_plain_session_commits(manager):
+    # Container.session hands out the scope's session without opening a scope
+    plain = manager.session()
+
+    with manager.session_scope() as session:
+        assert session is plain
+        session.execute(events.insert().values(source="test"))
+
+    assert not manager.registry.registry.has()
+    assert count_events(manager) == 1
+
+
+def test_nested_scope_does_not_commit(manager):
+    with pytest.raises(RuntimeError):
+        with manager.session_scope():
+            with manager.session_scope() as nested:
+                nested.execute(events.insert().values(source="test"))
+            assert manager.registry.registry.has()
+            raise RuntimeError("boom")
+
+    assert count_events(manager) == 0
+    assert manager._depths == {}
+
+
+def test_session_scope_rolls_back(manager):
+    with pytest.raises(RuntimeError):
+        with manager.session_scope() as session:
+            session.execute(events.insert().values(source="test"))
+            raise RuntimeError("boom")
+
+    assert count_events(manager) == 0
+
+
+def test_parallel_writers(manager):
+    def write(worker):
+        for _ in range(25):
+            with manager.session_scope() as session:
+                session.execute(events.insert().values(source=f"w{worker}"))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(8)))
+
+    assert count_events(manager) == 200
+
+
+def test_file_sqlite_engine_uses_pool_settings(manager):
+    assert manager.engine.pool.size() == 5
+
+
+def test_after_fork_drops_inherited_connections():
+    engine = MagicMock()
+    manager = SessionManager(engine)
+    registry = manager.registry
+
+    manager.after_fork()
+
+    engine.dispose.assert_called_once_with(close=False)
+    assert manager.registry is not registry
+
+
+def _write_in_child(manager, queue):
+    with manager.session_scope() as session:
+        session.execute(events.insert().values(source=f"pid{os.getpid()}"))
+    queue.put("ok")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_worker_can_write(manager):
+    # Check a connection out in the parent so the child inherits a pool
+    assert count_events(manager) == 0
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    process = context.Process(target=_write_in_child, args=(manager, queue))
+    process.start()
+    process.join(timeout=30)
+
+    assert queue.get(timeout=5) == "ok"
+    assert count_events(manager) == 1
@@ -0,0 +1,143 @@
+import configparser
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.stock import Stock
+from src.infrastructure.db.stock_price_partitions import (
+    StockPricePartitions,
+    configured_partitions,
+)
+from src.infrastructure.db.stock_price_writer import StockPrice, StockPriceWriter
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture
+def partitions(engine):
+    return StockPricePartitions(engine)
+
+
+def bar(date, close, ticker="AAPL"):
+    return {"ticker": ticker, "date": date, "close": close, "volume": 100}
+
+
+def test_write_routes_bars_to_year_tables(engine, partitions):
+    written = partitions.write(
+        [
+            bar(datetime(2023, 12, 29, 15, 59), 190.0),
+            bar(datetime(2024, 1, 2, 9, 30), 185.0),
+            bar(datetime(2024, 1, 2, 9, 30), 186.0),
+        ]
+    )
+
+    assert written == 2
+    assert partitions.years() == [2023, 2024]
+    assert {"stock_prices_2023", "stock_prices_2024"} <= set(
+        inspect(engine).get_table_names()
+    )
+
+
+def test_query_range_reads_only_matching_years(partitions, mocker):
+    partitions.write(
+        [bar(datetime(year, 6, 1), float(year)) for year in (2021, 2022, 2023)]
+        + [bar(datetime(2022, 7, 1), 1.0, ticker="MSFT")]
+    )
+    table = mocker.spy(partitions, "table")
+
+    rows = partitions.query_range(
+        "AAPL", datetime(2022, 1, 1), datetime(2023, 12, 31), columns=["close"]
+    )
+
+    assert [(row["date"].year, row["close"]) for row in rows] == [
+        (2022, 2022.0),
+        (2023, 2023.0),
+    ]
+    assert [call.args[0] for call in table.call_args_list] == [2022, 2023]
+
+
+def test_existing_partitions_are_discovered(engine, partitions):
+    partitions.write([bar(datetime(2020, 3, 2), 1.0)])
+
+    assert StockPricePartitions(engine).years() == [2020]
+    assert (
+        StockPricePartitions(engine).query_range(
+            "AAPL", datetime(2020, 1, 1), datetime(2020, 12, 31)
+        )[0]["close"]
+        == 1.0
+    )
+
+
+def test_writer_uses_partitions(engine, partitions):
+    StockPrice.metadata.create_all(engine)
+    writer = StockPriceWriter(partitions=partitions)
+
+    assert writer.write([bar(datetime(2024, 1, 2, 9, 30), 185.0)]) == 1
+    assert partitions.years() == [2024]
+
+
+def test_repository_reads_hourly_bars_from_partitions(engine, partitions):
+    Stock.metadata.create_all(engine)
+    StockPrice.metadata.create_all(engine)
+    start = datetime(2023, 12, 31, 23, 0)
+    partitions.write(
+        [
+            dict(bar(start + timedelta(minutes=30 * i), 10.0 + i), open=1.0)
+            for i in range(4)
+        ]
+    )
+    repo = StockRepositoryImpl(sessionmaker(bind=engine)(), partitions=partitions)
+
+    hours = repo.get_stock_data("AAPL", start, start + timedelta(hours=2), "hourly")
+
+    # The buckets on either side of the new year come from different tables
+    assert [hour.date for hour in hours] == [
+        datetime(2023, 12, 31, 23, 0),
+        datetime(2024, 1, 1, 0, 0),
+    ]
+    assert [hour.close for hour in hours] == [11.0, 13.0]
+
+
+def test_partitioning_is_off_by_default(engine, monkeypatch):
+    monkeypatch.delenv("PARTITION_STOCK_PRICES", raising=False)
+    config = configparser.ConfigParser()
+
+    assert configured_partitions(engine, config=config) is None
+
+    config.read_dict({"DATABASE": {"partition_stock_prices": "true"}})
+    assert isinstance(
+        configured_partitions(engine, config=config), StockPricePartitions
+    )
+
+
+def test_ticker_date_indexes_cover_selected_columns(partitions):
+    engine = create_engine("sqlite://")
+    StockPrice.metadata.create_all(engine)
+    inspector = inspect(engine)
+
+    expected = {
+        "stock_prices": ["open", "high", "low", "close", "adjusted_close", "volume"],
+        "fundamentals": [
+            "pe_ratio",
+            "eps",
+            "market_cap",
+            "revenue",
+            "net_income",
+            "total_assets",
+        ],
+        "sentiment_analysis": ["sentiment_score"],
+    }
+    for table, columns in expected.items():
+        indexes = {
+            index["name"]: index["column_names"]
+            for index in inspector.get_indexes(table)
+        }
+        assert indexes[f"ix_{table}_ticker_date"] == ["ticker", "date", *columns]
+
+    partitions.write([bar(datetime(2024, 1, 2), 1.0)])
+    (index,) = inspect(partitions.engine).get_indexes("stock_prices_2024")
+    assert index["column_names"] == ["ticker", "date", *expected["stock_prices"]]
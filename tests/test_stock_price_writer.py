@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.db.stock_price_writer import StockPrice, StockPriceWriter
+from src.infrastructure.db.upsert import chunk_rows, upsert_statement
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:")
+    StockPrice.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def bar(minute, close, volume=100):
+    return {
+        "ticker": "AAPL",
+        "date": datetime(2024, 1, 10, 9, 30 + minute),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": volume,
+    }
+
+
+def stored(session_factory):
+    session = session_factory()
+    try:
+        return [
+            (row.date, row.close, row.volume)
+            for row in session.query(StockPrice).order_by(StockPrice.date)
+        ]
+    finally:
+        session.close()
+
+
+def test_write_inserts_intraday_bars(session_factory):
+    writer = StockPriceWriter(session_factory)
+
+    assert writer.write([bar(0, 10.0), bar(1, 11.0)]) == 2
+    assert stored(session_factory) == [
+        (datetime(2024, 1, 10, 9, 30), 10.0, 100),
+        (datetime(2024, 1, 10, 9, 31), 11.0, 100),
+    ]
+
+
+def test_write_overwrites_existing_bar(session_factory):
+    writer = StockPriceWriter(session_factory)
+    writer.write([bar(0, 10.0)])
+
+    writer.write([bar(0, 10.5, volume=250)])
+
+    assert stored(session_factory) == [(datetime(2024, 1, 10, 9, 30), 10.5, 250)]
+
+
+def test_write_keeps_last_duplicate_in_batch(session_factory):
+    writer = StockPriceWriter(session_factory, batch_size=1)
+
+    assert writer.write([bar(0, 10.0), bar(0, 12.0), bar(1, 11.0)]) == 2
+    assert [close for _, close, _ in stored(session_factory)] == [12.0, 11.0]
+
+
+def test_write_empty_batch(session_factory):
+    assert StockPriceWriter(session_factory).write([]) == 0
+
+
+def test_upsert_statement_rejects_unknown_dialect():
+    with pytest.raises(ValueError):
+        upsert_statement("mysql", StockPrice.__table__, [{}], ["ticker"], [])
+
+
+def test_chunk_rows_respects_parameter_limit():
+    rows = [{"a": i, "b": i} for i in range(40000)]
+
+    chunks = list(chunk_rows(rows, 50000))
+
+    assert [len(chunk) for chunk in chunks] == [15000, 15000, 10000]
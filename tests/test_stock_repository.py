@@ -24,6 +24,9 @@ class ConcreteStockRepository(StockRepository):
     def save(self, stock):
         pass
 
+    def save_many(self, bars) -> int:
+        pass
+
     def get_stock_data(
         self,
         ticker: str,
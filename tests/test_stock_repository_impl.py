@@ -1,8 +1,17 @@
 import pytest
 from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from src.infrastructure.db.unit_of_work import UnitOfWork
+from src.domain.models.security import (
+    DailyBar,
+    Security,
+    epoch_day,
+    from_epoch_day,
+)
 from src.domain.models.stock import Stock
-from datetime import datetime
+from datetime import date, datetime
 
 
 @pytest.fixture
@@ -17,138 +26,165 @@ def stock_repo(db_session):
     return StockRepositoryImpl(db_session)
 
 
-def test_create_stock(stock_repo, db_session):
-    stock = Stock(
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite:///:memory:")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def sqlite_repo(sqlite_session):
+    return StockRepositoryImpl(sqlite_session)
+
+
+def apple(close=150.0, day=datetime(2023, 1, 1)):
+    return Stock(
         ticker="AAPL",
         name="Apple",
         industry="Technology",
         sector="Consumer Electronics",
-        close=150.0,
-        date="2023-01-01",
+        close=close,
+        date=day,
     )
-    stock_repo.create_stock(stock)
-    db_session.add.assert_called_once_with(stock)
-    db_session.commit.assert_called_once()
 
 
-def test_get_stock(stock_repo, db_session):
-    mock_stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=145.0,
-        date="2023-01-01",
+def bar(day, close, ticker="AAPL"):
+    return {
+        "ticker": ticker,
+        "date": datetime(2023, 9, day),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": 1000.0,
+    }
+
+
+def test_epoch_day_round_trip():
+    assert epoch_day(date(1970, 1, 2)) == 1
+    assert epoch_day(datetime(2024, 1, 2, 15, 30)) == 19724
+    assert from_epoch_day(19724) == datetime(2024, 1, 2)
+
+
+def test_create_stock(sqlite_repo, sqlite_session):
+    sqlite_repo.create_stock(apple())
+
+    (security,) = sqlite_session.query(Security).all()
+    assert (security.ticker, security.name) == ("AAPL", "Apple")
+    (fact,) = sqlite_session.query(DailyBar).all()
+    assert (fact.security_id, fact.day, fact.close) == (
+        security.security_id,
+        epoch_day(datetime(2023, 1, 1)),
+        150.0,
     )
-    db_session.query().filter_by().first.return_value = mock_stock
-    stock = stock_repo.get("AAPL")
-    assert stock == mock_stock
+    # Committed by the repository's own unit of work
+    assert sqlite_repo.unit_of_work.commits == 1
+
+
+def test_get_stock(sqlite_repo):
+    sqlite_repo.create_stock(apple(145.0))
+    sqlite_repo.create_stock(apple(146.0, datetime(2023, 1, 2)))
+
+    stock = sqlite_repo.get("AAPL")
 
+    assert (stock.date, stock.close) == (datetime(2023, 1, 2), 146.0)
+    assert (stock.name, stock.sector) == ("Apple", "Consumer Electronics")
 
-def test_get_non_existent_stock(stock_repo, db_session):
-    db_session.query().filter_by().first.return_value = None
-    stock = stock_repo.get("NON_EXISTENT")
+
+def test_get_non_existent_stock(sqlite_repo):
+    stock = sqlite_repo.get("NON_EXISTENT")
     assert stock is None
 
 
-def test_update_stock(stock_repo, db_session):
-    stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=150.0,
-        date="2023-01-01",
-    )
-    db_session.query().filter_by().first.return_value = stock
-    stock_repo.update(stock)
-    db_session.merge.assert_called_once_with(stock)
-    db_session.commit.assert_called_once()
+def test_update_stock(sqlite_repo, sqlite_session):
+    sqlite_repo.create_stock(apple())
 
+    stored = sqlite_repo.get("AAPL")
+    stored.close = 155.0
+    stored.name = "Apple Inc."
+    assert sqlite_repo.update(stored) is stored
+
+    latest = sqlite_repo.get("AAPL")
+    assert (latest.close, latest.name) == (155.0, "Apple Inc.")
+    assert sqlite_session.query(DailyBar).count() == 1
+
+
+def test_update_unknown_stock(sqlite_repo, sqlite_session):
+    assert sqlite_repo.update(apple()) is None
+    assert sqlite_session.query(Security).count() == 0
+
+
+def test_delete_stock(sqlite_repo, sqlite_session):
+    sqlite_repo.save_many([bar(1, 150.0), bar(2, 152.0), bar(1, 300.0, "MSFT")])
+
+    result = sqlite_repo.delete_stock("AAPL")
 
-def test_delete_stock(stock_repo, db_session):
-    mock_stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=145.0,
-        date="2023-01-01",
-    )
-    db_session.query().filter_by.return_value.first.return_value = mock_stock
-    result = stock_repo.delete_stock("AAPL")
     assert result is True
-    db_session.delete.assert_called_once_with(mock_stock)
-    db_session.commit.assert_called_once()
+    assert sqlite_repo.get("AAPL") is None
+    assert sqlite_session.query(DailyBar).count() == 1
+    assert sqlite_repo.unit_of_work.commits == 2
 
 
-def test_delete_non_existent_stock(stock_repo, db_session):
-    db_session.query().filter_by.return_value.first.return_value = None
-    result = stock_repo.delete_stock("NON_EXISTENT")
+def test_delete_non_existent_stock(sqlite_repo, sqlite_session):
+    result = sqlite_repo.delete_stock("NON_EXISTENT")
     assert result is False
-    db_session.delete.assert_not_called()
-    db_session.commit.assert_not_called()
 
 
-def test_get_stock_data(stock_repo, db_session):
-    mock_stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=150.0,
-        date="2023-01-01",
-    )
-    db_session.query.return_value.filter.return_value.all.return_value = [mock_stock]
-    result = stock_repo.get_stock_data(
+def test_get_stock_data(sqlite_repo):
+    sqlite_repo.create_stock(apple())
+    sqlite_repo.save_many([bar(1, 160.0)])
+
+    result = sqlite_repo.get_stock_data(
         "AAPL", datetime(2022, 1, 1), datetime(2023, 1, 1), "daily"
     )
-    assert result == [mock_stock]
 
+    assert [(stock.date, stock.close, stock.name) for stock in result] == [
+        (datetime(2023, 1, 1), 150.0, "Apple")
+    ]
+
+
+def test_get_stock_data_compares_start_with_bar_dates(sqlite_repo):
+    sqlite_repo.save_many([bar(1, 150.0), bar(2, 152.0)])
+
+    result = sqlite_repo.get_stock_data(
+        "AAPL", datetime(2023, 9, 1, 12), datetime(2023, 9, 2)
+    )
+
+    assert [stock.date.day for stock in result] == [2]
 
-def test_stock_exists(stock_repo, db_session):
-    # Properly mock scalar() to return True
-    db_session.query.return_value.filter.return_value.exists.return_value = True
-    db_session.query.return_value.scalar.return_value = True
 
-    result = stock_repo.stock_exists("AAPL", "1y")
+def test_stock_exists(sqlite_repo):
+    sqlite_repo.create_stock(apple(day=datetime.now()))
+
+    result = sqlite_repo.stock_exists("AAPL", "1y")
     assert result is True
 
 
-def test_stock_does_not_exist(stock_repo, db_session):
-    # Properly mock scalar() to return False
-    db_session.query.return_value.filter.return_value.exists.return_value = False
-    db_session.query.return_value.scalar.return_value = False
+def test_stock_does_not_exist(sqlite_repo):
+    sqlite_repo.create_stock(apple(day=datetime(2000, 1, 1)))
 
-    result = stock_repo.stock_exists("AAPL", "1y")
+    result = sqlite_repo.stock_exists("AAPL", "1y")
     assert result is False
 
 
-def test_get_sample_stock_data(stock_repo, db_session):
-    mock_stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=150.0,
-        date="2023-01-01",
-    )
-    db_session.query().filter_by().limit().all.return_value = [mock_stock]
-    result = stock_repo.get_sample_stock_data("AAPL")
-    assert result == [mock_stock]
+def test_get_sample_stock_data(sqlite_repo):
+    sqlite_repo.save_many([bar(day, 100.0 + day) for day in range(1, 8)])
 
+    result = sqlite_repo.get_sample_stock_data("AAPL")
 
-def test_add_stock(stock_repo, db_session):
-    mock_stock = Stock(
-        ticker="AAPL",
-        name="Apple",
-        industry="Technology",
-        sector="Consumer Electronics",
-        close=150.0,
-        date="2023-01-01",
-    )
-    stock_repo.add_stock(mock_stock)
-    db_session.add.assert_called_once_with(mock_stock)
+    assert [stock.close for stock in result] == [101.0, 102.0, 103.0, 104.0, 105.0]
+
+
+def test_add_stock(sqlite_session):
+    stock_repo = StockRepositoryImpl(sqlite_session, unit_of_work=MagicMock())
+
+    stock_repo.add_stock(apple())
+
+    stock_repo.unit_of_work.record_write.assert_called_once()
+    assert sqlite_session.query(DailyBar).count() == 1
 
 
 def test_commit(stock_repo, db_session):
@@ -162,3 +198,99 @@ def test_get_date_range_for_period(stock_repo):
 
     with pytest.raises(ValueError):
         stock_repo.get_date_range_for_period("invalid_period")
+
+
+def test_get_latest_date(sqlite_repo):
+    sqlite_repo.save_many([bar(1, 150.0), bar(4, 152.0)])
+
+    assert sqlite_repo.get_latest_date("AAPL") == datetime(2023, 9, 4)
+    assert sqlite_repo.get_latest_date("MSFT") is None
+
+
+def test_save_many_inserts_in_batches(sqlite_session):
+    stock_repo = StockRepositoryImpl(sqlite_session, batch_size=2)
+
+    assert stock_repo.save_many([bar(day, 100.0 + day) for day in range(1, 6)]) == 5
+    stored = stock_repo.get_stock_data(
+        "AAPL", datetime(2023, 9, 1), datetime(2023, 9, 30)
+    )
+    assert [stock.close for stock in stored] == [101.0, 102.0, 103.0, 104.0, 105.0]
+
+
+def test_save_many_updates_existing_bars(sqlite_repo):
+    sqlite_repo.create_stock(apple(1, datetime(2023, 9, 1)))
+
+    sqlite_repo.save_many([bar(1, 150.0), bar(1, 151.0), bar(2, 152.0)])
+
+    stored = sqlite_repo.get_stock_data(
+        "AAPL", datetime(2023, 9, 1), datetime(2023, 9, 30)
+    )
+    assert [(stock.date.day, stock.close) for stock in stored] == [
+        (1, 151.0),
+        (2, 152.0),
+    ]
+    # Descriptive columns are not overwritten by price updates
+    assert stored[0].name == "Apple"
+
+
+def test_save_many_stores_bars_once_per_security(sqlite_repo, sqlite_session):
+    sqlite_repo.save_many([bar(2, 185.0), bar(2, 370.0, "MSFT")])
+
+    securities = sqlite_session.query(Security).order_by(Security.security_id).all()
+    assert [security.ticker for security in securities] == ["AAPL", "MSFT"]
+    facts = sqlite_session.query(DailyBar).order_by(DailyBar.security_id).all()
+    assert [(fact.security_id, fact.day) for fact in facts] == [
+        (securities[0].security_id, epoch_day(datetime(2023, 9, 2))),
+        (securities[1].security_id, epoch_day(datetime(2023, 9, 2))),
+    ]
+
+
+def test_save_many_leaves_commit_to_unit_of_work(sqlite_session):
+    unit_of_work = UnitOfWork(sqlite_session, batch_size=5)
+    stock_repo = StockRepositoryImpl(sqlite_session, unit_of_work=unit_of_work)
+
+    stock_repo.save_many([bar(1, 150.0), bar(2, 152.0)])
+    assert (unit_of_work.commits, unit_of_work.pending) == (0, 2)
+
+    stock_repo.save_many([bar(day, 100.0 + day) for day in range(3, 6)])
+    assert (unit_of_work.commits, unit_of_work.pending) == (1, 0)
+
+    stock_repo.save_many([bar(6, 160.0)])
+    unit_of_work.close()
+    assert unit_of_work.commits == 2
+
+
+def test_save_many_empty(stock_repo, db_session):
+    assert stock_repo.save_many([]) == 0
+    db_session.execute.assert_not_called()
+    db_session.commit.assert_not_called()
+
+
+def test_save_many_rolls_back_on_error(stock_repo, db_session):
+    db_session.get_bind.return_value.dialect.name = "sqlite"
+    db_session.execute.side_effect = RuntimeError("disk I/O error")
+
+    with pytest.raises(RuntimeError):
+        stock_repo.save_many([bar(1, 150.0)])
+    db_session.rollback.assert_called_once()
+
+
+def test_save_many_rolls_back_new_securities(sqlite_session, monkeypatch):
+    stock_repo = StockRepositoryImpl(sqlite_session)
+
+    def fail(*args):
+        raise RuntimeError("disk I/O error")
+
+    # Fails after the security and bars were written in the transaction
+    monkeypatch.setattr(stock_repo, "_refresh_rollups", fail)
+    with pytest.raises(RuntimeError):
+        stock_repo.save_many([bar(1, 150.0)])
+
+    assert sqlite_session.query(DailyBar).count() == 0
+    assert sqlite_session.query(Security).count() == 0
+
+
+def test_tickers(sqlite_repo):
+    sqlite_repo.save_many([bar(1, 300.0, "MSFT"), bar(1, 150.0)])
+
+    assert sqlite_repo.tickers() == ["AAPL", "MSFT"]
@@ -0,0 +1,272 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.domain.models.security import DailyBar, Security, epoch_day
+from src.domain.models.stock import Stock
+from src.domain.models.stock_rollup import StockRollup
+from src.infrastructure.db.aggregation import bucket_start, next_bucket_start
+from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
+from src.infrastructure.db.unit_of_work import UnitOfWork
+
+
+def bar(when, close, ticker="AAPL"):
+    return {
+        "ticker": ticker,
+        "date": when,
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 10.0,
+    }
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def repo(session):
+    start = datetime(2024, 1, 1)
+    repo = StockRepositoryImpl(session)
+    repo.save_many([bar(start + timedelta(days=i), 100.0 + i) for i in range(60)])
+    return repo
+
+
+def rollups(session, granularity):
+    return (
+        session.query(StockRollup)
+        .filter(StockRollup.granularity == granularity)
+        .order_by(StockRollup.date)
+        .all()
+    )
+
+
+def test_bucket_boundaries():
+    when = datetime(2024, 12, 19, 15, 45)
+
+    assert bucket_start("hourly", when) == datetime(2024, 12, 19, 15)
+    assert bucket_start("weekly", when) == datetime(2024, 12, 16)
+    assert bucket_start("monthly", when) == datetime(2024, 12, 1)
+    assert next_bucket_start("monthly", when) == datetime(2025, 1, 1)
+    assert next_bucket_start("weekly", when) == datetime(2024, 12, 23)
+
+
+def test_save_many_maintains_rollups(session, repo):
+    months = rollups(session, "monthly")
+
+    assert [month.date for month in months] == [
+        datetime(2024, 1, 1),
+        datetime(2024, 2, 1),
+    ]
+    assert (months[0].open, months[0].close, months[0].volume) == (100.0, 130.0, 310)
+    assert len(rollups(session, "weekly")) == 9
+
+
+def test_new_bars_only_touch_their_buckets(session, repo):
+    january = rollups(session, "monthly")[0]
+    session.query(StockRollup).filter(StockRollup.date == january.date).update(
+        {"volume": -1.0}
+    )
+    session.commit()
+
+    repo.save_many([bar(datetime(2024, 2, 10), 500.0)])
+
+    months = rollups(session, "monthly")
+    # January was not recomputed; February picked up the new high
+    assert months[0].volume == -1.0
+    assert months[1].high == 501.0
+
+
+def test_coarse_reads_use_rollups(session, repo):
+    session.query(StockRollup).filter(StockRollup.granularity == "weekly").update(
+        {"close": 0.0}
+    )
+    session.commit()
+
+    weeks = repo.get_stock_data(
+        "AAPL",
+        datetime(2024, 1, 8),
+        datetime(2024, 1, 29) - timedelta(microseconds=1),
+        "weekly",
+    )
+
+    assert [week.date for week in weeks] == [
+        datetime(2024, 1, 8),
+        datetime(2024, 1, 15),
+        datetime(2024, 1, 22),
+    ]
+    assert {week.close for week in weeks} == {0.0}
+
+
+def ohlcv(stocks):
+    return [
+        (stock.date, stock.open, stock.high, stock.low, stock.close, stock.volume)
+        for stock in stocks
+    ]
+
+
+@pytest.mark.parametrize(
+    "start, end, granularity",
+    [
+        (datetime(2024, 1, 3), datetime(2024, 1, 9), "weekly"),
+        (datetime(2024, 1, 3), datetime(2024, 1, 31), "weekly"),
+        (datetime(2024, 1, 1), datetime(2024, 2, 29, 23, 59), "weekly"),
+        (datetime(2024, 1, 10), datetime(2024, 2, 20), "monthly"),
+        (datetime(2024, 1, 1), datetime(2024, 2, 29, 23, 59), "monthly"),
+    ],
+)
+def test_rollup_reads_match_live_aggregation(session, repo, start, end, granularity):
+    live = StockRepositoryImpl(session, rollups=False)
+
+    expected = ohlcv(live.get_stock_data("AAPL", start, end, granularity))
+
+    assert ohlcv(repo.get_stock_data("AAPL", start, end, granularity)) == expected
+
+
+@pytest.mark.parametrize("granularity", ["weekly", "monthly"])
+def test_rollup_reads_accept_dates_and_strings(repo, granularity):
+    expected = ohlcv(
+        repo.get_stock_data(
+            "AAPL", datetime(2024, 1, 3), datetime(2024, 2, 20), granularity
+        )
+    )
+
+    by_date = repo.get_stock_data(
+        "AAPL", date(2024, 1, 3), date(2024, 2, 20), granularity
+    )
+    by_string = repo.get_stock_data("AAPL", "2024-01-03", "2024-02-20", granularity)
+
+    assert ohlcv(by_date) == expected
+    assert ohlcv(by_string) == expected
+
+
+def test_save_many_refreshes_every_ticker_written(session, repo):
+    repo.save_many(
+        [bar(datetime(2024, 2, 12), 1.0, "MSFT"), bar(datetime(2024, 2, 12), 500.0)]
+    )
+
+    february = {
+        rollup.ticker: rollup
+        for rollup in rollups(session, "monthly")
+        if rollup.date == datetime(2024, 2, 1)
+    }
+    assert february["MSFT"].close == 1.0
+    assert february["AAPL"].high == 501.0
+    assert len(rollups(session, "monthly")) == 3
+
+
+def test_partial_edge_buckets_only_cover_the_range(repo):
+    (week,) = repo.get_stock_data(
+        "AAPL", datetime(2024, 1, 3), datetime(2024, 1, 7), "weekly"
+    )
+
+    # Jan 1 and 2 belong to the week but fall outside the range
+    assert (week.date, week.open, week.close, week.volume) == (
+        datetime(2024, 1, 1),
+        102.0,
+        106.0,
+        50,
+    )
+
+
+def test_delete_stock_removes_its_rollups(session, repo):
+    repo.save_many([bar(datetime(2024, 1, 1), 1.0, "MSFT")])
+
+    repo.delete_stock("AAPL")
+
+    assert [(rollup.ticker, rollup.date) for rollup in rollups(session, "monthly")] == [
+        ("MSFT", datetime(2024, 1, 1))
+    ]
+
+
+def test_single_stock_writes_refresh_rollups(session):
+    repo = StockRepositoryImpl(session)
+    march = (datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+    repo.save(Stock("MSFT", "Microsoft", None, None, datetime(2024, 3, 5), 1, 2, 0, 1))
+    stored = repo.get("MSFT")
+    stored.close = 3.0
+    repo.update(stored)
+
+    months = repo.get_stock_data("MSFT", *march, "monthly")
+    assert [(month.date, month.name, month.close) for month in months] == [
+        (datetime(2024, 3, 1), "Microsoft", 3.0)
+    ]
+    assert [rollup.close for rollup in rollups(session, "monthly")] == [3.0]
+
+    repo.delete_stock("MSFT")
+    assert rollups(session, "monthly") == []
+
+
+def test_update_on_a_new_day_adds_its_bucket(session):
+    repo = StockRepositoryImpl(session)
+    repo.save(Stock("MSFT", "Microsoft", None, None, datetime(2024, 3, 5), 1, 2, 0, 1))
+
+    stored = repo.get("MSFT")
+    stored.date = datetime(2024, 4, 5)
+    repo.update(stored)
+
+    # A bar is keyed by its day, so the March bar is kept
+    assert [rollup.date for rollup in rollups(session, "monthly")] == [
+        datetime(2024, 3, 1),
+        datetime(2024, 4, 1),
+    ]
+
+
+def test_single_stock_writes_follow_a_batched_unit_of_work(session):
+    unit_of_work = UnitOfWork(session, batch_size=None)
+    repo = StockRepositoryImpl(session, unit_of_work=unit_of_work)
+
+    repo.create_stock(
+        Stock("MSFT", "Microsoft", None, None, datetime(2024, 3, 5), 1, 2, 0, 1)
+    )
+    assert unit_of_work.commits == 0
+    unit_of_work.rollback()
+
+    assert session.query(DailyBar).count() == 0
+    assert rollups(session, "monthly") == []
+
+
+def test_rebuild_rollups_covers_rows_written_around_the_repository(session):
+    security = Security(ticker="MSFT", name="Microsoft")
+    session.add(security)
+    session.flush()
+    prices = bar(datetime(2024, 3, 5), 1.0)
+    del prices["ticker"], prices["date"]
+    session.add(
+        DailyBar(
+            security_id=security.security_id,
+            day=epoch_day(datetime(2024, 3, 5)),
+            **prices,
+        )
+    )
+    session.commit()
+    repo = StockRepositoryImpl(session)
+
+    assert repo.rebuild_rollups() == 1
+
+    months = repo.get_stock_data(
+        "MSFT", datetime(2024, 3, 1), datetime(2024, 3, 31, 23, 59), "monthly"
+    )
+    assert [(month.date, month.name, month.close) for month in months] == [
+        (datetime(2024, 3, 1), "Microsoft", 1.0)
+    ]
+    assert len(rollups(session, "monthly")) == 1
+
+
+def test_rollups_can_be_disabled(session):
+    repo = StockRepositoryImpl(session, rollups=False)
+    repo.save_many([bar(datetime(2024, 1, 1), 1.0)])
+
+    assert rollups(session, "monthly") == []
+    months = repo.get_stock_data(
+        "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31), "monthly"
+    )
+    assert len(months) == 1
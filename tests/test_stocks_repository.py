@@ -1,6 +1,8 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from src.infrastructure.db.stock_repository import StockRepository
 from requests.exceptions import RequestException
 from src.infrastructure.db.stock_repository_impl import StockRepositoryImpl
@@ -61,27 +63,55 @@ def test_get_stock_data_connection_error(mock_ticker):
     assert stock_data is None
 
 
+@patch("yfinance.Ticker")
+def test_get_stock_data_shares_the_provider_retry_budget(mock_ticker):
+    mock_ticker.return_value.history.return_value = pd.DataFrame()
+    budget = MagicMock()
+
+    with patch(
+        "src.infrastructure.db.stock_repository.get_retry_budget",
+        return_value=budget,
+    ) as get_budget:
+        StockRepository().get_stock_data("AAPL", "1mo")
+        StockRepository().get_stock_data("MSFT", "1mo")
+
+    # Every call counts against one budget for the provider
+    assert get_budget.call_args_list == [(("yahoo",),), (("yahoo",),)]
+    assert budget.record_call.call_count == 2
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite://")
+    Stock.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
 # Test for creating stock in the database
-def test_create_stock_db_interaction(mock_db_session):
-    repo = StockRepositoryImpl(mock_db_session)  # Pass the mock session
+def test_create_stock_db_interaction(sqlite_session):
+    repo = StockRepositoryImpl(sqlite_session)
     stock = Stock(
-        "AAPL", "Apple Inc.", "Technology", "Consumer Electronics", 150.0, "2023-09-01"
+        "AAPL",
+        "Apple Inc.",
+        "Technology",
+        "Consumer Electronics",
+        "2023-09-01",
+        close=150.0,
     )
 
     repo.create_stock(stock)
 
-    mock_db_session.add.assert_called_once_with(stock)
-    mock_db_session.commit.assert_called_once()
+    assert repo.unit_of_work.commits == 1
+    stored = repo.get("AAPL")
+    assert (stored.name, stored.close) == ("Apple Inc.", 150.0)
 
 
 # Test for deleting stock when stock is not found in the database
-def test_delete_stock_not_found_db(mock_db_session):
-    mock_db_session.query.return_value.filter_by.return_value.first.return_value = (
-        None  # Stock not found
-    )
-
-    repo = StockRepositoryImpl(mock_db_session)  # Pass the mock session
+def test_delete_stock_not_found_db(sqlite_session):
+    repo = StockRepositoryImpl(sqlite_session)
     result = repo.delete_stock("AAPL")
 
     assert result is False
-    mock_db_session.delete.assert_not_called()
+    assert repo.unit_of_work.commits == 0
@@ -0,0 +1,168 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.application.streaming_ingestion import (
+    IntradayPoller,
+    MicroBatchWriter,
+    StreamingIngestion,
+)
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.batches = []
+
+    def write(self, bars):
+        self.batches.append(list(bars))
+        return len(bars)
+
+
+def frame(closes, start="2024-01-10 09:30", tz="America/New_York"):
+    dates = pd.date_range(start, periods=len(closes), freq="min", tz=tz)
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": closes,
+            "high": closes,
+            "low": closes,
+            "close": closes,
+            "volume": [100] * len(closes),
+        }
+    )
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        MicroBatchWriter(RecordingWriter(), policy="spill")
+
+
+def test_micro_batches_by_size():
+    writer = RecordingWriter()
+    batch_writer = MicroBatchWriter(writer, batch_size=2, max_latency=5.0)
+    for i in range(5):
+        batch_writer.submit({"i": i})
+
+    batch_writer.start()
+    batch_writer.stop()
+
+    assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+    assert batch_writer.stats()["written"] == 5
+
+
+def test_micro_batch_flushes_after_max_latency():
+    writer = RecordingWriter()
+    batch_writer = MicroBatchWriter(writer, batch_size=100, max_latency=0.05)
+    batch_writer.start()
+    batch_writer.submit({"i": 1})
+
+    deadline = time.monotonic() + 2
+    while not writer.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    batch_writer.stop()
+
+    assert writer.batches == [[{"i": 1}]]
+
+
+def test_drop_newest_when_full():
+    batch_writer = MicroBatchWriter(
+        RecordingWriter(), max_queue=2, policy="drop_newest"
+    )
+
+    results = [batch_writer.submit({"i": i}) for i in range(3)]
+
+    assert results == [True, True, False]
+    assert batch_writer.stats()["dropped"] == 1
+    assert batch_writer.stats()["queued"] == 2
+
+
+def test_drop_oldest_when_full():
+    writer = RecordingWriter()
+    batch_writer = MicroBatchWriter(writer, max_queue=2, policy="drop_oldest")
+    for i in range(3):
+        assert batch_writer.submit({"i": i})
+
+    batch_writer.start()
+    batch_writer.stop()
+
+    assert writer.batches == [[{"i": 1}, {"i": 2}]]
+    assert batch_writer.stats()["dropped"] == 1
+
+
+def test_failed_batches_are_counted():
+    writer = MagicMock()
+    writer.write.side_effect = RuntimeError("database is locked")
+    batch_writer = MicroBatchWriter(writer)
+    batch_writer.submit({"i": 1})
+
+    batch_writer.start()
+    batch_writer.stop()
+
+    assert batch_writer.stats()["failed"] == 1
+    assert batch_writer.stats()["written"] == 0
+
+
+def test_poller_emits_new_and_changed_bars():
+    fetcher = MagicMock()
+    fetcher.fetch.return_value = frame([10.0, 11.0])
+    poller = IntradayPoller(fetcher, ["AAPL"], interval="1m")
+
+    first = poller.poll_once()
+    assert [bar["close"] for bar in first] == [10.0, 11.0]
+    assert first[0]["date"] == datetime(2024, 1, 10, 9, 30)
+    assert first[0]["volume"] == 100
+    fetcher.fetch.assert_called_with(
+        "AAPL", "1d", return_format="dataframe", interval="1m"
+    )
+
+    # Nothing changed
+    assert poller.poll_once() == []
+
+    # The forming bar moved and a new bar appeared
+    fetcher.fetch.return_value = frame([10.0, 11.5, 12.0])
+    assert [bar["close"] for bar in poller.poll_once()] == [11.5, 12.0]
+
+
+def test_poller_skips_failed_tickers():
+    fetcher = MagicMock()
+    fetcher.fetch.side_effect = [Exception("boom"), None, frame([1.0], tz=None)]
+    poller = IntradayPoller(fetcher, ["A", "B", "C"])
+
+    bars = poller.poll_once()
+
+    assert [bar["ticker"] for bar in bars] == ["C"]
+
+
+def test_streaming_ingestion_writes_polled_bars():
+    fetcher = MagicMock()
+    fetcher.fetch.return_value = frame([10.0, 11.0])
+    writer = RecordingWriter()
+    ingestion = StreamingIngestion(
+        IntradayPoller(fetcher, ["AAPL"]),
+        MicroBatchWriter(writer, batch_size=10, max_latency=0.01),
+        poll_interval=0,
+    )
+
+    stats = ingestion.run(max_polls=2)
+
+    assert stats["written"] == 2
+    assert sum(len(batch) for batch in writer.batches) == 2
+
+
+def test_streaming_ingestion_stop():
+    fetcher = MagicMock()
+    fetcher.fetch.return_value = None
+    ingestion = StreamingIngestion(
+        IntradayPoller(fetcher, ["AAPL"]),
+        MicroBatchWriter(RecordingWriter()),
+        poll_interval=60,
+    )
+    thread = threading.Thread(target=ingestion.run)
+    thread.start()
+
+    ingestion.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
@@ -0,0 +1,150 @@
+import pytest
+from unittest.mock import MagicMock
+from src.infrastructure.db.unit_of_work import UnitOfWork
+from src.infrastructure.db.concrete_stocks_repository import ConcreteStocksRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+
+def test_default_commits_every_write(session):
+    unit_of_work = UnitOfWork(session)
+
+    unit_of_work.add("a")
+    unit_of_work.merge("b")
+
+    assert session.commit.call_count == 2
+    assert unit_of_work.pending == 0
+
+
+def test_commits_once_per_batch(session):
+    unit_of_work = UnitOfWork(session, batch_size=3)
+
+    for i in range(7):
+        unit_of_work.add(i)
+
+    assert session.add.call_count == 7
+    assert session.commit.call_count == 2
+    assert unit_of_work.pending == 1
+
+
+def test_commits_when_batch_is_too_old(session):
+    clock = FakeClock()
+    unit_of_work = UnitOfWork(session, batch_size=100, max_latency_ms=50, clock=clock)
+
+    unit_of_work.add("a")
+    clock.now = 0.01
+    unit_of_work.add("b")
+    session.commit.assert_not_called()
+
+    clock.now = 0.06
+    unit_of_work.add("c")
+    session.commit.assert_called_once()
+    assert unit_of_work.pending == 0
+
+
+def test_record_write_counts_bulk_writes(session):
+    unit_of_work = UnitOfWork(session, batch_size=100)
+
+    unit_of_work.record_write(60)
+    session.commit.assert_not_called()
+
+    unit_of_work.record_write(40)
+    session.commit.assert_called_once()
+    assert unit_of_work.pending == 0
+
+
+def test_commit_if_due_commits_idle_batch(session):
+    clock = FakeClock()
+    unit_of_work = UnitOfWork(session, batch_size=100, max_latency_ms=50, clock=clock)
+    unit_of_work.add("a")
+
+    assert unit_of_work.commit_if_due() is False
+    clock.now = 0.06
+    assert unit_of_work.commit_if_due() is True
+    session.commit.assert_called_once()
+    assert unit_of_work.commit_if_due() is False
+
+
+def test_close_commits_trailing_batch(session):
+    unit_of_work = UnitOfWork(session, batch_size=3)
+    for i in range(4):
+        unit_of_work.add(i)
+
+    unit_of_work.close()
+
+    assert session.commit.call_count == 2
+    assert unit_of_work.pending == 0
+    unit_of_work.close()
+    assert session.commit.call_count == 2
+
+
+def test_context_manager_commits_remaining_writes(session):
+    with UnitOfWork(session, batch_size=10) as unit_of_work:
+        unit_of_work.add("a")
+        unit_of_work.delete("b")
+
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+
+
+def test_context_manager_rolls_back_on_error(session):
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(session, batch_size=10) as unit_of_work:
+            unit_of_work.add("a")
+            raise RuntimeError("boom")
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+    assert unit_of_work.pending == 0
+
+
+def test_failed_commit_rolls_back(session):
+    session.commit.side_effect = RuntimeError("database is locked")
+    unit_of_work = UnitOfWork(session, batch_size=2)
+    unit_of_work.add("a")
+
+    with pytest.raises(RuntimeError):
+        unit_of_work.add("b")
+
+    session.rollback.assert_called_once()
+    assert unit_of_work.pending == 0
+    assert unit_of_work.commits == 0
+
+
+def test_unbounded_batch_commits_only_when_told(session):
+    unit_of_work = UnitOfWork(session, batch_size=None)
+
+    for i in range(1000):
+        unit_of_work.add(i)
+    session.commit.assert_not_called()
+
+    unit_of_work.commit()
+    session.commit.assert_called_once()
+
+
+def test_invalid_batch_size(session):
+    with pytest.raises(ValueError):
+        UnitOfWork(session, batch_size=0)
+
+
+def test_repository_writes_through_shared_unit_of_work(session):
+    unit_of_work = UnitOfWork(session, batch_size=50)
+    stock_repository = ConcreteStocksRepository(session, unit_of_work=unit_of_work)
+
+    for i in range(10):
+        stock_repository.save(i)
+    session.commit.assert_not_called()
+
+    unit_of_work.commit()
+    session.commit.assert_called_once()
@@ -0,0 +1,147 @@
+import pytest
+from unittest.mock import patch
+from src.infrastructure.fetchers.yahoo_finance_fetcher import YahooFinanceFetcher
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def fetcher():
+    return YahooFinanceFetcher(batch_size=2)
+
+
+def make_batch(tickers, dates):
+    # Build a frame shaped like yf.download(..., group_by="ticker")
+    frames = {
+        ticker: pd.DataFrame(
+            {
+                "Open": [150.0] * len(dates),
+                "High": [155.0] * len(dates),
+                "Low": [149.0] * len(dates),
+                "Close": [152.0] * len(dates),
+                "Volume": [1000000] * len(dates),
+            },
+            index=pd.DatetimeIndex(pd.to_datetime(dates), name="Date"),
+        )
+        for ticker in tickers
+    }
+    return pd.concat(frames, axis=1)
+
+
+@patch("yfinance.download")
+def test_fetch_many_batches_requests(mock_download, fetcher):
+    mock_download.side_effect = [
+        make_batch(["AAPL", "MSFT"], ["2023-09-01", "2023-09-05"]),
+        make_batch(["NVDA"], ["2023-09-01"]),
+    ]
+
+    result = fetcher.fetch_many(["AAPL", "MSFT", "NVDA", "AAPL"], period="5d")
+
+    # Duplicates are dropped and tickers are grouped by batch_size
+    assert mock_download.call_count == 2
+    assert mock_download.call_args_list[0].args[0] == ["AAPL", "MSFT"]
+    assert mock_download.call_args_list[1].args[0] == ["NVDA"]
+    assert mock_download.call_args_list[0].kwargs["period"] == "5d"
+
+    assert set(result) == {"AAPL", "MSFT", "NVDA"}
+    assert list(result["AAPL"].columns) == [
+        "date",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+    ]
+    assert len(result["AAPL"]) == 2
+    assert len(result["NVDA"]) == 1
+
+
+@patch("yfinance.download")
+def test_fetch_many_skips_missing_tickers(mock_download, fetcher):
+    batch = make_batch(["AAPL", "MSFT"], ["2023-09-01"]).astype(float)
+    batch.loc[:, "MSFT"] = float("nan")
+    mock_download.return_value = batch
+
+    result = fetcher.fetch_many(["AAPL", "MSFT"], return_format="list")
+
+    assert list(result) == ["AAPL"]
+    assert result["AAPL"][0]["date"] == "2023-09-01"
+
+
+@patch("yfinance.download")
+def test_fetch_many_network_error(mock_download, fetcher):
+    mock_download.side_effect = Exception("Network Error")
+
+    result = fetcher.fetch_many(["AAPL"])
+
+    assert result == {}
+
+
+@patch("yfinance.download")
+def test_fetch_many_raises_network_errors_when_asked(mock_download):
+    mock_download.side_effect = Exception("Network Error")
+    fetcher = YahooFinanceFetcher(raise_errors=True)
+
+    with pytest.raises(Exception, match="Network Error"):
+        fetcher.fetch_many(["AAPL"])
+
+
+def make_history(periods=3, tz="America/New_York"):
+    index = pd.date_range("2023-09-01", periods=periods, freq="D", tz=tz, name="Date")
+    return pd.DataFrame(
+        {
+            "Open": [150.0] * periods,
+            "High": [155.0] * periods,
+            "Low": [149.0] * periods,
+            "Close": [152.0] * periods,
+            "Volume": [1000000] * periods,
+        },
+        index=index,
+    )
+
+
+@patch("yfinance.Ticker")
+def test_fetch_columns_format(mock_ticker, fetcher):
+    mock_ticker.return_value.history.return_value = make_history()
+
+    result = fetcher.fetch("AAPL", return_format="columns")
+
+    assert list(result) == ["date", "open", "high", "low", "close", "volume"]
+    assert result["date"].dtype == np.dtype("datetime64[ns]")
+    # Timezone is dropped but the exchange-local date is kept
+    assert str(result["date"][0]) == "2023-09-01T00:00:00.000000000"
+    assert result["close"].tolist() == [152.0, 152.0, 152.0]
+
+
+@patch("yfinance.Ticker")
+def test_fetch_numpy_format(mock_ticker, fetcher):
+    mock_ticker.return_value.history.return_value = make_history()
+
+    result = fetcher.fetch("AAPL", return_format="numpy")
+
+    assert result.dtype.names == ("date", "open", "high", "low", "close", "volume")
+    assert result.shape == (3,)
+    assert result["volume"][0] == 1000000.0
+
+
+@patch("yfinance.Ticker")
+def test_fetch_arrow_format(mock_ticker, fetcher):
+    pa = pytest.importorskip("pyarrow")
+    mock_ticker.return_value.history.return_value = make_history()
+
+    result = fetcher.fetch("AAPL", return_format="arrow")
+
+    assert isinstance(result, pa.RecordBatch)
+    assert result.num_rows == 3
+    assert result.schema.names == ["date", "open", "high", "low", "close", "volume"]
+
+
+@patch("yfinance.Ticker")
+def test_fetch_list_format_long_history(mock_ticker, fetcher):
+    mock_ticker.return_value.history.return_value = make_history(periods=5000)
+
+    result = fetcher.fetch("AAPL", return_format="list")
+
+    assert len(result) == 5000
+    assert result[0]["date"] == "2023-09-01"
+    assert result[-1]["ticker"] == "AAPL"